@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Article record for AI News Automation
+Normalized once at ingest so later stages never repeat string work
+"""
+
+import re
+import sys
+import html
+import hashlib
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+HTML_TAG = re.compile(r'<[^>]+>')
+WHITESPACE = re.compile(r'\s+')
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref)$')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL (lowercase host, no fragment or tracking parameters)"""
+    parts = urlsplit(url.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)])
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def url_fingerprint(url: str) -> str:
+    """Stable key for an article, derived from its normalized URL"""
+    return hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()[:16]
+
+
+def parse_published(value: str) -> Optional[float]:
+    """Epoch timestamp from a NewsAPI (ISO 8601) or RSS (RFC 822) date"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def clean_text(value: Optional[str]) -> str:
+    """Strip HTML tags and entities and collapse whitespace"""
+    if not value:
+        return ''
+    if '<' in value:
+        value = HTML_TAG.sub(' ', value)
+    if '&' in value:
+        value = html.unescape(value)
+    return WHITESPACE.sub(' ', value).strip()
+
+
+class Article:
+    """A fetched news article, cleaned and indexed once when it enters the pipeline
+
+    title/description/content are HTML-free, search_text is the lowercased text the
+    keyword filters scan, published_ts is an epoch timestamp (None when unparseable)
+    and fingerprint identifies the article across sources and runs.
+    """
+
+    __slots__ = (
+        'title', 'description', 'url', 'source', 'published_at', 'published_ts',
+        'content', 'fingerprint', 'search_text', 'full_text',
+    )
+
+    def __init__(self, title: str, description: str, url: str, source: str,
+                 published_at: str = '', content: str = '', published_ts: Optional[float] = None,
+                 fingerprint: Optional[str] = None):
+        self.title = clean_text(title)
+        self.description = clean_text(description)
+        self.url = (url or '').strip()
+        self.source = sys.intern(source or '')
+        self.published_at = published_at or ''
+        self.published_ts = published_ts if published_ts is not None else parse_published(self.published_at)
+        # RSS items repeat the description as content; share the cleaned string instead of redoing it
+        self.content = self.description if content == description else clean_text(content)
+        self.fingerprint = fingerprint or (url_fingerprint(self.url) if self.url else '')
+        extra = '' if self.content is self.description else self.content
+        self.search_text = f"{self.title}\n{self.description}\n{extra}".lower()
+        self.full_text = ''
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """Build an Article from a plain dict (warehouse rows, journals, older callers)"""
+        article = cls(
+            data.get('title') or '', data.get('description') or '', data.get('url') or '',
+            data.get('source') or '', data.get('published_at') or '', data.get('content') or '',
+            data.get('published_ts'), data.get('fingerprint'),
+        )
+        article.full_text = data.get('full_text') or ''
+        return article
+
+    def to_dict(self) -> Dict:
+        return {
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'source': self.source,
+            'published_at': self.published_at,
+            'published_ts': self.published_ts,
+            'content': self.content,
+            'fingerprint': self.fingerprint,
+            'full_text': self.full_text,
+        }
+
+    def get(self, key: str, default=None):
+        """Dict-style access for scripts written against the old article dicts"""
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"Article({self.source!r}, {self.title[:60]!r})"
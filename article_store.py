@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Local article warehouse for AI News Automation
+Persists every fetched article in SQLite with an FTS5 full-text index
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from article import Article, url_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = 'articles.db'
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_MAX_ARTICLES = 200000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    fingerprint TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    published_at TEXT NOT NULL DEFAULT '',
+    published_ts REAL,
+    fetched_at REAL NOT NULL,
+    last_seen_at REAL NOT NULL,
+    posted_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles(fetched_at);
+CREATE INDEX IF NOT EXISTS idx_articles_published_ts ON articles(published_ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, description, content, source,
+    content='articles', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, description, content, source)
+    VALUES (new.rowid, new.title, new.description, new.content, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, description, content, source)
+    VALUES ('delete', old.rowid, old.title, old.description, old.content, old.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, description, content, source ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, description, content, source)
+    VALUES ('delete', old.rowid, old.title, old.description, old.content, old.source);
+    INSERT INTO articles_fts(rowid, title, description, content, source)
+    VALUES (new.rowid, new.title, new.description, new.content, new.source);
+END;
+"""
+
+ARTICLE_COLUMNS = 'fingerprint, title, description, url, source, published_at, published_ts, content'
+
+
+class ArticleStore:
+    """SQLite-backed history of every fetched article, keyed by URL fingerprint"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # Writes come from the pipeline's stage thread as well as the main thread
+        self._lock = threading.RLock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_articles(self, articles: Iterable[Article]) -> int:
+        """Insert new articles and refresh last_seen_at on known ones; returns the number inserted"""
+        now = time.time()
+        rows = [
+            (
+                article.fingerprint, article.url, article.title, article.description,
+                article.content, article.source, article.published_at, article.published_ts, now, now,
+            )
+            for article in articles if article.url
+        ]
+        if not rows:
+            return 0
+
+        with self._lock, self.conn:
+            cursor = self.conn.executemany(
+                """INSERT INTO articles (fingerprint, url, title, description, content, source,
+                                         published_at, published_ts, fetched_at, last_seen_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(fingerprint) DO NOTHING""",
+                rows
+            )
+            inserted = cursor.rowcount
+            self.conn.executemany(
+                'UPDATE articles SET last_seen_at = ? WHERE fingerprint = ?',
+                [(now, row[0]) for row in rows]
+            )
+        return inserted
+
+    def import_articles(self, dated: Iterable[Tuple[Article, float]]) -> int:
+        """Insert archived (article, timestamp) pairs in one transaction, dated by timestamp; returns the number inserted
+
+        Known articles are left untouched, and the old dates keep imports out of the
+        backlog and let retention age them like articles fetched at the time. The
+        per-row FTS trigger is swapped for one bulk index insert of the new rows, which
+        is several times faster; the swap is part of the transaction, so other
+        connections never see the table without its trigger.
+        """
+        rows = [
+            (
+                article.fingerprint, article.url, article.title, article.description,
+                article.content, article.source, article.published_at, article.published_ts, timestamp, timestamp,
+            )
+            for article, timestamp in dated if article.url
+        ]
+        if not rows:
+            return 0
+
+        with self._lock, self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            trigger_sql = self.conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'articles_ai'"
+            ).fetchone()[0]
+            # Rows inserted under the write lock get rowids above the current maximum
+            last_rowid = self.conn.execute('SELECT COALESCE(MAX(rowid), 0) FROM articles').fetchone()[0]
+            self.conn.execute('DROP TRIGGER articles_ai')
+            inserted = self.conn.executemany(
+                """INSERT INTO articles (fingerprint, url, title, description, content, source,
+                                         published_at, published_ts, fetched_at, last_seen_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(fingerprint) DO NOTHING""",
+                rows
+            ).rowcount
+            self.conn.execute(
+                """INSERT INTO articles_fts(rowid, title, description, content, source)
+                   SELECT rowid, title, description, content, source FROM articles WHERE rowid > ?""",
+                (last_rowid,)
+            )
+            self.conn.execute(trigger_sql)
+        return inserted
+
+    def _matching(self, fingerprints: Iterable[str], condition: str = '') -> Set[str]:
+        fingerprints = list(fingerprints)
+        found = set()
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(fingerprints), 500):
+            chunk = fingerprints[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(row[0] for row in self.conn.execute(
+                f'SELECT fingerprint FROM articles WHERE fingerprint IN ({placeholders}){condition}', chunk
+            ))
+        return found
+
+    def known(self, fingerprints: Iterable[str]) -> Set[str]:
+        """The subset of fingerprints already stored"""
+        return self._matching(fingerprints)
+
+    def posted(self, fingerprints: Iterable[str]) -> Set[str]:
+        """The subset of fingerprints stored and marked as posted"""
+        return self._matching(fingerprints, ' AND posted_at IS NOT NULL')
+
+    def unposted(self, fingerprints: Iterable[str]) -> Set[str]:
+        """The subset of fingerprints stored and never posted"""
+        return self._matching(fingerprints, ' AND posted_at IS NULL')
+
+    def mark_posted(self, url: str, posted_at: Optional[float] = None):
+        """Record that an article was posted so it never comes back from the backlog"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                'UPDATE articles SET posted_at = ? WHERE fingerprint = ?',
+                (posted_at or time.time(), url_fingerprint(url))
+            )
+
+    def backlog(self, limit: int = 20, max_age_days: float = 7) -> List[Article]:
+        """Unposted articles fetched within max_age_days, newest first"""
+        cutoff = time.time() - max_age_days * 86400
+        rows = self.conn.execute(
+            f"""SELECT {ARTICLE_COLUMNS} FROM articles
+                WHERE posted_at IS NULL AND fetched_at >= ?
+                ORDER BY COALESCE(published_ts, fetched_at) DESC
+                LIMIT ?""",
+            (cutoff, limit)
+        ).fetchall()
+        return [Article.from_dict(dict(row)) for row in rows]
+
+    def search(self, query: str, days: Optional[float] = None, limit: int = 20) -> List[Dict]:
+        """Full-text search over stored articles, best matches first"""
+        sql = """SELECT a.title, a.description, a.url, a.source, a.published_at, a.content,
+                         a.fingerprint, a.posted_at, bm25(articles_fts) AS rank
+                  FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid
+                  WHERE articles_fts MATCH ?"""
+        params = [query]
+        if days is not None:
+            sql += ' AND COALESCE(a.published_ts, a.fetched_at) >= ?'
+            params.append(time.time() - days * 86400)
+        sql += ' ORDER BY rank LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def prune(self, retention_days: float = DEFAULT_RETENTION_DAYS,
+              max_articles: int = DEFAULT_MAX_ARTICLES) -> int:
+        """Drop unposted articles older than the retention window, then the oldest beyond max_articles"""
+        cutoff = time.time() - retention_days * 86400
+        with self._lock, self.conn:
+            deleted = self.conn.execute(
+                'DELETE FROM articles WHERE posted_at IS NULL AND last_seen_at < ?', (cutoff,)
+            ).rowcount
+            deleted += self.conn.execute(
+                """DELETE FROM articles WHERE posted_at IS NULL AND rowid IN (
+                       SELECT rowid FROM articles WHERE posted_at IS NULL
+                       ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)""",
+                (max_articles,)
+            ).rowcount
+        return deleted
+
+    def stats(self) -> Dict:
+        row = self.conn.execute(
+            """SELECT COUNT(*) AS articles, COUNT(posted_at) AS posted,
+                      MIN(fetched_at) AS oldest, MAX(fetched_at) AS newest FROM articles"""
+        ).fetchone()
+        return dict(row)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the local article warehouse')
+    parser.add_argument('--db', default=os.getenv('ARTICLE_DB_PATH', DEFAULT_DB_PATH))
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    search_parser = subparsers.add_parser('search', help='Full-text search, e.g. search "openai" --days 7')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--days', type=float)
+    search_parser.add_argument('--limit', type=int, default=20)
+    backlog_parser = subparsers.add_parser('backlog', help='Unposted articles available for selection')
+    backlog_parser.add_argument('--days', type=float, default=7)
+    subparsers.add_parser('stats', help='Row counts and date range')
+    prune_parser = subparsers.add_parser('prune', help='Apply retention policies')
+    prune_parser.add_argument('--days', type=float, default=DEFAULT_RETENTION_DAYS)
+    prune_parser.add_argument('--max-articles', type=int, default=DEFAULT_MAX_ARTICLES)
+    args = parser.parse_args()
+
+    store = ArticleStore(args.db)
+    if args.command == 'search':
+        started = time.perf_counter()
+        results = store.search(args.query, args.days, args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for article in results:
+            print(f"{article['published_at'][:25]:<26} {article['source'][:15]:<16} {article['title']}")
+            print(f"{'':<43}{article['url']}")
+        print(f"\n{len(results)} matches in {elapsed_ms:.1f} ms")
+    elif args.command == 'backlog':
+        for article in store.backlog(limit=50, max_age_days=args.days):
+            print(f"{article.source[:15]:<16} {article.title}")
+    elif args.command == 'stats':
+        print(store.stats())
+    elif args.command == 'prune':
+        print(f"Deleted {store.prune(args.days, args.max_articles)} articles")
+    store.close()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Historical backfill for AI News Automation
+Streams archived RSS/Atom dumps and NewsAPI JSON exports from disk into the warehouse and poll history
+"""
+
+import io
+import os
+import gzip
+import json
+import time
+import logging
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from article import Article
+from polling import HISTORY_DAYS
+
+logger = logging.getLogger(__name__)
+
+XML_SUFFIXES = ('.xml', '.rss', '.atom')
+JSON_SUFFIXES = ('.json', '.jsonl', '.ndjson')
+DEFAULT_BATCH_SIZE = 5000
+PROGRESS_SECONDS = 5.0
+# Source label for NewsAPI exports, matching the live source's poll schedule
+NEWSAPI_LABEL = 'NewsAPI'
+
+
+def archive_files(paths: Iterable[str]) -> List[str]:
+    """Archive files under paths (files or directories, searched recursively), optionally gzipped"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, name) for name in sorted(names))
+        elif os.path.exists(path):
+            found.append(path)
+        else:
+            logger.warning(f"Backfill path {path} does not exist")
+    return sorted(path for path in found
+                  if path[:-3 if path.endswith('.gz') else None].lower().endswith(XML_SUFFIXES + JSON_SUFFIXES))
+
+
+def _open(path: str):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _xml_articles(stream) -> Iterator[Tuple[str, Article]]:
+    """(feed title, article) for every RSS <item> or Atom <entry>, parsed incrementally"""
+    feed_title = ''
+    depth = 0
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        tag = _local(element.tag)
+        if event == 'start':
+            if tag in ('item', 'entry'):
+                depth += 1
+            continue
+        if tag == 'title' and not depth and not feed_title:
+            feed_title = (element.text or '').strip()
+        elif tag == 'item':
+            depth -= 1
+            description = element.findtext('description')
+            yield feed_title, Article(
+                element.findtext('title'), description, element.findtext('link'), feed_title,
+                element.findtext('pubDate') or '', description
+            )
+            element.clear()
+        elif tag == 'entry':
+            depth -= 1
+            fields = {_local(child.tag): child for child in element}
+            link = next((child.get('href') for child in element
+                         if _local(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate'), '')
+            summary = fields['summary'].text if 'summary' in fields else ''
+            content = fields['content'].text if 'content' in fields else summary
+            published = fields.get('published', fields.get('updated'))
+            yield feed_title, Article(
+                fields['title'].text if 'title' in fields else '', summary, link, feed_title,
+                (published.text or '') if published is not None else '', content
+            )
+            element.clear()
+
+
+def _newsapi_articles(records: Iterable) -> Iterator[Tuple[str, Article]]:
+    """Articles from NewsAPI responses ({"articles": [...]}) or bare article objects"""
+    for record in records:
+        items = record.get('articles', []) if isinstance(record, dict) and 'articles' in record else [record]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            yield NEWSAPI_LABEL, Article(
+                item.get('title'), item.get('description'), item.get('url'),
+                (item.get('source') or {}).get('name'), item.get('publishedAt') or '', item.get('content')
+            )
+
+
+def _json_records(stream, path: str) -> Iterator:
+    if path[:-3 if path.endswith('.gz') else None].lower().endswith('.json'):
+        data = json.load(stream)
+        yield from (data if isinstance(data, list) else [data])
+        return
+    for line in io.TextIOWrapper(stream, encoding='utf-8'):
+        if line.strip():
+            yield json.loads(line)
+
+
+def parse_archive(path: str, keywords: Optional[Sequence[str]] = None) -> Dict:
+    """Parse, normalize and filter one archive file (runs in a worker process)
+
+    Returns the kept articles, each with the file's mtime as a fallback date, the
+    publish times seen per feed label (for the poll history) and item counters.
+    """
+    result = {'path': path, 'articles': [], 'published': {}, 'items': 0, 'dropped': 0, 'error': None,
+              'bytes': os.path.getsize(path)}
+    fallback_ts = os.path.getmtime(path)
+    try:
+        with _open(path) as stream:
+            name = path[:-3 if path.endswith('.gz') else None].lower()
+            if name.endswith(XML_SUFFIXES):
+                entries = _xml_articles(stream)
+            else:
+                entries = _newsapi_articles(_json_records(stream, path))
+            for label, article in entries:
+                result['items'] += 1
+                if article.published_ts:
+                    result['published'].setdefault(label, []).append(article.published_ts)
+                # Same rules as live fetching: no title, no URL or NewsAPI's removed placeholder
+                if (not article.url or not article.title or article.title == '[Removed]' or
+                        (keywords and not any(keyword in article.search_text for keyword in keywords))):
+                    result['dropped'] += 1
+                    continue
+                result['articles'].append((article, article.published_ts or fallback_ts))
+    except (OSError, ValueError, EOFError, ET.ParseError) as e:
+        # A truncated or corrupt dump keeps whatever was parsed before the damage
+        result['error'] = str(e)
+    return result
+
+
+class Backfill:
+    """Loads archives into the stores, parsing files in parallel and writing in large batches
+
+    Worker processes parse whole files; the parent deduplicates by fingerprint and is
+    the only writer, so SQLite sees one transaction per batch_size articles. Only a
+    bounded number of parsed files wait for the writer at any time, which keeps memory
+    flat however large the archive. Articles are dated by their publish time, so the
+    backlog never offers them as fresh and retention ages them out on schedule;
+    anything already past the retention window is skipped.
+    """
+
+    def __init__(self, store=None, poller=None, poll_sources: Sequence[str] = (),
+                 keywords: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, retention_days: Optional[float] = None, progress_seconds: float = PROGRESS_SECONDS):
+        self.store = store
+        self.poller = poller
+        self.poll_sources = set(poll_sources)
+        self.keywords = tuple(keywords) if keywords else None
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.progress_seconds = progress_seconds
+        self.fingerprints = set()
+        self.published: Dict[str, List[float]] = {}
+        self.stats = {'files': 0, 'failed_files': 0, 'bytes': 0, 'items': 0, 'dropped': 0, 'duplicates': 0,
+                      'expired': 0, 'inserted': 0}
+        self._pending: List[Tuple[Article, float]] = []
+
+    def run(self, paths: Iterable[str]) -> Dict:
+        files = archive_files(paths)
+        started = time.monotonic()
+        last_report = started
+        logger.info(f"Backfill: {len(files)} archive files with {self.workers} workers")
+
+        if self.workers == 1:
+            for path in files:
+                self._consume(parse_archive(path, self.keywords))
+                last_report = self._report(started, last_report, len(files))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                queued = iter(files)
+                running = set()
+                while True:
+                    # Keep every worker busy with one file queued behind it, and no more
+                    while len(running) < self.workers * 2:
+                        path = next(queued, None)
+                        if path is None:
+                            break
+                        running.add(executor.submit(parse_archive, path, self.keywords))
+                    if not running:
+                        break
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._consume(future.result())
+                    last_report = self._report(started, last_report, len(files))
+
+        self._flush()
+        self._seed_polling()
+        summary = self.summary(started)
+        logger.info(f"Backfill finished: {summary['inserted']} articles stored from {summary['items']} items "
+                    f"in {summary['elapsed_s']}s ({summary['items_per_s']:.0f} items/s, "
+                    f"{summary['mb_per_s']:.1f} MB/s)")
+        return summary
+
+    def _consume(self, result: Dict):
+        self.stats['files'] += 1
+        self.stats['bytes'] += result['bytes']
+        self.stats['items'] += result['items']
+        self.stats['dropped'] += result['dropped']
+        if result['error']:
+            self.stats['failed_files'] += 1
+            logger.warning(f"Backfill: {result['path']} is damaged ({result['error']}); "
+                           f"kept {len(result['articles'])} articles read before it")
+        # Only the last HISTORY_DAYS of publish times feed the poll history
+        recent = time.time() - HISTORY_DAYS * 86400
+        for label, published in result['published'].items():
+            self.published.setdefault(label, []).extend(ts for ts in published if ts >= recent)
+
+        cutoff = time.time() - self.retention_days * 86400 if self.retention_days else None
+        for article, seen_at in result['articles']:
+            if article.fingerprint in self.fingerprints:
+                self.stats['duplicates'] += 1
+            elif cutoff and seen_at < cutoff:
+                self.stats['expired'] += 1
+            else:
+                self.fingerprints.add(article.fingerprint)
+                self._pending.append((article, seen_at))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        """Write the pending articles in one transaction"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if self.store:
+            self.stats['inserted'] += self.store.import_articles(pending)
+
+    def _seed_polling(self):
+        if self.poller is None:
+            return
+        for label, published in self.published.items():
+            # Only feeds that are also polled live; other publishers in the archive have no schedule
+            if label in self.poll_sources:
+                self.poller.seed(label, published)
+
+    def _report(self, started: float, last_report: float, total_files: int) -> float:
+        now = time.monotonic()
+        if now - last_report < self.progress_seconds:
+            return last_report
+        summary = self.summary(started)
+        logger.info(f"Backfill: {summary['files']}/{total_files} files, {summary['items']} items, "
+                    f"{summary['inserted']} stored ({summary['items_per_s']:.0f} items/s, "
+                    f"{summary['mb_per_s']:.1f} MB/s)")
+        return now
+
+    def summary(self, started: float) -> Dict:
+        elapsed = max(time.monotonic() - started, 1e-9)
+        return {
+            **self.stats,
+            'elapsed_s': round(elapsed, 3),
+            'items_per_s': self.stats['items'] / elapsed,
+            'mb_per_s': self.stats['bytes'] / elapsed / 1e6,
+        }
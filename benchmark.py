@@ -0,0 +1,851 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for AI News Automation
+Serves recorded RSS and NewsAPI fixtures from a local stand-in server and times the pipeline
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs
+from xml.sax.saxutils import escape
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(REPO_DIR, 'benchmark_fixtures')
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmark_results')
+
+FIXTURE_ROUTES = {
+    '/techcrunch/feed/': ('techcrunch_feed.xml', 'application/rss+xml'),
+    '/venturebeat/feed/': ('venturebeat_feed.xml', 'application/rss+xml'),
+    '/newsapi/v2/everything': ('newsapi_everything.json', 'application/json'),
+}
+
+STATE_FILES = ['posted_articles.json', 'fetch_state.json', 'run_journal.jsonl', 'articles.db', 'articles.db-wal', 'articles.db-shm']
+STATE_DIRS = ['cache', 'channel_posts', 'sessions', 'state']
+
+AI_TITLES = [
+    'New machine learning model cuts inference cost in half',
+    'Startup raises funding for artificial intelligence copilots',
+    'Deep learning helps radiologists spot early tumours',
+    'Open LLM beats proprietary rivals on reasoning benchmark',
+    'Neural network compression lands on mobile chips',
+    'Enterprises move AI agents from pilot to production',
+]
+OTHER_TITLES = [
+    'Electric truck maker opens second factory',
+    'Streaming service raises subscription prices',
+    'Smartphone shipments recover in second quarter',
+    'Space startup completes first orbital test',
+]
+
+
+def build_synthetic_feed(item_count: int, source: str = 'synthetic') -> bytes:
+    """Build an RSS feed with item_count items, roughly 60% of them AI-related"""
+    rng = random.Random(item_count)
+    now = datetime(2025, 8, 26, 18, 0, tzinfo=timezone.utc)
+    items = []
+    for i in range(item_count):
+        pool = AI_TITLES if rng.random() < 0.6 else OTHER_TITLES
+        title = f"{rng.choice(pool)} ({source} #{i})"
+        link = f"https://{source}.example.com/{now:%Y/%m/%d}/story-{i}/"
+        pub_date = format_datetime(now - timedelta(minutes=7 * i))
+        items.append(
+            f"<item><title>{escape(title)}</title><link>{link}</link>"
+            f"<pubDate>{pub_date}</pubDate><guid isPermaLink=\"false\">{link}</guid>"
+            f"<description><![CDATA[<p>{title}. Full coverage of the story and what it means "
+            f"for businesses adopting new technology.</p>]]></description></item>"
+        )
+    body = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f'<title>{source}</title><link>https://{source}.example.com/</link>'
+        + ''.join(items) + '</channel></rss>'
+    )
+    return body.encode('utf-8')
+
+
+def build_synthetic_newsapi(item_count: int) -> bytes:
+    """Build a NewsAPI /v2/everything response with item_count articles"""
+    rng = random.Random(item_count)
+    now = datetime(2025, 8, 26, 18, 0, tzinfo=timezone.utc)
+    articles = []
+    for i in range(item_count):
+        title = f"{rng.choice(AI_TITLES)} (newsapi #{i})"
+        articles.append({
+            'source': {'id': None, 'name': f"Outlet {i % 25}"},
+            'title': title,
+            'description': f"{title}. Analysts weigh in on the business impact.",
+            'url': f"https://newsapi.example.com/articles/{i}",
+            'publishedAt': (now - timedelta(minutes=3 * i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': f"{title}. Companies are moving from pilots to production… [+1800 chars]",
+        })
+    return json.dumps({'status': 'ok', 'totalResults': item_count, 'articles': articles}).encode('utf-8')
+
+
+def build_synthetic_article(index: int) -> bytes:
+    """Build an article page with navigation, scripts and roughly 40 KB of body text"""
+    rng = random.Random(index)
+    title = f"{rng.choice(AI_TITLES)} (article #{index})"
+    paragraphs = ''.join(
+        f"<p>{title}. Paragraph {p} explains how teams evaluate, deploy and monitor the system "
+        f"in production, and what it costs compared with the previous generation of tools.</p>"
+        for p in range(200)
+    )
+    page = (
+        f"<!DOCTYPE html><html><head><title>{escape(title)}</title>"
+        f"<meta property=\"og:image\" content=\"/images/{index}.png\">"
+        "<script>window.analytics = {};</script><style>body{font-family:sans-serif}</style></head>"
+        "<body><header><nav><a href=\"/\">Home</a><a href=\"/ai\">AI</a></nav></header>"
+        f"<article><h1>{escape(title)}</h1>{paragraphs}</article>"
+        "<aside><p>Related stories you might have missed this week in technology news.</p></aside>"
+        "<footer><p>Copyright Synthetic Media. All rights reserved. Terms and privacy policy.</p></footer>"
+        "</body></html>"
+    )
+    return page.encode('utf-8')
+
+
+def build_synthetic_image(index: int, width: int = 1600, height: int = 900) -> bytes:
+    """A solid-colour PNG standing in for an article's og:image"""
+    import zlib
+    import struct
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    colour = bytes(((index * 37) % 256, (index * 91) % 256, (index * 53) % 256))
+    rows = b''.join(b'\x00' + colour * width for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows, 6)) + chunk(b'IEND', b''))
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Route requests to recorded fixtures or synthetic payloads"""
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        parts = path.split('/', 3)
+        if len(parts) == 4 and parts[1] == 'slow':
+            # /slow/<seconds>/<route> answers <route> after a delay
+            time.sleep(float(parts[2]))
+            path = '/' + parts[3]
+        try:
+            body, content_type = self.server.resolve(path)
+        except KeyError:
+            self.send_error(404)
+            return
+        if content_type == 'application/json':
+            body = self.server.paginate(body, parse_qs(query))
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInNewsServer(ThreadingHTTPServer):
+    """Local HTTP server standing in for NewsAPI, TechCrunch and VentureBeat
+
+    Routes:
+        /techcrunch/feed/, /venturebeat/feed/, /newsapi/v2/everything  recorded fixtures
+        /synthetic/<name>/<count>/feed/                                 synthetic RSS feed
+        /synthetic/newsapi/<count>/v2/everything                        synthetic NewsAPI response
+        /synthetic/article/<index>                                      synthetic article page
+        /images/<index>.png                                             synthetic og:image
+        /slow/<seconds>/<route>                                         any route above, delayed
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), _StandInHandler)
+        self._payloads = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out or abandoned a slow route hang up before the reply; not a failure
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    def resolve(self, path: str):
+        with self._lock:
+            if path not in self._payloads:
+                self._payloads[path] = self._build(path)
+            return self._payloads[path]
+
+    def _build(self, path: str):
+        if path in FIXTURE_ROUTES:
+            filename, content_type = FIXTURE_ROUTES[path]
+            with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+                return f.read(), content_type
+        parts = [part for part in path.split('/') if part]
+        if len(parts) == 2 and parts[0] == 'images' and parts[1].split('.')[0].isdigit():
+            return build_synthetic_image(int(parts[1].split('.')[0])), 'image/png'
+        if len(parts) >= 3 and parts[0] == 'synthetic' and parts[2].isdigit():
+            if parts[1] == 'article':
+                return build_synthetic_article(int(parts[2])), 'text/html; charset=utf-8'
+            if parts[1] == 'newsapi':
+                return build_synthetic_newsapi(int(parts[2])), 'application/json'
+            return build_synthetic_feed(int(parts[2]), parts[1]), 'application/rss+xml'
+        raise KeyError(path)
+
+    def paginate(self, body: bytes, params: Dict) -> bytes:
+        """Apply NewsAPI's from/page/pageSize parameters to a recorded response"""
+        data = json.loads(body)
+        articles = data.get('articles', [])
+        if 'from' in params:
+            articles = [a for a in articles if a.get('publishedAt', '') >= params['from'][0]]
+        page_size = int(params.get('pageSize', ['100'])[0])
+        page = int(params.get('page', ['1'])[0])
+        page_articles = articles[(page - 1) * page_size:page * page_size]
+        return json.dumps({'status': 'ok', 'totalResults': len(articles), 'articles': page_articles}).encode('utf-8')
+
+    def url(self, path: str) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+@contextmanager
+def patched_env(**values):
+    """Temporarily set environment variables (None removes the variable)"""
+    previous = {key: os.environ.get(key) for key in values}
+    try:
+        for key, value in values.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def time_call(func: Callable, repeat: int) -> Dict:
+    """Run func repeat times and return timing statistics in seconds"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.mean(timings),
+        'runs': repeat,
+        '_result': result,
+    }
+
+
+def source_env(server: StandInNewsServer, feed_items: int = 0) -> Dict:
+    """Environment pointing every source at the stand-in server"""
+    if feed_items:
+        return {
+            'NEWS_API_URL': server.url(f"/synthetic/newsapi/{feed_items}/v2/everything"),
+            'TECHCRUNCH_FEED_URL': server.url(f"/synthetic/techcrunch/{feed_items}/feed/"),
+            'VENTUREBEAT_FEED_URL': server.url(f"/synthetic/venturebeat/{feed_items}/feed/"),
+        }
+    return {
+        'NEWS_API_URL': server.url('/newsapi/v2/everything'),
+        'TECHCRUNCH_FEED_URL': server.url('/techcrunch/feed/'),
+        'VENTUREBEAT_FEED_URL': server.url('/venturebeat/feed/'),
+    }
+
+
+def offline_env() -> Dict:
+    """Credentials are cleared so no run can reach Cohere or LinkedIn"""
+    return {
+        'NEWS_API_KEY': 'benchmark',
+        'COHERE_API_KEY': None,
+        'LINKEDIN_EMAIL': None,
+        'LINKEDIN_PASSWORD': None,
+        'ENRICH_ARTICLES': '0',
+        # Every stand-in route shares one host; politeness spacing is benchmarked on its own
+        'FETCH_MIN_INTERVAL': '0',
+        'FETCH_RESPECT_ROBOTS': '0',
+    }
+
+
+def reset_state():
+    """Remove persisted run state from the scratch directory so every run starts cold"""
+    for path in STATE_FILES:
+        if os.path.exists(path):
+            os.remove(path)
+    for path in STATE_DIRS:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def bench_fetch(server: StandInNewsServer, feed_sizes: List[int], repeat: int) -> Dict:
+    """Cold fetch_ai_news throughput against recorded and synthetic feeds"""
+    from main import AINewsAutomation
+
+    def fetch_cold():
+        reset_state()
+        return AINewsAutomation().fetch_ai_news()
+
+    results = {}
+    for feed_items in [0] + feed_sizes:
+        name = f"synthetic_{feed_items}" if feed_items else 'fixtures'
+        with patched_env(**offline_env(), **source_env(server, feed_items)):
+            stats = time_call(fetch_cold, repeat)
+        articles = stats.pop('_result')
+        # NewsAPI is paged by the client, so throughput is measured on the two RSS feeds
+        served = 2 * feed_items if feed_items else None
+        stats['articles_returned'] = len(articles)
+        if served:
+            stats['rss_items_served'] = served
+            stats['items_per_s'] = served / stats['median_s']
+        results[name] = stats
+    return results
+
+
+def bench_per_item(server: StandInNewsServer, item_count: int, repeat: int) -> Dict:
+    """Per-item cost of RSS parsing, deduplication and AI filtering"""
+    from main import AINewsAutomation
+
+    results = {}
+    with patched_env(**offline_env(), **source_env(server, item_count)):
+        reset_state()
+        automation = AINewsAutomation()
+
+        def parse_cold():
+            automation.fetch_state = {}
+            return automation._fetch_rss_feed('TechCrunch', automation.techcrunch_feed_url, limit=item_count)
+
+        stats = time_call(parse_cold, repeat)
+        stats.pop('_result')
+        stats['items'] = item_count
+        stats['us_per_item'] = stats['median_s'] / item_count * 1e6
+        results['rss_parse'] = stats
+
+        # Every item already seen: the cost an unchanged feed adds to a daily run
+        automation.fetch_state = {}
+        automation._fetch_rss_feed('TechCrunch', automation.techcrunch_feed_url, limit=item_count)
+        stats = time_call(lambda: automation._fetch_rss_feed('TechCrunch', automation.techcrunch_feed_url), repeat)
+        stats.pop('_result')
+        stats['items'] = item_count
+        stats['us_per_item'] = stats['median_s'] / item_count * 1e6
+        results['rss_parse_all_seen'] = stats
+
+    from article import Article
+
+    rng = random.Random(7)
+    raw_items = []
+    for i in range(item_count):
+        title = rng.choice(AI_TITLES + OTHER_TITLES)
+        raw_items.append((
+            title,
+            f"<p>{title}. Coverage of the story &amp; what it means.</p>",
+            f"https://example.com/story-{rng.randrange(int(item_count * 0.8))}",
+        ))
+
+    def normalize():
+        return [Article(title, description, url, 'Synthetic', '', description) for title, description, url in raw_items]
+
+    stats = time_call(normalize, repeat)
+    articles = stats.pop('_result')
+    stats['items'] = item_count
+    stats['us_per_item'] = stats['median_s'] / item_count * 1e6
+    results['normalize'] = stats
+
+    for name, func in (
+        ('dedup', lambda: automation._deduplicate_news(articles)),
+        ('filter', lambda: automation._filter_ai_news(articles)),
+    ):
+        stats = time_call(func, repeat)
+        stats.pop('_result')
+        stats['items'] = item_count
+        stats['us_per_item'] = stats['median_s'] / item_count * 1e6
+        results[name] = stats
+
+    # Bloom filter pre-check with half of the keys already recorded
+    from seen_filter import SeenFilter
+    seen_filter = SeenFilter(os.path.join('cache', 'bench_seen_filter'))
+    seen_filter.add_many(article.fingerprint for article in articles[::2])
+    stats = time_call(lambda: [article.fingerprint in seen_filter for article in articles], repeat)
+    stats.pop('_result')
+    stats['items'] = item_count
+    stats['us_per_item'] = stats['median_s'] / item_count * 1e6
+    results['seen_check'] = stats
+    seen_filter.close()
+    return results
+
+
+def bench_select(history_sizes: List[int], candidate_count: int, repeat: int) -> Dict:
+    """select_best_article scaling against a growing posted-article history"""
+    from main import AINewsAutomation
+
+    from article import Article
+
+    candidates = [
+        Article(f"Candidate {i}", '', f"https://example.com/candidate-{i}", 'Synthetic')
+        for i in range(candidate_count)
+    ]
+    results = {}
+    with patched_env(**offline_env()):
+        automation = AINewsAutomation()
+    posted_at = datetime.now().isoformat()
+    for size in history_sizes:
+        automation.save_posted_articles([
+            {'url': f"https://example.com/posted-{i}", 'title': f"Posted {i}", 'posted_at': posted_at}
+            for i in range(size)
+        ])
+        # An empty filter is seeded from the posted history, as on a runner without a cache
+        automation.seen_filter.close()
+        shutil.rmtree(os.path.join('cache', 'seen_filter'), ignore_errors=True)
+        automation.open_seen_filter()
+        stats = time_call(lambda: automation.select_best_article(candidates), repeat)
+        stats.pop('_result')
+        stats['history'] = size
+        stats['candidates'] = candidate_count
+        results[f"history_{size}"] = stats
+    return results
+
+
+def bench_enrich(server: StandInNewsServer, candidate_count: int, repeat: int) -> Dict:
+    """Concurrent full-article download and extraction, cold and from the text cache"""
+    from article import Article
+    from enrichment import ArticleEnricher
+
+    cache_dir = os.path.join(os.getcwd(), 'cache', 'article_text')
+
+    def candidates():
+        return [Article('', '', server.url(f"/synthetic/article/{i}"), 'Synthetic') for i in range(candidate_count)]
+
+    def enrich_cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return ArticleEnricher(cache_dir=cache_dir).enrich(candidates())
+
+    results = {}
+    stats = time_call(enrich_cold, repeat)
+    enriched = stats.pop('_result')
+    stats['candidates'] = candidate_count
+    stats['enriched'] = sum(1 for article in enriched if article.full_text)
+    results['cold'] = stats
+
+    enricher = ArticleEnricher(cache_dir=cache_dir)
+    stats = time_call(lambda: enricher.enrich(candidates()), repeat)
+    stats.pop('_result')
+    stats['candidates'] = candidate_count
+    results['cached'] = stats
+    return results
+
+
+def bench_media(server: StandInNewsServer, article_count: int, repeat: int) -> Dict:
+    """Preview-image preparation, cold and from the content-addressed cache"""
+    from article import Article
+    from media import MediaCache
+
+    cache_dir = os.path.join(os.getcwd(), 'cache', 'media')
+    articles = [Article('', '', server.url(f"/synthetic/article/{i}"), 'Synthetic') for i in range(article_count)]
+
+    def prepare_cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        media = MediaCache(cache_dir)
+        return [media.image_for(article) for article in articles]
+
+    results = {}
+    stats = time_call(prepare_cold, repeat)
+    stats['prepared'] = sum(1 for path in stats.pop('_result') if path)
+    stats['articles'] = article_count
+    results['cold'] = stats
+
+    stats = time_call(lambda: [MediaCache(cache_dir).image_for(article) for article in articles], repeat)
+    stats['prepared'] = sum(1 for path in stats.pop('_result') if path)
+    stats['articles'] = article_count
+    results['cached'] = stats
+    return results
+
+
+def bench_snapshot(server: StandInNewsServer, feed_size: int, repeat: int) -> Dict:
+    """Warm-state snapshot write and restore after a fetch has populated the state files"""
+    from main import AINewsAutomation
+    from snapshot import create_snapshot, restore_snapshot
+
+    snapshot_path = os.path.join('state', 'bench-state.tar.gz')
+    reset_state()
+    with patched_env(**offline_env(), **source_env(server, feed_size)):
+        AINewsAutomation().fetch_ai_news()
+
+    results = {}
+    stats = time_call(lambda: create_snapshot(snapshot_path), repeat)
+    stats['files'] = len(stats.pop('_result')['files'])
+    stats['bytes'] = os.path.getsize(snapshot_path)
+    results['create'] = stats
+
+    stats = time_call(lambda: restore_snapshot(snapshot_path), repeat)
+    stats['restored'] = stats.pop('_result')
+    results['restore'] = stats
+    return results
+
+
+def bench_politeness(host_count: int, feeds_per_host: int, interval: float, repeat: int) -> Dict:
+    """Many feeds spread over several hosts, fetched through the per-host scheduler"""
+    from concurrent.futures import ThreadPoolExecutor
+    from politeness import HostScheduler
+
+    # One stand-in server per port; the scheduler treats each host:port as its own host
+    servers = [StandInNewsServer().start() for _ in range(host_count)]
+    urls = [server.url(f"/synthetic/feed{i}/10/feed/") for i in range(feeds_per_host) for server in servers]
+    try:
+        def fetch_all():
+            scheduler = HostScheduler(min_interval=interval, respect_robots=False)
+            with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+                return [response.status_code for response in executor.map(lambda url: scheduler.get(url, timeout=10), urls)]
+
+        stats = time_call(fetch_all, repeat)
+    finally:
+        for server in servers:
+            server.stop()
+    stats['ok'] = stats.pop('_result').count(200)
+    stats['feeds'] = len(urls)
+    stats['lower_bound_s'] = (feeds_per_host - 1) * interval
+    stats['sequential_sleep_s'] = len(urls) * 1.0
+    return {'many_feeds': stats}
+
+
+def bench_pipeline(server: StandInNewsServer, feed_items: int, delay: float, repeat: int) -> Dict:
+    """Batch fetch versus the streaming pipeline when one source is slow"""
+    from main import AINewsAutomation
+
+    env = source_env(server, feed_items)
+    env['VENTUREBEAT_FEED_URL'] = server.url(f"/slow/{delay}/synthetic/venturebeat/{feed_items}/feed/")
+    results = {}
+    with patched_env(**offline_env(), **env, SELECT_SCORE_THRESHOLD='2'):
+        def batch():
+            reset_state()
+            return AINewsAutomation().fetch_ai_news()
+
+        def streamed():
+            reset_state()
+            return AINewsAutomation().stream_ai_news()
+
+        for name, func in (('batch', batch), ('stream', streamed)):
+            stats = time_call(func, repeat)
+            stats['candidates'] = len(stats.pop('_result'))
+            stats['slow_source_s'] = delay
+            results[f"{name}_{feed_items}_slow_source"] = stats
+        # Abandoned sources finish in the background; let them before the server goes away
+        time.sleep(delay)
+    return results
+
+
+def bench_polling(days: int, fixed_interval: float, repeat: int) -> Dict:
+    """Simulated polls and pickup delay for feeds of different publish rates, fixed interval versus adaptive"""
+    import random
+    from polling import AdaptivePoller
+
+    start = 1_700_000_000.0
+    end = start + days * 86400
+    rng = random.Random(1)
+    # Poisson publish times: a busy feed, a daily-ish feed and one that posts twice a week
+    feeds = {}
+    for name, mean_gap in (('fast', 1200.0), ('medium', 6 * 3600.0), ('slow', 3.5 * 86400)):
+        times, ts = [], start - 7 * 86400
+        while ts < end:
+            ts += rng.expovariate(1 / mean_gap)
+            times.append(ts)
+        feeds[name] = times
+
+    def simulate(adaptive: bool) -> Dict:
+        poller = AdaptivePoller({})
+        outcome = {}
+        for name, times in feeds.items():
+            # A week of history is already known when the simulation starts
+            poller.observe(name, [ts for ts in times if ts < start], start)
+            now, seen, polls, delays = start, start, 0, []
+            while now < end:
+                now = poller.state[name]['next_poll'] if adaptive else now + fixed_interval
+                new = [ts for ts in times if seen < ts <= now]
+                delays.extend(now - ts for ts in new)
+                seen, polls = now, polls + 1
+                poller.observe(name, new, now)
+            outcome[name] = (polls, sum(delays) / len(delays) / 60 if delays else 0.0)
+        return outcome
+
+    results = {}
+    for name, adaptive in (('fixed', False), ('adaptive', True)):
+        stats = time_call(lambda: simulate(adaptive), repeat)
+        for feed, (polls, pickup) in stats.pop('_result').items():
+            stats[f"{feed}_polls"] = polls
+            stats[f"{feed}_mean_pickup_min"] = round(pickup, 1)
+        results[f"{name}_{days}d"] = stats
+    return results
+
+
+def bench_channels(article_count: int, repeat: int) -> Dict:
+    """Per-article cost of turning one generated answer into every channel's post, fresh and from the draft cache"""
+    from article import Article
+    from channels import RENDERERS, DraftCache, parse_draft
+
+    articles = [Article(f"Model {i} cuts inference cost", 'A summary. ' * 20, f"https://example.com/story-{i}", 'Synthetic')
+                for i in range(article_count)]
+    answer = ("HOOK: Inference just got cheaper.\nSUMMARY: " + 'A new model halves the cost of serving. ' * 5 +
+              "\nINSIGHT: " + 'Pilots that stalled on cost can scale. ' * 5 +
+              "\nQUESTION: What would you automate first?\nHASHTAGS: #AI #LLM #Automation #Innovation\n")
+    cache = DraftCache(os.path.join('cache', 'bench_posts'))
+    channels = list(RENDERERS)
+
+    def generate_and_render():
+        for article in articles:
+            draft = parse_draft(answer, article)
+            cache.put(article, draft)
+            cache.renders(article, draft, channels)
+
+    def from_cache():
+        for article in articles:
+            cache.renders(article, cache.get(article), channels)
+
+    results = {}
+    for name, func in (('parse_render_cache', generate_and_render), ('cached', from_cache)):
+        stats = time_call(func, repeat)
+        stats.pop('_result')
+        stats['items'] = article_count
+        stats['channels'] = len(channels)
+        stats['us_per_item'] = stats['median_s'] / article_count * 1e6
+        results[name] = stats
+    return results
+
+
+def bench_backfill(file_count: int, items_per_file: int, repeat: int) -> Dict:
+    """Backfill throughput over synthetic RSS and NewsAPI archives, against just reading the files"""
+    from article_store import ArticleStore
+    from backfill import Backfill, archive_files
+
+    archive_dir = os.path.abspath('backfill_archive')
+    os.makedirs(archive_dir, exist_ok=True)
+    for i in range(file_count):
+        if i % 2:
+            body, name = build_synthetic_newsapi(items_per_file + i), f"newsapi-{i}.json"
+        else:
+            body, name = build_synthetic_feed(items_per_file, f"archive{i}"), f"feed-{i}.xml"
+        with open(os.path.join(archive_dir, name), 'wb') as f:
+            f.write(body)
+    total_bytes = sum(os.path.getsize(path) for path in archive_files([archive_dir]))
+
+    def read_only():
+        for path in archive_files([archive_dir]):
+            with open(path, 'rb') as f:
+                while f.read(1 << 20):
+                    pass
+
+    results = {}
+    stats = time_call(read_only, repeat)
+    stats.pop('_result')
+    stats['mb_per_s'] = round(total_bytes / stats['median_s'] / 1e6, 1)
+    results['read_only'] = stats
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        def backfill_cold():
+            reset_state()
+            os.makedirs('cache', exist_ok=True)
+            store = ArticleStore(os.path.join('cache', 'bench_backfill.db'))
+            try:
+                return Backfill(store, workers=workers).run([archive_dir])
+            finally:
+                store.close()
+
+        stats = time_call(backfill_cold, repeat)
+        summary = stats.pop('_result')
+        stats['items'] = summary['items']
+        stats['inserted'] = summary['inserted']
+        stats['items_per_s'] = summary['items'] / stats['median_s']
+        stats['mb_per_s'] = round(total_bytes / stats['median_s'] / 1e6, 1)
+        results[f"workers_{workers}"] = stats
+    return results
+
+
+def bench_deadline(server: StandInNewsServer, delay: float, budget: float, repeat: int) -> Dict:
+    """run_automation wall time with one source slower than the run deadline, without and with the deadline"""
+    from main import AINewsAutomation
+
+    env = source_env(server)
+    env['VENTUREBEAT_FEED_URL'] = server.url(f"/slow/{delay}/venturebeat/feed/")
+    results = {}
+    for name, seconds in (('unbounded', '0'), (f"deadline_{budget:g}s", str(budget))):
+        with patched_env(**offline_env(), **env, RUN_DEADLINE_SECONDS=seconds, SELECT_SCORE_THRESHOLD='10'):
+            def run_once():
+                reset_state()
+                automation = AINewsAutomation()
+                automation.run_automation()
+                return automation.deadline.summary()
+
+            stats = time_call(run_once, repeat)
+            summary = stats.pop('_result')
+            stats['slow_source_s'] = delay
+            stats['degraded'] = sorted(summary['degraded'])
+            results[name] = stats
+    # The skipped source finishes in the background; let it before the server goes away
+    time.sleep(delay)
+    return results
+
+
+def bench_end_to_end(server: StandInNewsServer, repeat: int) -> Dict:
+    """run_automation latency against the recorded fixtures with template generation"""
+    from main import AINewsAutomation
+
+    def run_once():
+        reset_state()
+        automation = AINewsAutomation()
+        automation.run_automation()
+
+    with patched_env(**offline_env(), **source_env(server)):
+        stats = time_call(run_once, repeat)
+    stats.pop('_result')
+    return {'run_automation': stats}
+
+
+def git_commit() -> str:
+    """Short commit hash of the benchmarked tree, if available"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+# name -> (progress message, run(server, args)); --only picks from these and the default runs all, in this order
+BENCHMARKS: Dict[str, Tuple[str, Callable[[StandInNewsServer, argparse.Namespace], Dict]]] = {
+    'fetch': ("📰 fetch_ai_news throughput...",
+              lambda server, args: bench_fetch(server, args.feed_sizes, args.repeat)),
+    'per_item': ("🔬 parse/filter/dedup per-item cost...",
+                 lambda server, args: bench_per_item(server, max(args.feed_sizes), args.repeat)),
+    'select': ("🎯 select_best_article scaling...",
+               lambda server, args: bench_select(args.history_sizes, 100, args.repeat)),
+    'enrich': ("📄 full-article enrichment...",
+               lambda server, args: bench_enrich(server, 5, args.repeat)),
+    'media': ("🖼️ preview image preparation...",
+              lambda server, args: bench_media(server, 5, args.repeat)),
+    'snapshot': ("💾 warm-state snapshot and restore...",
+                 lambda server, args: bench_snapshot(server, max(args.feed_sizes), args.repeat)),
+    'politeness': ("🚦 per-host politeness scheduling...",
+                   lambda server, args: bench_politeness(4, 5, 0.2, args.repeat)),
+    'pipeline': ("🌊 streaming pipeline with a slow source...",
+                 lambda server, args: bench_pipeline(server, 100, 2.0, args.repeat)),
+    'polling': ("⏱️ adaptive feed polling over a simulated week...",
+                lambda server, args: bench_polling(7, 1800.0, args.repeat)),
+    'channels': ("📣 multi-channel rendering from one draft...",
+                 lambda server, args: bench_channels(200, args.repeat)),
+    'backfill': ("🗄️ historical backfill from archived dumps...",
+                 lambda server, args: bench_backfill(20, 2000, args.repeat)),
+    'deadline': ("⏳ run deadline with a slow source...",
+                 lambda server, args: bench_deadline(server, 6.0, 4.0, args.repeat)),
+    'end_to_end': ("🚀 run_automation end-to-end...",
+                   lambda server, args: bench_end_to_end(server, args.repeat)),
+}
+
+
+def compare_results(current: Dict, baseline_path: str):
+    """Print median timing ratios against a previously saved result file"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+
+    print(f"\n📊 Comparison against {baseline.get('label')} ({baseline_path})")
+    print(f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for group, cases in current['benchmarks'].items():
+        for case, stats in cases.items():
+            old = baseline.get('benchmarks', {}).get(group, {}).get(case)
+            if not old:
+                continue
+            ratio = stats['median_s'] / old['median_s'] if old['median_s'] else float('inf')
+            print(f"{group + '.' + case:<40} {old['median_s']:>11.4f}s {stats['median_s']:>11.4f}s {ratio:>7.2f}x")
+
+
+def main():
+    """Run the benchmark suite and save the results"""
+    parser = argparse.ArgumentParser(description='Offline benchmarks for AI News Automation')
+    parser.add_argument('--label', help='Name for this result set (defaults to the git commit)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark')
+    parser.add_argument('--feed-sizes', type=int, nargs='+', default=[1000, 5000],
+                        help='Item counts for the synthetic feeds')
+    parser.add_argument('--history-sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Posted-history sizes for select_best_article')
+    parser.add_argument('--compare', help='Previous result file to compare against')
+    parser.add_argument('--output', help='Where to write the result JSON')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS),
+                        help='Run a subset of the benchmarks')
+    args = parser.parse_args()
+
+    label = args.label or git_commit()
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"{label}.json"))
+    selected = set(args.only or BENCHMARKS)
+
+    # Run inside a scratch directory so logs and posted_articles.json never touch the checkout
+    workdir = tempfile.mkdtemp(prefix='ai-news-bench-')
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    import main as automation_module  # noqa: F401  (configures logging in the scratch directory)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    server = StandInNewsServer().start()
+    print(f"🧪 Benchmarking {label} against stand-in server {server.url('/')}")
+    benchmarks = {}
+    try:
+        for name, (message, run) in BENCHMARKS.items():
+            if name in selected:
+                print(message)
+                benchmarks[name] = run(server, args)
+    finally:
+        server.stop()
+
+    results = {
+        'label': label,
+        'git_commit': git_commit(),
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'benchmarks': benchmarks,
+    }
+
+    for group, cases in benchmarks.items():
+        for case, stats in cases.items():
+            extra = ''
+            if 'us_per_item' in stats:
+                extra = f" ({stats['us_per_item']:.2f} µs/item)"
+            elif 'items_per_s' in stats:
+                extra = f" ({stats['items_per_s']:.0f} items/s)"
+            print(f"  {group}.{case}: median {stats['median_s']:.4f}s{extra}")
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {output}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Record/replay of network I/O for AI News Automation
+Captures every HTTP exchange made through requests (feeds, NewsAPI, Cohere, LinkedIn) into a compressed cassette
+"""
+
+import os
+import io
+import re
+import json
+import time
+import base64
+import random
+import tarfile
+import logging
+import tempfile
+import threading
+from collections import defaultdict, deque
+from datetime import timedelta
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, quote, quote_plus, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from snapshot import create_snapshot, restore_snapshot, state_paths
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+SECRET_PARAMS = ('apikey', 'api_key', 'key', 'token', 'access_token', 'secret', 'password')
+# Recorded bodies are already decoded, so the first three no longer describe them; cookies are
+# live sessions (li_at, JSESSIONID) and replay never needs them
+DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length', 'set-cookie', 'set-cookie2')
+# Login and token endpoints: their bodies are never stored, only status and headers
+AUTH_PATHS = re.compile(r'/(uas|checkpoint|oauth|login|authenticate)(/|$)', re.IGNORECASE)
+# Environment variables whose values must never appear in a cassette
+SECRET_ENV_NAMES = re.compile(r'(PASSWORD|SECRET|TOKEN|API_KEY)$')
+# Shorter values (placeholders such as NewsAPI's "demo" key) match too much ordinary text
+MIN_SECRET_LENGTH = 8
+
+_active: Optional['Cassette'] = None
+
+
+def redact_url(url: str) -> str:
+    """URL with credential-like query parameters masked, used for storage and matching"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = urlencode([
+        (k, '***' if k.lower() in SECRET_PARAMS else v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+    ])
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+
+def environment_secrets() -> Dict[str, str]:
+    """Credential values from the environment, by variable name"""
+    return {
+        name: value for name, value in os.environ.items()
+        if SECRET_ENV_NAMES.search(name) and len(value) >= MIN_SECRET_LENGTH
+    }
+
+
+def find_secret(chunks: Iterator[bytes], secrets: Dict[str, str]) -> Optional[str]:
+    """Name of the first environment secret found in any chunk, raw or URL-encoded"""
+    needles = [
+        (name, form.encode('utf-8'))
+        for name, value in secrets.items() for form in {value, quote(value, safe=''), quote_plus(value)}
+    ]
+    for chunk in chunks:
+        for name, needle in needles:
+            if needle in chunk:
+                return name
+    return None
+
+
+def _without_query(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+def recording() -> bool:
+    return _active is not None and _active.mode == 'record'
+
+
+def replaying() -> bool:
+    return _active is not None and _active.mode == 'replay'
+
+
+class Cassette:
+    """Patches requests' HTTPAdapter.send to record exchanges or serve them back offline
+
+    Replay matches on method and URL (secrets masked), falling back to method and
+    path when query parameters drifted, and serves repeated requests in recorded
+    order. Requests with no recording fail with ConnectionError, never hit the network.
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode {mode}")
+        self.path = path
+        self.mode = mode
+        self.meta: Dict = {}
+        self.interactions = []
+        self._exact = defaultdict(deque)
+        self._loose = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._original_send = None
+        self._state_path = None
+
+    # Recording
+
+    def _record(self, request, response):
+        redacted = bool(AUTH_PATHS.search(urlsplit(request.url).path))
+        body = b'' if redacted else response.content
+        entry = {
+            'method': request.method,
+            'url': redact_url(request.url),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            'body': base64.b64encode(body).decode('ascii'),
+            'elapsed_ms': round(response.elapsed.total_seconds() * 1000, 1),
+        }
+        if redacted:
+            entry['redacted'] = True
+        with self._lock:
+            entry['seq'] = len(self.interactions)
+            self.interactions.append(entry)
+
+    def _contents(self, files: Tuple[Tuple[str, bytes], ...]) -> Iterator[bytes]:
+        """Everything the cassette will hold, decoded: its files, response bodies and state files"""
+        for _, data in files:
+            yield data
+        for entry in self.interactions:
+            yield base64.b64decode(entry['body'])
+        if self._state_path and os.path.exists(self._state_path):
+            with tarfile.open(self._state_path, 'r:gz') as state:
+                for member in state:
+                    if member.isfile():
+                        yield state.extractfile(member).read()
+
+    def _write(self):
+        files = (
+            ('meta.json', json.dumps(self.meta, indent=2).encode('utf-8')),
+            ('interactions.jsonl', '\n'.join(json.dumps(entry) for entry in self.interactions).encode('utf-8')),
+        )
+        leaked = find_secret(self._contents(files), environment_secrets())
+        if leaked:
+            raise ValueError(f"the value of {leaked} appears in the recorded traffic or state")
+
+        tmp_path = f"{self.path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with tarfile.open(tmp_path, 'w:gz') as tar:
+            for name, data in files:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+            if self._state_path and os.path.exists(self._state_path):
+                tar.add(self._state_path, arcname='state.tar.gz')
+        os.replace(tmp_path, self.path)
+
+    # Replay
+
+    def _load(self, target_dir: str):
+        with tarfile.open(self.path, 'r:gz') as tar:
+            self.meta = json.load(tar.extractfile('meta.json'))
+            if self.meta.get('version') != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {self.meta.get('version')}")
+            lines = tar.extractfile('interactions.jsonl').read().decode('utf-8').splitlines()
+            self.interactions = [json.loads(line) for line in lines if line]
+            if 'state.tar.gz' in tar.getnames():
+                self._state_path = os.path.join(target_dir, '.cassette-state.tar.gz')
+                with open(self._state_path, 'wb') as f:
+                    f.write(tar.extractfile('state.tar.gz').read())
+
+        for entry in self.interactions:
+            entry['used'] = False
+            self._exact[(entry['method'], entry['url'])].append(entry)
+            self._loose[(entry['method'], _without_query(entry['url']))].append(entry)
+
+    def _next_entry(self, queue: deque) -> Optional[Dict]:
+        while queue:
+            entry = queue.popleft()
+            if not entry['used']:
+                entry['used'] = True
+                return entry
+        return None
+
+    def _replay(self, request) -> requests.Response:
+        url = redact_url(request.url)
+        with self._lock:
+            entry = (self._next_entry(self._exact[(request.method, url)])
+                     or self._next_entry(self._loose[(request.method, _without_query(url))]))
+        if entry is None:
+            raise requests.ConnectionError(f"No recorded response for {request.method} {url}", request=request)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = base64.b64decode(entry['body'])
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    # Lifecycle
+
+    def start(self, target_dir: str = '.'):
+        """Install the transport patch (replay also unpacks the recorded starting state)"""
+        global _active
+        if self.mode == 'record':
+            self.meta = {'version': CASSETTE_VERSION, 'recorded_at': time.time(), 'seed': random.randrange(2 ** 32)}
+            # The starting state decides watermarks and conditional requests, so it travels with the cassette
+            self._state_path = f"{self.path}.state.tmp"
+            create_snapshot(self._state_path, state_paths(include_sessions=False))
+        else:
+            self._load(target_dir)
+            if self._state_path:
+                restore_snapshot(self._state_path, target_dir)
+        random.seed(self.meta['seed'])
+
+        self._original_send = HTTPAdapter.send
+        cassette = self
+
+        def send(adapter, request, *args, **kwargs):
+            if cassette.mode == 'replay':
+                return cassette._replay(request)
+            response = cassette._original_send(adapter, request, *args, **kwargs)
+            cassette._record(request, response)
+            return response
+
+        HTTPAdapter.send = send
+        _active = self
+        logger.info(f"{'Recording' if self.mode == 'record' else 'Replaying'} network I/O "
+                    f"{'to' if self.mode == 'record' else 'from'} {self.path}")
+        return self
+
+    def stop(self):
+        """Remove the patch; recording writes the cassette"""
+        global _active
+        if self._original_send is not None:
+            HTTPAdapter.send = self._original_send
+            self._original_send = None
+        _active = None
+        if self.mode == 'record':
+            try:
+                self._write()
+                logger.info(f"Recorded {len(self.interactions)} exchanges to {self.path}")
+            except ValueError as e:
+                logger.error(f"Cassette {self.path} not written: {e}")
+            finally:
+                if self._state_path and os.path.exists(self._state_path):
+                    os.remove(self._state_path)
+        else:
+            unused = sum(1 for entry in self.interactions if not entry['used'])
+            logger.info(f"Replayed {len(self.interactions) - unused} of {len(self.interactions)} recorded exchanges")
+
+
+def start_recording(path: str) -> Cassette:
+    return Cassette(path, 'record').start()
+
+
+def start_replay(path: str, workdir: Optional[str] = None) -> Cassette:
+    """Replay a cassette from a scratch directory so the live state files are never touched"""
+    workdir = workdir or tempfile.mkdtemp(prefix='ai-news-replay-')
+    path = os.path.abspath(path)
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    logger.info(f"Replay working directory: {workdir}")
+    return Cassette(path, 'replay').start(workdir)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python cassette.py <cassette>")
+        exit(1)
+
+    with tarfile.open(sys.argv[1], 'r:gz') as tar:
+        meta = json.load(tar.extractfile('meta.json'))
+        lines = tar.extractfile('interactions.jsonl').read().decode('utf-8').splitlines()
+    print(f"version {meta['version']}, recorded {time.ctime(meta['recorded_at'])}, seed {meta['seed']}")
+    for line in lines:
+        entry = json.loads(line)
+        redacted = '  (body redacted)' if entry.get('redacted') else ''
+        print(f"{entry['seq']:>4} {entry['status']} {entry['method']:<6} {entry['elapsed_ms']:>8.1f} ms  {entry['url']}{redacted}")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Multi-channel post rendering for AI News Automation
+One structured draft per article, formatted for each channel with its own length and link rules and cached
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from article import Article
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAFT_CACHE_DIR = os.path.join('cache', 'posts')
+DEFAULT_OUTPUT_DIR = 'channel_posts'
+DEFAULT_HASHTAGS = ['#AI', '#ArtificialIntelligence', '#Technology', '#Innovation', '#MachineLearning', '#BusinessGrowth']
+# Bumped whenever the prompt's output format or a renderer changes, so cached entries are not reused
+DRAFT_VERSION = 2
+# X and Mastodon count every link as this many characters, whatever its length
+SHORT_LINK_LENGTH = 23
+
+FIELDS = ('hook', 'summary', 'insight', 'question')
+LABELLED_LINE = re.compile(r'^[\s*_#>-]*(hook|summary|insight|question|hashtags)[\s*_]*:[\s*_]*(.*)$', re.IGNORECASE)
+HASHTAG = re.compile(r'#\w+')
+URL = re.compile(r'https?://\S+')
+READ_MORE = re.compile(r'^\s*(read more|source|link)\s*:', re.IGNORECASE)
+
+
+class PostDraft:
+    """Channel-neutral post: hook, summary, insight, question, hashtags and link
+
+    Generated once per article (by Cohere or the template) and rendered per channel.
+    The link is always the article's own URL, never one taken from generated text.
+    """
+
+    __slots__ = ('hook', 'summary', 'insight', 'question', 'hashtags', 'link', 'title', 'source', 'generator')
+
+    def __init__(self, hook: str, summary: str, insight: str, question: str, hashtags: List[str],
+                 link: str, title: str = '', source: str = '', generator: str = 'template'):
+        self.hook = hook.strip()
+        self.summary = summary.strip()
+        self.insight = insight.strip()
+        self.question = question.strip()
+        self.hashtags = [tag if tag.startswith('#') else f"#{tag}" for tag in hashtags if tag.strip('#')]
+        self.link = link
+        self.title = title
+        self.source = source
+        self.generator = generator
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PostDraft':
+        return cls(data.get('hook') or '', data.get('summary') or '', data.get('insight') or '',
+                   data.get('question') or '', data.get('hashtags') or [], data.get('link') or '',
+                   data.get('title') or '', data.get('source') or '', data.get('generator') or 'template')
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"PostDraft({self.generator!r}, {self.hook[:60]!r})"
+
+
+def parse_draft(text: str, article: Article, generator: str = 'cohere') -> PostDraft:
+    """PostDraft from generated text: labelled sections when present, paragraph layout otherwise"""
+    fields: Dict[str, List[str]] = {}
+    current = None
+    for line in text.splitlines():
+        match = LABELLED_LINE.match(line)
+        if match:
+            current = match.group(1).lower()
+            fields.setdefault(current, []).append(match.group(2))
+        elif current and line.strip():
+            fields[current].append(line.strip())
+    hashtags = HASHTAG.findall(' '.join(fields.pop('hashtags', [])))
+
+    if not any(fields.get(name) for name in FIELDS):
+        # Free-form post: first paragraph hooks, the last question asks, the rest is body
+        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip() and not READ_MORE.match(p)]
+        tag_lines = [p for p in paragraphs if HASHTAG.sub('', p).strip() == '']
+        hashtags = hashtags or [tag for p in tag_lines for tag in HASHTAG.findall(p)]
+        paragraphs = [URL.sub('', p).strip() for p in paragraphs if p not in tag_lines]
+        questions = [p for p in paragraphs if p.rstrip().endswith('?')]
+        question = questions[-1] if questions else ''
+        body = [p for p in paragraphs if p is not question and p]
+        fields = {
+            'hook': body[:1],
+            'summary': body[1:2],
+            'insight': ['\n\n'.join(body[2:])],
+            'question': [question],
+        }
+
+    def field(name: str) -> str:
+        return URL.sub('', ' '.join(fields.get(name) or [])).strip()
+
+    return PostDraft(
+        field('hook') or article.title, field('summary') or article.description[:300], field('insight'),
+        field('question'), hashtags or DEFAULT_HASHTAGS, article.url, article.title, article.source, generator
+    )
+
+
+def weighted_length(text: str) -> int:
+    """Length as X and Mastodon count it: every link is SHORT_LINK_LENGTH characters"""
+    return len(URL.sub('x' * SHORT_LINK_LENGTH, text))
+
+
+def shorten(text: str, limit: int) -> str:
+    """text cut to at most limit characters at a word boundary, with an ellipsis when cut"""
+    if len(text) <= limit:
+        return text
+    if limit <= 1:
+        return ''
+    cut = text[:limit - 1].rsplit(' ', 1)[0].rstrip(' ,;:-')
+    return f"{cut}…"
+
+
+def _fit(parts: List[str], tail: str, limit: int, separator: str = '\n\n',
+         measure: Callable[[str], int] = weighted_length) -> str:
+    """Join parts in priority order before tail, shortening the first and dropping the rest to fit"""
+    budget = limit - measure(tail) - len(separator)
+    kept: List[str] = []
+    for index, part in enumerate(part for part in parts if part):
+        room = budget - sum(len(p) + len(separator) for p in kept)
+        if len(part) <= room:
+            kept.append(part)
+        elif index == 0:
+            kept.extend(filter(None, [shorten(part, room)]))
+            break
+    return separator.join(kept + [tail])
+
+
+def render_linkedin(draft: PostDraft) -> str:
+    # LinkedIn counts links at their full length; the link and hashtags always survive the cut
+    tail = f"Read more: {draft.link}\n\n{' '.join(draft.hashtags)}".strip()
+    return _fit([draft.hook, draft.summary, draft.insight, draft.question], tail, LIMITS['linkedin'], measure=len)
+
+
+def render_x(draft: PostDraft) -> str:
+    # Hook and link first; two hashtags are all that fit comfortably
+    tail = f"{draft.link} {' '.join(draft.hashtags[:2])}".strip()
+    return _fit([draft.hook, draft.question], tail, LIMITS['x'])
+
+
+def render_mastodon(draft: PostDraft) -> str:
+    # Mastodon search only finds hashtags, so keep more of them; they go last by convention
+    tail = f"{draft.link}\n\n{' '.join(draft.hashtags[:5])}".strip()
+    return _fit([draft.hook, draft.summary, draft.question], tail, LIMITS['mastodon'])
+
+
+def render_newsletter(draft: PostDraft) -> str:
+    lines = [f"### [{draft.title or draft.hook}]({draft.link})", '']
+    if draft.hook and draft.title:
+        lines += [f"**{draft.hook}**", '']
+    lines += [p + '\n' for p in (draft.summary, draft.insight) if p]
+    if draft.question:
+        lines += [f"*{draft.question}*", '']
+    if draft.source:
+        lines.append(f"Source: {draft.source}")
+    return '\n'.join(lines).strip() + '\n'
+
+
+LIMITS = {'linkedin': 3000, 'x': 280, 'mastodon': 500, 'newsletter': None}
+RENDERERS: Dict[str, Callable[[PostDraft], str]] = {
+    'linkedin': render_linkedin,
+    'x': render_x,
+    'mastodon': render_mastodon,
+    'newsletter': render_newsletter,
+}
+OUTPUT_FILES = {'linkedin': 'linkedin.txt', 'x': 'x.txt', 'mastodon': 'mastodon.txt', 'newsletter': 'newsletter.md'}
+
+
+def render(draft: PostDraft, channel: str) -> str:
+    return RENDERERS[channel](draft)
+
+
+def parse_channels(value: str) -> List[str]:
+    """Known channel names from a comma-separated list; LinkedIn is always included"""
+    channels = ['linkedin']
+    for name in (item.strip().lower() for item in value.split(',')):
+        if name in RENDERERS and name not in channels:
+            channels.append(name)
+        elif name and name not in RENDERERS:
+            logger.warning(f"Unknown post channel '{name}' ignored")
+    return channels
+
+
+class DraftCache:
+    """Drafts and their renders per article, one JSON file per article fingerprint
+
+    Only generated drafts are cached, so an article that fell back to the template is
+    offered to the LLM again next time. Entries from another DRAFT_VERSION are ignored.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_DRAFT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+    def _path(self, article: Article) -> str:
+        return os.path.join(self.cache_dir, f"{article.fingerprint}.json")
+
+    def _load(self, article: Article) -> Optional[Dict]:
+        try:
+            with open(self._path(article), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('version') == DRAFT_VERSION else None
+
+    def get(self, article: Article) -> Optional[PostDraft]:
+        entry = self._load(article)
+        return PostDraft.from_dict(entry['draft']) if entry else None
+
+    def put(self, article: Article, draft: PostDraft):
+        self._write(article, {'version': DRAFT_VERSION, 'draft': draft.to_dict(), 'renders': {}})
+
+    def _write(self, article: Article, entry: Dict):
+        with self._lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self._path(article) + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, indent=2)
+                os.replace(tmp_path, self._path(article))
+            except OSError as e:
+                logger.warning(f"Could not cache the post draft: {e}")
+
+    def renders(self, article: Article, draft: PostDraft, channels: Iterable[str]) -> Dict[str, str]:
+        """Rendered text per channel, reusing cached renders of the same draft"""
+        entry = self._load(article)
+        cached = entry['renders'] if entry and entry['draft'] == draft.to_dict() else {}
+        outputs = {channel: cached.get(channel) or render(draft, channel) for channel in channels}
+        if entry and entry['draft'] == draft.to_dict() and any(channel not in cached for channel in outputs):
+            entry['renders'] = {**cached, **outputs}
+            self._write(article, entry)
+        return outputs
+
+
+def write_outputs(outputs: Dict[str, str], output_dir: str = DEFAULT_OUTPUT_DIR):
+    """One file per channel, for manual posting or other publishers"""
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        for channel, text in outputs.items():
+            with open(os.path.join(output_dir, OUTPUT_FILES[channel]), 'w', encoding='utf-8') as f:
+                f.write(text)
+    except OSError as e:
+        logger.warning(f"Could not write channel posts to {output_dir}: {e}")
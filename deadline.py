@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Run deadline for AI News Automation
+Splits one wall-clock budget into per-stage slices that network calls and waits are capped by
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUN_BUDGET = 15 * 60.0
+# Relative weight of each stage; a stage gets its weight's share of the time left when it starts,
+# so time a fast stage does not use rolls forward to the later ones
+DEFAULT_STAGE_SHARES: Tuple[Tuple[str, float], ...] = (('fetch', 3), ('select', 1), ('generate', 2), ('post', 4))
+# Timeouts are never capped below this, so a spent budget fails calls fast instead of instantly
+MIN_TIMEOUT = 1.0
+
+_active: Optional['RunDeadline'] = None
+_active_lock = threading.Lock()
+
+
+class RunDeadline:
+    """Wall-clock budget for one run
+
+    stage(name) opens the named stage's slice; time_left() and cap() read the open slice
+    from any thread, so a thread pool or a poster library deep in the stage is held to it
+    without passing the deadline down explicitly. Without a budget (seconds=None) every
+    cap is a no-op. Stage overruns are recorded so degraded runs are visible in the logs.
+    """
+
+    def __init__(self, seconds: Optional[float] = DEFAULT_RUN_BUDGET,
+                 shares: Sequence[Tuple[str, float]] = DEFAULT_STAGE_SHARES):
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self.started = time.monotonic()
+        self.shares: Dict[str, float] = dict(shares)
+        self.stage_name: Optional[str] = None
+        self.stage_ends: Optional[float] = None
+        self.spent: Dict[str, float] = {}
+        self.degraded: Dict[str, str] = {}
+
+    @property
+    def bounded(self) -> bool:
+        return self.seconds is not None
+
+    def remaining(self) -> float:
+        """Seconds left in the whole run"""
+        if self.seconds is None:
+            return float('inf')
+        return max(0.0, self.started + self.seconds - time.monotonic())
+
+    def allot(self, name: str) -> float:
+        """The stage's share of the time left, weighed against the stages still to come"""
+        remaining = self.remaining()
+        if name not in self.shares or remaining == float('inf'):
+            return remaining
+        names = list(self.shares)
+        later = sum(self.shares[stage] for stage in names[names.index(name):])
+        return remaining * self.shares[name] / later if later else remaining
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[float]:
+        """Open a stage's slice for the duration of the block; yields its budget in seconds"""
+        budget = self.allot(name)
+        previous = self.stage_name, self.stage_ends
+        self.stage_name = name
+        self.stage_ends = time.monotonic() + budget if budget != float('inf') else None
+        started = time.monotonic()
+        if self.bounded:
+            logger.info(f"Deadline: {name} has {budget:.0f}s of the {self.remaining():.0f}s left")
+        try:
+            yield budget
+        finally:
+            used = time.monotonic() - started
+            self.spent[name] = round(self.spent.get(name, 0.0) + used, 3)
+            if self.bounded and used > budget + MIN_TIMEOUT:
+                logger.warning(f"Deadline: {name} took {used:.0f}s of a {budget:.0f}s budget")
+            self.stage_name, self.stage_ends = previous
+
+    def time_left(self) -> float:
+        """Seconds left in the open stage (the whole run outside any stage)"""
+        remaining = self.remaining()
+        if self.stage_ends is not None:
+            remaining = min(remaining, max(0.0, self.stage_ends - time.monotonic()))
+        return remaining
+
+    def cap(self, timeout: float) -> float:
+        """timeout, shortened to what the open stage has left"""
+        return max(MIN_TIMEOUT, min(timeout, self.time_left()))
+
+    def degrade(self, name: str, action: str):
+        """Record that a stage cut a corner to stay within its budget"""
+        self.degraded[name] = action
+        logger.warning(f"Deadline: {name} {action}")
+
+    def summary(self) -> Dict:
+        return {
+            'budget_s': self.seconds,
+            'elapsed_s': round(time.monotonic() - self.started, 3),
+            'spent_s': dict(self.spent),
+            'degraded': dict(self.degraded),
+        }
+
+
+_UNBOUNDED = RunDeadline(None)
+
+
+@contextmanager
+def activate(deadline: RunDeadline) -> Iterator[RunDeadline]:
+    """Make deadline the one current() returns, process-wide, until the block ends"""
+    global _active
+    with _active_lock:
+        previous, _active = _active, deadline
+    try:
+        yield deadline
+    finally:
+        with _active_lock:
+            _active = previous
+
+
+def current() -> RunDeadline:
+    """The active run's deadline, or an unbounded one outside a run"""
+    return _active or _UNBOUNDED
+
+
+def time_left() -> float:
+    return current().time_left()
+
+
+def wait_timeout() -> Optional[float]:
+    """time_left() as a timeout argument for waits: None when no deadline is active"""
+    return time_left() if current().bounded else None
+
+
+def cap_timeout(timeout: float) -> float:
+    """Shorten a per-call timeout to the active stage's remaining budget"""
+    return current().cap(timeout)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Full-article enrichment for AI News Automation
+Downloads candidate articles concurrently (streamed, size-capped) and extracts their main text
+"""
+
+import os
+import re
+import time
+import logging
+import requests
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from lxml import etree, html as lxml_html
+
+from article import Article, url_fingerprint
+from logging_config import inherit_log_context
+from politeness import HostScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('cache', 'article_text')
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_TIMEOUT = 10
+DEFAULT_WORKERS = 5
+MIN_PARAGRAPH_CHARS = 40
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe', 'svg', 'button')
+WHITESPACE = re.compile(r'\s+')
+
+
+def download_html(url: str, max_bytes: int = DEFAULT_MAX_BYTES, timeout: float = DEFAULT_TIMEOUT,
+                  session: Optional[requests.Session] = None,
+                  scheduler: Optional[HostScheduler] = None) -> Optional[bytes]:
+    """Stream an HTML page, stopping at max_bytes or when the overall timeout runs out"""
+    with scheduler.slot(url) if scheduler else nullcontext():
+        deadline = time.monotonic() + timeout
+        response = (session or requests).get(url, headers={'User-Agent': USER_AGENT}, stream=True, timeout=timeout)
+    try:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type:
+            logger.info(f"Skipping non-HTML content ({content_type}) at {url}")
+            return None
+
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            received += len(chunk)
+            # A truncated page still parses; the article body is almost always near the top
+            if received >= max_bytes or time.monotonic() > deadline:
+                break
+        return b''.join(chunks)[:max_bytes]
+    finally:
+        response.close()
+
+
+def extract_main_text(page: bytes) -> str:
+    """Extract the article body from an HTML page using lxml"""
+    if not page:
+        return ''
+    try:
+        document = lxml_html.fromstring(page)
+    except (etree.ParserError, ValueError):
+        return ''
+    etree.strip_elements(document, *BOILERPLATE_TAGS, etree.Comment, with_tail=False)
+
+    # Prefer explicit article containers, otherwise the element holding the most paragraph text
+    containers = document.xpath('//*[@itemprop="articleBody"] | //article | //main')
+    if not containers:
+        scores = {}
+        for paragraph in document.iter('p'):
+            length = len(paragraph.text_content().strip())
+            if length >= MIN_PARAGRAPH_CHARS:
+                parent = paragraph.getparent()
+                scores[parent] = scores.get(parent, 0) + length
+        if not scores:
+            return ''
+        containers = [max(scores, key=scores.get)]
+
+    container = max(containers, key=lambda element: len(element.text_content()))
+    paragraphs = []
+    for paragraph in container.iter('p', 'h2', 'h3', 'li'):
+        text = WHITESPACE.sub(' ', paragraph.text_content()).strip()
+        if len(text) >= MIN_PARAGRAPH_CHARS or paragraph.tag in ('h2', 'h3'):
+            paragraphs.append(text)
+    if not paragraphs:
+        paragraphs = [WHITESPACE.sub(' ', container.text_content()).strip()]
+    return '\n\n'.join(paragraphs)
+
+
+class ArticleEnricher:
+    """Fetches full article text for a handful of candidates in parallel, with an on-disk cache"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 timeout: float = DEFAULT_TIMEOUT, max_workers: int = DEFAULT_WORKERS,
+                 scheduler: Optional[HostScheduler] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.scheduler = scheduler
+        self.session = requests.Session()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"{url_fingerprint(url)}.txt")
+
+    def full_text(self, url: str) -> str:
+        """Main text of the article at url, from the cache when possible"""
+        cache_path = self._cache_path(url)
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        text = extract_main_text(download_html(url, self.max_bytes, self.timeout, self.session, self.scheduler))
+        if text:
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        return text
+
+    def _enrich_one(self, article: Article) -> Article:
+        if not article.url or article.full_text:
+            return article
+        try:
+            text = self.full_text(article.url)
+            if text:
+                article.full_text = text
+        except Exception as e:
+            logger.warning(f"Could not enrich {article.url}: {e}")
+        return article
+
+    def enrich(self, articles: List[Article]) -> List[Article]:
+        """Fill in full_text on each article that could be downloaded and extracted"""
+        if not articles:
+            return articles
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(articles)),
+                                initializer=inherit_log_context()) as executor:
+            list(executor.map(self._enrich_one, articles))
+        enriched = sum(1 for article in articles if article.full_text)
+        logger.info(f"Enriched {enriched}/{len(articles)} articles in {time.perf_counter() - started:.2f}s")
+        return articles
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python enrichment.py <article-url>")
+        exit(1)
+
+    print(ArticleEnricher().full_text(sys.argv[1]))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Streaming post generation for AI News Automation
+Consumes Cohere tokens as they arrive and stops as soon as the post is complete or the time budget runs out
+"""
+
+import re
+import time
+import queue
+import logging
+import threading
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_BUDGET = 30.0
+MIN_CLOSING_HASHTAGS = 2
+
+# The closing line may carry the HASHTAGS: label of the structured post format
+HASHTAG_LINE = re.compile(r'^(?:\**hashtags\**:\**\s*)?(?:#\w+\s*){%d,}$' % MIN_CLOSING_HASHTAGS, re.IGNORECASE)
+SENTENCE_END = re.compile(r'[.!?](?=\s|$)')
+_DONE = object()
+
+
+def complete_post_length(text: str) -> int:
+    """Length of the finished post within text (a question, then a closed line of hashtags), or 0"""
+    question_seen = False
+    position = 0
+    for line in text.splitlines(keepends=True):
+        position += len(line)
+        if not line.endswith('\n'):
+            break
+        if question_seen and HASHTAG_LINE.match(line.strip()):
+            return position
+        question_seen = question_seen or '?' in line
+    return 0
+
+
+def trim_partial(text: str) -> str:
+    """Cut an interrupted post back to its last complete sentence"""
+    text = text.rstrip()
+    ends = [match.end() for match in SENTENCE_END.finditer(text)]
+    return text[:ends[-1]] if ends else text
+
+
+def _cap_words(text: str, max_words: int) -> str:
+    words = re.findall(r'\S+\s*', text)
+    return trim_partial(''.join(words[:max_words]))
+
+
+def stream_post(co, prompt: str, max_tokens: int, target_words: int,
+                time_budget: float = DEFAULT_TIME_BUDGET, **generate_kwargs) -> Tuple[str, Dict]:
+    """Stream a generation, stopping early once the post is complete or over its word cap
+
+    Chunks are read on a helper thread so a stalled stream cannot hold the caller past
+    time_budget; whatever arrived by then is returned trimmed to whole sentences.
+    """
+    started = time.monotonic()
+    deadline = started + time_budget
+    stream = co.generate(prompt=prompt, max_tokens=max_tokens, stream=True, **generate_kwargs)
+    chunks: queue.Queue = queue.Queue()
+    stop = threading.Event()
+
+    def pump():
+        try:
+            for chunk in stream:
+                if stop.is_set():
+                    break
+                chunks.put(getattr(chunk, 'text', '') or '')
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(_DONE)
+
+    threading.Thread(target=pump, name='cohere-stream', daemon=True).start()
+
+    parts = []
+    chunk_count = 0
+    reason = 'end'
+    first_token_s = None
+    word_cap = int(target_words * 1.1)
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            item = chunks.get(timeout=max(0.0, remaining))
+        except queue.Empty:
+            reason = 'deadline'
+            break
+        if item is _DONE:
+            break
+        if isinstance(item, Exception):
+            if not parts:
+                raise item
+            logger.warning(f"Generation stream failed after {chunk_count} chunks: {item}")
+            reason = 'error'
+            break
+        if first_token_s is None:
+            first_token_s = time.monotonic() - started
+        chunk_count += 1
+        parts.append(item)
+        text = ''.join(parts)
+        complete_length = complete_post_length(text)
+        if complete_length:
+            parts = [text[:complete_length]]
+            reason = 'complete'
+            break
+        if len(text.split()) > word_cap:
+            reason = 'word_cap'
+            break
+
+    # Stop reading so the rest of the completion is never generated for us
+    stop.set()
+    response = getattr(stream, 'response', None)
+    if reason != 'end' and response is not None and hasattr(response, 'close'):
+        try:
+            response.close()
+        except Exception:
+            pass
+
+    text = ''.join(parts)
+    if reason == 'word_cap':
+        text = _cap_words(text, target_words)
+    elif reason in ('deadline', 'error'):
+        text = trim_partial(text)
+
+    info = {
+        'reason': reason,
+        'chunks': chunk_count,
+        'words': len(text.split()),
+        'seconds': round(time.monotonic() - started, 3),
+        'first_token_s': round(first_token_s, 3) if first_token_s is not None else None,
+    }
+    return text.strip(), info
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Run journal for AI News Automation
+Checkpoints each stage's output so an interrupted run can resume without repeating network or LLM work
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+DEFAULT_JOURNAL_PATH = 'run_journal.jsonl'
+DEFAULT_RESUME_MAX_AGE_HOURS = 24.0
+STAGES = ('fetched', 'selected', 'generated', 'queued', 'post_started', 'posted', 'done')
+
+
+class RunJournal:
+    """Append-only JSON-lines journal of the current run's completed stages
+
+    begin() truncates the file for a new run; every record() is flushed and fsynced
+    before the next stage starts, so a crash or a killed runner loses at most the
+    stage in progress. A torn last line is ignored on load.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self.run_id: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.entries: Dict[str, Dict] = {}
+        self.last_stage: Optional[str] = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not read run journal {self.path}: {e}")
+            return
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning(f"Ignoring torn line in run journal {self.path}")
+                break
+            if entry.get('stage') == 'begin':
+                if entry.get('version') != JOURNAL_VERSION:
+                    logger.warning(f"Ignoring run journal with version {entry.get('version')}")
+                    return
+                self.run_id = entry.get('run_id')
+                self.started_at = entry.get('at')
+            elif self.run_id and entry.get('stage') in STAGES:
+                self.entries[entry['stage']] = entry.get('data') or {}
+                self.last_stage = entry['stage']
+
+    def _append(self, entry: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    @property
+    def complete(self) -> bool:
+        return 'done' in self.entries
+
+    def resumable(self, max_age_hours: float = DEFAULT_RESUME_MAX_AGE_HOURS) -> bool:
+        """True for an unfinished run that started within max_age_hours, or one whose post was queued"""
+        if not self.run_id or self.complete or not self.entries:
+            return False
+        if self.last_stage == 'queued':
+            # Only posting is left, and a queued post waits for the next run however far away it is
+            return True
+        return time.time() - (self.started_at or 0) < max_age_hours * 3600
+
+    def begin(self, run_id: str):
+        """Start a new journal for run_id, discarding the previous run's"""
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.entries = {}
+        self.last_stage = None
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+        self._append({'stage': 'begin', 'version': JOURNAL_VERSION, 'run_id': run_id, 'at': self.started_at})
+
+    def record(self, stage: str, data: Optional[Dict] = None):
+        """Checkpoint a completed stage's output"""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown journal stage {stage}")
+        data = data or {}
+        try:
+            self._append({'stage': stage, 'at': time.time(), 'data': data})
+        except OSError as e:
+            # A lost checkpoint only costs the ability to resume from it
+            logger.warning(f"Could not write {stage} checkpoint: {e}")
+        self.entries[stage] = data
+        self.last_stage = stage
+
+    def get(self, stage: str) -> Optional[Dict]:
+        return self.entries.get(stage)
+
+
+if __name__ == "__main__":
+    import sys
+
+    journal = RunJournal(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_JOURNAL_PATH)
+    if not journal.run_id:
+        print("No run journal")
+        exit(0)
+    status = 'complete' if journal.complete else 'resumable' if journal.resumable() else 'interrupted (too old to resume)'
+    print(f"Run {journal.run_id} started {time.ctime(journal.started_at or 0)}: {status}")
+    for stage in STAGES:
+        if stage not in journal.entries:
+            continue
+        fields = []
+        for key, value in journal.entries[stage].items():
+            if isinstance(value, list):
+                value = f"{len(value)} items"
+            elif isinstance(value, dict):
+                value = repr(value.get('title', ''))
+            else:
+                value = repr(value)
+            fields.append(f"{key}={value[:60]}")
+        print(f"  {stage:<13} {', '.join(fields)}")
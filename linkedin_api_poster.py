@@ -8,131 +8,238 @@ import os
 import time
 import logging
 import requests
+from contextlib import contextmanager
 from linkedin_api import Linkedin
+from politeness import parse_retry_after
+from deadline import cap_timeout, time_left
 
 logger = logging.getLogger(__name__)
 
+# Can point at mock_linkedin.py for load tests (LINKEDIN_API_BASE)
+DEFAULT_API_BASE = "https://api.linkedin.com"
+REQUEST_TIMEOUT = 30
+MAX_RETRY_WAIT = 30
+# Selenium needs a login, page loads and an upload; with less of the run deadline left it is skipped
+SELENIUM_MIN_SECONDS = 60
+
+def api_base():
+    return os.getenv('LINKEDIN_API_BASE', DEFAULT_API_BASE).rstrip('/')
+
+@contextmanager
+def web_base(url):
+    """Send the linkedin_api client's login and voyager calls to url until the block exits
+
+    The client reads its base URLs from class attributes, so this affects every client in
+    the process; only the load harness enters it, around a run against the mock server.
+    """
+    from linkedin_api.client import Client
+    saved = Client.LINKEDIN_BASE_URL, Client.API_BASE_URL
+    url = url.rstrip('/')
+    Client.LINKEDIN_BASE_URL = url
+    Client.API_BASE_URL = f"{url}/voyager/api"
+    try:
+        yield
+    finally:
+        Client.LINKEDIN_BASE_URL, Client.API_BASE_URL = saved
+
 def post_to_linkedin_api(email, password, post_content):
     """Post to LinkedIn using LinkedIn API"""
     try:
-        print("🔐 Authenticating with LinkedIn API...")
+        logger.info("🔐 Authenticating with LinkedIn API...")
         
         # Authenticate with LinkedIn
         api = Linkedin(email, password)
         
-        print("✅ Successfully authenticated with LinkedIn")
+        logger.info("✅ Successfully authenticated with LinkedIn")
         
         # Post content
-        print("📝 Creating post...")
+        logger.info("📝 Creating post...")
         result = api.post(post_content)
         
         if result:
-            print("✅ Successfully posted to LinkedIn!")
+            logger.info("✅ Successfully posted to LinkedIn!")
             return True
         else:
-            print("❌ Failed to post to LinkedIn")
+            logger.error("❌ Failed to post to LinkedIn")
             return False
             
     except Exception as e:
-        print(f"❌ Error posting to LinkedIn: {e}")
+        logger.error(f"❌ Error posting to LinkedIn: {e}")
         
         # Handle LinkedIn challenge
         if "CHALLENGE" in str(e):
-            print("⚠️ LinkedIn requires additional verification")
-            print("💡 This is normal for new automated logins")
-            print("🔄 Trying alternative method...")
+            logger.warning("⚠️ LinkedIn requires additional verification")
+            logger.info("💡 This is normal for new automated logins")
+            logger.info("🔄 Trying alternative method...")
             return False
         
         return False
 
-def post_to_linkedin_rest_api(email, password, post_content):
+def upload_image_rest_api(headers, author, image_path):
+    """Register an image upload with LinkedIn and send the bytes; returns the asset URN"""
+    register = requests.post(
+        f"{api_base()}/v2/assets?action=registerUpload",
+        headers=headers,
+        timeout=cap_timeout(REQUEST_TIMEOUT),
+        json={
+            "registerUploadRequest": {
+                "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
+                "owner": author,
+                "serviceRelationships": [{
+                    "relationshipType": "OWNER",
+                    "identifier": "urn:li:userGeneratedContent"
+                }]
+            }
+        }
+    )
+    register.raise_for_status()
+    value = register.json()["value"]
+    upload_url = value["uploadMechanism"]["com.linkedin.digitalmedia.uploadMechanism.MediaUploadHttpRequest"]["uploadUrl"]
+    
+    with open(image_path, 'rb') as f:
+        upload = requests.put(upload_url, data=f, headers={"Authorization": headers["Authorization"]},
+                              timeout=cap_timeout(REQUEST_TIMEOUT))
+    upload.raise_for_status()
+    return value["asset"]
+
+def post_to_linkedin_rest_api(email, password, post_content, image_path=None):
     """Alternative method using LinkedIn REST API"""
     try:
-        print("🔐 Using LinkedIn REST API...")
+        logger.info("🔐 Using LinkedIn REST API...")
         
         # LinkedIn REST API endpoint
-        url = "https://api.linkedin.com/v2/ugcPosts"
+        url = f"{api_base()}/v2/ugcPosts"
+        
+        token = get_linkedin_token(email, password)
+        if not token:
+            logger.info("No LINKEDIN_ACCESS_TOKEN set, skipping REST API")
+            return False
         
         headers = {
-            "Authorization": f"Bearer {get_linkedin_token(email, password)}",
+            "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
             "X-Restli-Protocol-Version": "2.0.0"
         }
+        author = f"urn:li:person:{get_linkedin_person_id(email, password)}"
+        retries = int(os.getenv('LINKEDIN_POST_RETRIES', '2'))
+        
+        share_content = {
+            "shareCommentary": {
+                "text": post_content
+            },
+            "shareMediaCategory": "NONE"
+        }
+        if image_path:
+            try:
+                asset = upload_image_rest_api(headers, author, image_path)
+                share_content["shareMediaCategory"] = "IMAGE"
+                share_content["media"] = [{"status": "READY", "media": asset}]
+            except Exception as e:
+                logger.warning(f"Image upload failed, posting text only: {e}")
         
         data = {
-            "author": f"urn:li:person:{get_linkedin_person_id(email, password)}",
+            "author": author,
             "lifecycleState": "PUBLISHED",
             "specificContent": {
-                "com.linkedin.ugc.ShareContent": {
-                    "shareCommentary": {
-                        "text": post_content
-                    },
-                    "shareMediaCategory": "NONE"
-                }
+                "com.linkedin.ugc.ShareContent": share_content
             },
             "visibility": {
                 "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
             }
         }
         
-        response = requests.post(url, headers=headers, json=data)
+        # 429 and 503 mean the post was not accepted, so they are the only statuses retried
+        for attempt in range(retries + 1):
+            response = requests.post(url, headers=headers, json=data, timeout=cap_timeout(REQUEST_TIMEOUT))
+            if response.status_code not in (429, 503) or attempt == retries:
+                break
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            delay = min(MAX_RETRY_WAIT, delay if delay is not None else 2 ** attempt)
+            if delay >= time_left():
+                logger.warning(f"REST API answered {response.status_code}; no time left in the run to retry")
+                break
+            logger.warning(f"REST API answered {response.status_code}, retrying in {delay:.0f}s")
+            time.sleep(delay)
         
         if response.status_code == 201:
-            print("✅ Successfully posted to LinkedIn via REST API!")
+            logger.info("✅ Successfully posted to LinkedIn via REST API!")
             return True
         else:
-            print(f"❌ Failed to post: {response.status_code} - {response.text}")
+            logger.error(f"❌ Failed to post: {response.status_code} - {response.text}")
             return False
             
     except Exception as e:
-        print(f"❌ Error with REST API: {e}")
+        logger.error(f"❌ Error with REST API: {e}")
         return False
 
 def get_linkedin_token(email, password):
     """Get LinkedIn access token (simplified)"""
-    # This would require OAuth2 flow in production
-    # For now, we'll use the LinkedIn API library
-    return None
+    # This would require OAuth2 flow in production; a token issued elsewhere can be supplied instead
+    return os.getenv('LINKEDIN_ACCESS_TOKEN')
 
 def get_linkedin_person_id(email, password):
-    """Get LinkedIn person ID (simplified)"""
-    # This would require API call to get user profile
-    # For now, we'll use the LinkedIn API library
-    return None
+    """Get LinkedIn person ID from LINKEDIN_PERSON_ID or the token's userinfo"""
+    person_id = os.getenv('LINKEDIN_PERSON_ID')
+    if person_id:
+        return person_id
+    token = get_linkedin_token(email, password)
+    if not token:
+        return None
+    response = requests.get(f"{api_base()}/v2/userinfo", headers={"Authorization": f"Bearer {token}"},
+                            timeout=cap_timeout(REQUEST_TIMEOUT))
+    response.raise_for_status()
+    return response.json().get("sub")
 
-def post_to_linkedin_selenium(email, password, post_content):
+def post_to_linkedin_selenium(email, password, post_content, image_path=None):
     """Fallback to Selenium if API fails"""
+    from cassette import replaying
+    if replaying():
+        # Browser traffic is not captured in cassettes
+        logger.info("Skipping Selenium fallback during replay")
+        return False
     try:
-        from linkedin_poster import post_to_linkedin_selenium as selenium_post
-        return selenium_post(email, password, post_content)
+        # Playwright is the async engine: one shared browser, a light context per post
+        if os.getenv('LINKEDIN_BROWSER_ENGINE', 'selenium').lower() == 'playwright':
+            from linkedin_playwright_poster import post_to_linkedin_playwright as browser_post
+        else:
+            from linkedin_poster import post_to_linkedin_selenium as browser_post
+        return browser_post(email, password, post_content, image_path)
     except Exception as e:
-        print(f"❌ Selenium fallback failed: {e}")
+        logger.error(f"❌ Browser fallback failed: {e}")
         return False
 
-def post_to_linkedin(email, password, post_content):
+def post_to_linkedin(email, password, post_content, image_path=None):
     """Main function to post to LinkedIn with multiple fallback methods"""
     
-    print("🚀 Attempting to post to LinkedIn...")
+    logger.info("🚀 Attempting to post to LinkedIn...")
     
     # Try LinkedIn API first
+    if image_path:
+        logger.info("The linkedin_api client posts text only; the image is attached by the REST and Selenium backends")
     try:
         if post_to_linkedin_api(email, password, post_content):
             return True
     except Exception as e:
-        print(f"LinkedIn API failed: {e}")
+        logger.warning(f"LinkedIn API failed: {e}")
     
     # Try REST API
     try:
-        if post_to_linkedin_rest_api(email, password, post_content):
+        if post_to_linkedin_rest_api(email, password, post_content, image_path):
             return True
     except Exception as e:
-        print(f"REST API failed: {e}")
+        logger.warning(f"REST API failed: {e}")
     
     # Fallback to Selenium
-    print("🔄 Falling back to Selenium...")
-    return post_to_linkedin_selenium(email, password, post_content)
+    if time_left() < SELENIUM_MIN_SECONDS:
+        logger.warning(f"Only {time_left():.0f}s left in the run; skipping the Selenium fallback")
+        return False
+    logger.info("🔄 Falling back to Selenium...")
+    return post_to_linkedin_selenium(email, password, post_content, image_path)
 
 if __name__ == "__main__":
+    from logging_config import configure_logging
+    configure_logging()
+    
     # Test the LinkedIn posting
     email = os.getenv('LINKEDIN_EMAIL')
     password = os.getenv('LINKEDIN_PASSWORD')
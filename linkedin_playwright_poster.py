@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Poster using Playwright's async API
+Many account posts concurrently from one event loop, each in a lightweight context of one shared browser
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:  # Playwright is optional; the Selenium poster works without it
+    async_playwright = None
+    PlaywrightTimeoutError = asyncio.TimeoutError
+
+from deadline import cap_timeout, time_left
+from post_editor import (EDITOR_SELECTOR, FEED_READY_SELECTOR, FILE_INPUT_SELECTOR, IMAGE_PREVIEW_SELECTOR,
+                         INSERT_TEXT_FUNCTION, POST_BUTTON_SELECTOR, START_POST_SELECTOR, normalize_editor_text)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEB_BASE = 'https://www.linkedin.com'
+DEFAULT_SESSION_DIR = 'sessions'
+DEFAULT_MAX_CONCURRENCY = 8
+# The Selenium poster waits this long after clicking Post; here the wait only holds one coroutine
+POST_SETTLE_SECONDS = 5.0
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36")
+INSERT_TEXT_CALL = f"(editor, [text, method]) => ({INSERT_TEXT_FUNCTION})(editor, text, method)"
+
+
+def playwright_available() -> bool:
+    return async_playwright is not None
+
+
+def session_file(email: str) -> str:
+    """Per-account storage state next to the Selenium cookie file (snapshots carry both only with SNAPSHOT_INCLUDE_SESSIONS=1)"""
+    cookie_file = os.getenv('LINKEDIN_COOKIE_FILE')
+    directory = os.path.dirname(cookie_file) if cookie_file else DEFAULT_SESSION_DIR
+    digest = hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory or '.', f"playwright-{digest}.json")
+
+
+def _ms(seconds: float) -> float:
+    """A Playwright timeout in milliseconds, capped by the run deadline"""
+    return cap_timeout(seconds) * 1000
+
+
+class AsyncLinkedInPoster:
+    """One browser process shared by every post; each post gets its own browser context
+
+    A context is an isolated profile (cookies, storage, cache) inside the shared
+    browser, costing a few MB instead of a whole Chrome process per post. Waits are
+    awaited, so posts for many accounts overlap on one event loop; max_concurrency
+    bounds how many contexts are open at once. Sessions are kept per account as
+    Playwright storage state and reused until LinkedIn asks for a login again.
+    """
+
+    def __init__(self, headless: Optional[bool] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.web_base = os.getenv('LINKEDIN_WEB_BASE', DEFAULT_WEB_BASE).rstrip('/')
+        if headless is None:
+            headless = os.getenv('SELENIUM_HEADLESS', '0').lower() in ('1', 'true', 'yes')
+        self.headless = headless
+        self.input_mode = os.getenv('SELENIUM_INPUT_MODE', 'bulk').lower()
+        self.max_concurrency = max(1, max_concurrency)
+        self.playwright = None
+        self.browser = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        if not playwright_available():
+            raise RuntimeError("Playwright is not installed (pip install playwright && playwright install chromium)")
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            # An installed Chrome (e.g. the workflow's) instead of Playwright's own download
+            executable_path=os.getenv('PLAYWRIGHT_CHROME_PATH') or None,
+            args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-blink-features=AutomationControlled'],
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        logger.info(f"Playwright browser started (up to {self.max_concurrency} concurrent posts)")
+        return self
+
+    async def close(self):
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _logged_in(self, page) -> bool:
+        await page.goto(f"{self.web_base}/feed/", timeout=_ms(20))
+        try:
+            await page.wait_for_selector(FEED_READY_SELECTOR, timeout=_ms(10))
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _login(self, page, email: str, password: str) -> bool:
+        logger.info("🌐 Logging in to LinkedIn...")
+        await page.goto(f"{self.web_base}/login", timeout=_ms(20))
+        await page.fill('#username', email, timeout=_ms(20))
+        await page.fill('#password', password, timeout=_ms(5))
+        await page.click("button[type='submit']", timeout=_ms(5))
+        try:
+            await page.wait_for_selector(FEED_READY_SELECTOR, timeout=_ms(30))
+        except PlaywrightTimeoutError:
+            logger.error(f"Timeout during LinkedIn login (landed on {page.url})")
+            return False
+        logger.info("Successfully logged in to LinkedIn")
+        return True
+
+    async def _save_session(self, context, path: str):
+        try:
+            state = await context.storage_state()
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # Unique temporary name: two posts for one account may finish together
+            tmp_path = f"{path}.{os.getpid()}.{id(context)}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not save LinkedIn session: {e}")
+
+    async def _insert_text(self, editor, text: str) -> bool:
+        """Insert text through the editor's own input path and verify it landed exactly"""
+        expected = normalize_editor_text(text)
+        for method in ('insertText', 'paste'):
+            try:
+                await editor.evaluate(INSERT_TEXT_CALL, [text, method])
+                if normalize_editor_text(await editor.inner_text()) == expected:
+                    return True
+                logger.warning(f"Editor text differs after {method} insert, trying next method")
+            except Exception as e:
+                logger.warning(f"Bulk {method} insert failed: {e}")
+        return False
+
+    async def _attach_image(self, page, image_path: str) -> bool:
+        try:
+            await page.set_input_files(FILE_INPUT_SELECTOR, os.path.abspath(image_path), timeout=_ms(5))
+            # The editor shows a preview once the upload finishes
+            await page.wait_for_selector(IMAGE_PREVIEW_SELECTOR, timeout=_ms(20))
+            logger.info("Image attached to post")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not attach image, posting text only: {e}")
+            return False
+
+    async def _create_post(self, page, post_content: str, image_path: Optional[str]) -> bool:
+        await page.click(START_POST_SELECTOR, timeout=_ms(10))
+        editor = await page.wait_for_selector(EDITOR_SELECTOR, timeout=_ms(10))
+
+        # Insert the whole post at once; fall back to Playwright's fill if the editor rejects it
+        if self.input_mode != 'type' and await self._insert_text(editor, post_content):
+            logger.info("Post text inserted in one operation")
+        else:
+            await editor.fill(post_content)
+
+        if image_path:
+            await self._attach_image(page, image_path)
+
+        await page.click(POST_BUTTON_SELECTOR, timeout=_ms(10))
+        # Give the submit time to reach LinkedIn before the context is closed
+        await asyncio.sleep(min(POST_SETTLE_SECONDS, max(0.0, time_left())))
+        return True
+
+    async def post(self, email: str, password: str, post_content: str, image_path: Optional[str] = None) -> bool:
+        """Log in (or reuse the account's session) and publish one post in a fresh context"""
+        if not self.browser:
+            raise RuntimeError("AsyncLinkedInPoster.start() has not been called")
+        async with self._slots:
+            path = session_file(email)
+            context = await self.browser.new_context(
+                storage_state=path if os.path.exists(path) else None, user_agent=USER_AGENT
+            )
+            try:
+                page = await context.new_page()
+                if await self._logged_in(page):
+                    logger.info("Reused saved LinkedIn session")
+                elif await self._login(page, email, password):
+                    await self._save_session(context, path)
+                else:
+                    return False
+                success = await self._create_post(page, post_content, image_path)
+                if success:
+                    logger.info("Successfully posted to LinkedIn")
+                return success
+            except PlaywrightTimeoutError:
+                logger.error("Timeout while creating LinkedIn post")
+                return False
+            except Exception as e:
+                logger.error(f"Error creating LinkedIn post: {e}")
+                return False
+            finally:
+                await context.close()
+
+    async def post_many(self, posts: Sequence[Tuple[str, str, str, Optional[str]]]) -> List[bool]:
+        """Publish (email, password, content, image_path) posts concurrently; one result per post, in order"""
+        return list(await asyncio.gather(*(self.post(*post) for post in posts)))
+
+
+class PlaywrightPostingEngine:
+    """Blocking front end for AsyncLinkedInPoster, for callers that are not async
+
+    The browser and event loop live on one background thread; post() may be called
+    from any number of threads and every call runs as a coroutine on that loop.
+    """
+
+    def __init__(self, headless: Optional[bool] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.poster = AsyncLinkedInPoster(headless, max_concurrency)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='playwright-poster', daemon=True)
+        self._thread.start()
+        try:
+            self._run(self.poster.start())
+        except Exception:
+            self.close()
+            raise
+
+    def _run(self, coroutine, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def post(self, email: str, password: str, post_content: str, image_path: Optional[str] = None) -> bool:
+        return self._run(self.poster.post(email, password, post_content, image_path))
+
+    def close(self):
+        try:
+            self._run(self.poster.close(), timeout=30)
+        except Exception as e:
+            logger.warning(f"Error closing the Playwright browser: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+async def _post_once(email, password, post_content, image_path):
+    async with AsyncLinkedInPoster() as poster:
+        return await poster.post(email, password, post_content, image_path)
+
+
+def post_to_linkedin_playwright(email, password, post_content, image_path=None):
+    """Same interface as post_to_linkedin_selenium, backed by Playwright"""
+    if not playwright_available():
+        logger.error("Playwright is not installed (pip install playwright && playwright install chromium)")
+        return False
+    try:
+        return asyncio.run(_post_once(email, password, post_content, image_path))
+    except Exception as e:
+        logger.error(f"Error in LinkedIn posting: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    from logging_config import configure_logging
+    configure_logging()
+
+    email = os.getenv('LINKEDIN_EMAIL')
+    password = os.getenv('LINKEDIN_PASSWORD')
+
+    if not email or not password:
+        print("Please set LINKEDIN_EMAIL and LINKEDIN_PASSWORD environment variables")
+        exit(1)
+
+    try:
+        with open('linkedin_post.txt', 'r') as f:
+            post_content = f.read()
+    except FileNotFoundError:
+        print("linkedin_post.txt not found")
+        exit(1)
+
+    if post_to_linkedin_playwright(email, password, post_content):
+        print("Successfully posted to LinkedIn!")
+    else:
+        print("Failed to post to LinkedIn")
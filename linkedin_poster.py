@@ -5,6 +5,7 @@ Automated posting to LinkedIn using browser automation
 """
 
 import os
+import json
 import time
 import logging
 from selenium import webdriver
@@ -14,12 +15,28 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from deadline import cap_timeout
+from post_editor import (EDITOR_SELECTOR, FEED_READY_SELECTOR, FILE_INPUT_SELECTOR, IMAGE_PREVIEW_SELECTOR,
+                         INSERT_TEXT_FUNCTION, POST_BUTTON_SELECTOR, POST_MODAL_SELECTOR, START_POST_SELECTOR,
+                         normalize_editor_text)
+
 logger = logging.getLogger(__name__)
 
+# Saved after a successful login so later runs skip the login form; state snapshots only
+# carry it with SNAPSHOT_INCLUDE_SESSIONS=1, so a fresh runner usually logs in again
+DEFAULT_COOKIE_FILE = os.path.join('sessions', 'linkedin_cookies.json')
+
+INSERT_TEXT_SCRIPT = f"({INSERT_TEXT_FUNCTION})(arguments[0], arguments[1], arguments[2]);"
+
 class LinkedInPoster:
-    def __init__(self, email, password):
+    def __init__(self, email, password, cookie_file=None):
         self.email = email
         self.password = password
+        self.cookie_file = cookie_file or os.getenv('LINKEDIN_COOKIE_FILE', DEFAULT_COOKIE_FILE)
+        # 'bulk' inserts the post in one operation; 'type' sends it key by key
+        self.input_mode = os.getenv('SELENIUM_INPUT_MODE', 'bulk').lower()
+        self.web_base = os.getenv('LINKEDIN_WEB_BASE', 'https://www.linkedin.com').rstrip('/')
+        self.headless = os.getenv('SELENIUM_HEADLESS', '0').lower() in ('1', 'true', 'yes')
         self.driver = None
         
     def setup_driver(self):
@@ -33,8 +50,9 @@ class LinkedInPoster:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
-        # Run with browser window visible for better LinkedIn compatibility
-        # chrome_options.add_argument("--headless")
+        # Run with browser window visible for better LinkedIn compatibility (headless suits the mock server)
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
         
         # Add more options to avoid detection
         chrome_options.add_argument("--disable-web-security")
@@ -90,19 +108,57 @@ class LinkedInPoster:
                 logger.error(f"Failed to install Chrome: {install_error}")
                 return False
     
+    def load_session(self):
+        """Reuse saved session cookies; returns True if they still give a logged-in feed"""
+        if not os.path.exists(self.cookie_file):
+            return False
+        try:
+            with open(self.cookie_file, 'r') as f:
+                cookies = json.load(f)
+            
+            # Cookies can only be set for the domain currently loaded
+            self.driver.get(f"{self.web_base}/")
+            for cookie in cookies:
+                cookie.pop('sameSite', None)
+                self.driver.add_cookie(cookie)
+            
+            self.driver.get(f"{self.web_base}/feed/")
+            WebDriverWait(self.driver, cap_timeout(10)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, FEED_READY_SELECTOR))
+            )
+            logger.info("Reused saved LinkedIn session")
+            return True
+        except Exception as e:
+            logger.warning(f"Saved LinkedIn session not usable, logging in again: {e}")
+            return False
+    
+    def save_session(self):
+        """Persist session cookies for the next run"""
+        try:
+            os.makedirs(os.path.dirname(self.cookie_file) or '.', exist_ok=True)
+            tmp_path = f"{self.cookie_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.driver.get_cookies(), f)
+            os.replace(tmp_path, self.cookie_file)
+        except Exception as e:
+            logger.warning(f"Could not save LinkedIn session: {e}")
+    
     def login_to_linkedin(self):
         """Login to LinkedIn with improved error handling"""
         try:
             if not self.driver:
                 logger.error("Driver not initialized")
                 return False
+            
+            if self.load_session():
+                return True
                 
-            print("🌐 Navigating to LinkedIn login page...")
-            self.driver.get("https://www.linkedin.com/login")
+            logger.info("🌐 Navigating to LinkedIn login page...")
+            self.driver.get(f"{self.web_base}/login")
             
             # Wait for page to load with longer timeout
-            print("⏳ Waiting for login form to load...")
-            WebDriverWait(self.driver, 20).until(
+            logger.info("⏳ Waiting for login form to load...")
+            WebDriverWait(self.driver, cap_timeout(20)).until(
                 EC.presence_of_element_located((By.ID, "username"))
             )
             
@@ -110,31 +166,32 @@ class LinkedInPoster:
             time.sleep(2)
             
             # Enter email
-            print("📧 Entering email...")
+            logger.info("📧 Entering email...")
             email_field = self.driver.find_element(By.ID, "username")
             email_field.clear()
             email_field.send_keys(self.email)
             time.sleep(1)
             
             # Enter password
-            print("🔒 Entering password...")
+            logger.info("🔒 Entering password...")
             password_field = self.driver.find_element(By.ID, "password")
             password_field.clear()
             password_field.send_keys(self.password)
             time.sleep(1)
             
             # Click sign in button
-            print("🔘 Clicking sign in button...")
+            logger.info("🔘 Clicking sign in button...")
             sign_in_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             sign_in_button.click()
             
             # Wait for login to complete with longer timeout
-            print("⏳ Waiting for login to complete...")
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-test-id='nav-home']"))
+            logger.info("⏳ Waiting for login to complete...")
+            WebDriverWait(self.driver, cap_timeout(30)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, FEED_READY_SELECTOR))
             )
             
             logger.info("Successfully logged in to LinkedIn")
+            self.save_session()
             return True
             
         except TimeoutException:
@@ -144,38 +201,78 @@ class LinkedInPoster:
             logger.error(f"Error during LinkedIn login: {e}")
             return False
     
-    def create_post(self, post_content):
+    def attach_image(self, image_path):
+        """Attach an image through the editor's media file input; the post goes out text-only on failure"""
+        try:
+            file_input = WebDriverWait(self.driver, cap_timeout(5)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, FILE_INPUT_SELECTOR))
+            )
+            file_input.send_keys(os.path.abspath(image_path))
+            # The editor shows a preview once the upload finishes
+            WebDriverWait(self.driver, cap_timeout(20)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, IMAGE_PREVIEW_SELECTOR))
+            )
+            logger.info("Image attached to post")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not attach image, posting text only: {e}")
+            return False
+    
+    def editor_text(self, element):
+        """Text the editor currently holds, normalized for comparison"""
+        return normalize_editor_text(self.driver.execute_script("return arguments[0].innerText;", element))
+    
+    def insert_text(self, element, text):
+        """Insert text through the editor's own input path and verify it landed exactly"""
+        expected = normalize_editor_text(text)
+        for method in ('insertText', 'paste'):
+            try:
+                self.driver.execute_script(INSERT_TEXT_SCRIPT, element, text, method)
+                if self.editor_text(element) == expected:
+                    return True
+                logger.warning(f"Editor text differs after {method} insert, trying next method")
+            except Exception as e:
+                logger.warning(f"Bulk {method} insert failed: {e}")
+        return False
+    
+    def create_post(self, post_content, image_path=None):
         """Create a new post on LinkedIn"""
         try:
             # Navigate to LinkedIn home page
-            self.driver.get("https://www.linkedin.com/feed/")
+            self.driver.get(f"{self.web_base}/feed/")
             time.sleep(3)
             
             # Find and click the "Start a post" button
-            start_post_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label='Start a post']"))
+            start_post_button = WebDriverWait(self.driver, cap_timeout(10)).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, START_POST_SELECTOR))
             )
             start_post_button.click()
             
             # Wait for post modal to appear
-            post_modal = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-test-id='post-modal']"))
+            post_modal = WebDriverWait(self.driver, cap_timeout(10)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, POST_MODAL_SELECTOR))
             )
             
             # Find the post text area
-            post_text_area = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-test-id='post-modal'] div[role='textbox']"))
+            post_text_area = WebDriverWait(self.driver, cap_timeout(10)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, EDITOR_SELECTOR))
             )
             
-            # Clear any existing text and enter post content
-            post_text_area.clear()
-            post_text_area.send_keys(post_content)
+            # Insert the whole post at once; type it only if the editor rejects the bulk insert
+            if self.input_mode != 'type' and self.insert_text(post_text_area, post_content):
+                logger.info("Post text inserted in one operation")
+            else:
+                post_text_area.clear()
+                post_text_area.send_keys(post_content)
+            
+            if image_path:
+                self.attach_image(image_path)
             
             # Wait a moment for the post to be processed
             time.sleep(2)
             
             # Click the "Post" button
-            post_button = self.driver.find_element(By.CSS_SELECTOR, "button[data-test-id='post-button']")
+            post_button = self.driver.find_element(By.CSS_SELECTOR, POST_BUTTON_SELECTOR)
             post_button.click()
             
             # Wait for post to be published
@@ -197,7 +294,7 @@ class LinkedInPoster:
             self.driver.quit()
             logger.info("Browser driver closed")
 
-def post_to_linkedin_selenium(email, password, post_content):
+def post_to_linkedin_selenium(email, password, post_content, image_path=None):
     """Main function to post to LinkedIn using Selenium"""
     poster = LinkedInPoster(email, password)
     
@@ -211,7 +308,7 @@ def post_to_linkedin_selenium(email, password, post_content):
             return False
         
         # Create post
-        success = poster.create_post(post_content)
+        success = poster.create_post(post_content, image_path)
         
         return success
         
@@ -222,6 +319,9 @@ def post_to_linkedin_selenium(email, password, post_content):
         poster.close_driver()
 
 if __name__ == "__main__":
+    from logging_config import configure_logging
+    configure_logging()
+    
     # Example usage
     email = os.getenv('LINKEDIN_EMAIL')
     password = os.getenv('LINKEDIN_PASSWORD')
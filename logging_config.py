@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Logging setup for AI News Automation
+Queue-based (non-blocking) logging with size-based rotation and optional JSON lines
+"""
+
+import os
+import json
+import uuid
+import queue
+import atexit
+import logging
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_LOG_FILE = 'ai_news_automation.log'
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_QUEUE_SIZE = 10000
+
+_run_id = contextvars.ContextVar('run_id', default='-')
+_stage = contextvars.ContextVar('stage', default='-')
+_listener = None
+
+
+def set_run_id(run_id: Optional[str] = None) -> str:
+    """Tag every following log record with a run ID (a new one when none is given)"""
+    run_id = run_id or uuid.uuid4().hex[:12]
+    _run_id.set(run_id)
+    return run_id
+
+
+def get_run_id() -> str:
+    return _run_id.get()
+
+
+@contextmanager
+def log_stage(name: str):
+    """Tag log records emitted inside the block with the pipeline stage (nested as outer/inner)"""
+    parent = _stage.get()
+    token = _stage.set(name if parent == '-' else f"{parent}/{name}")
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+def inherit_log_context():
+    """Initializer for worker pools so records from worker threads keep the caller's run ID and stage"""
+    run_id, stage = _run_id.get(), _stage.get()
+
+    def initializer():
+        _run_id.set(run_id)
+        _stage.set(stage)
+    return initializer
+
+
+class ContextFilter(logging.Filter):
+    """Copy the run ID and stage onto each record in the emitting thread"""
+
+    def filter(self, record):
+        record.run_id = _run_id.get()
+        record.stage = _stage.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, carrying run ID and stage"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'run_id': getattr(record, 'run_id', '-'),
+            'stage': getattr(record, 'stage', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks the caller: records are dropped when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(log_file: Optional[str] = None, level: Optional[str] = None,
+                      json_format: Optional[bool] = None) -> QueueListener:
+    """Route all logging through a bounded queue to rotating file and console handlers
+
+    Settings fall back to LOG_FILE, LOG_LEVEL, LOG_FORMAT (text|json), LOG_MAX_BYTES and
+    LOG_BACKUP_COUNT. Calling it again replaces the previous configuration.
+    """
+    global _listener
+
+    log_file = log_file or os.getenv('LOG_FILE', DEFAULT_LOG_FILE)
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    if json_format is None:
+        json_format = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=int(os.getenv('LOG_MAX_BYTES', DEFAULT_MAX_BYTES)),
+        backupCount=int(os.getenv('LOG_BACKUP_COUNT', DEFAULT_BACKUP_COUNT)),
+        encoding='utf-8',
+    )
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    shutdown_logging()
+
+    log_queue = queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)))
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -6,238 +6,679 @@ Fetches AI technology news daily and posts to LinkedIn
 
 import os
 import json
-import requests
 import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import logging
+import threading
 import time
+from datetime import datetime
+from typing import Callable, List, Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+import logging
+import io
+import hashlib
+import argparse
+import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
+from logging_config import configure_logging, inherit_log_context, set_run_id
+from profiling import profiling_requested, run_profiled, stage
+from article import Article, parse_published, url_fingerprint
+from article_store import ArticleStore, DEFAULT_MAX_ARTICLES, DEFAULT_RETENTION_DAYS
+from backfill import DEFAULT_BATCH_SIZE as DEFAULT_BACKFILL_BATCH_SIZE, Backfill
+from enrichment import ArticleEnricher
+from media import DEFAULT_MEDIA_DIR, MediaCache
+from generation import DEFAULT_TIME_BUDGET, stream_post
+from channels import DEFAULT_HASHTAGS, DEFAULT_OUTPUT_DIR as DEFAULT_CHANNEL_DIR, DraftCache, PostDraft, parse_channels, parse_draft, render, write_outputs
+from prompt_builder import DEFAULT_INPUT_BUDGET, DEFAULT_TARGET_WORDS, build_post_prompt
+from politeness import HostScheduler, parse_host_intervals
+from polling import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, DEFAULT_TARGET_ITEMS, AdaptivePoller
+from websub import DEFAULT_LEASE_SECONDS as DEFAULT_WEBSUB_LEASE_SECONDS, DEFAULT_PORT as DEFAULT_WEBSUB_PORT, DEFAULT_SECRETS_FILE as DEFAULT_WEBSUB_SECRETS_FILE, WebSubSubscriber, discover_hub
+from pipeline import DEFAULT_QUEUE_SIZE, DEFAULT_SCORE_THRESHOLD, StreamingPipeline, score_article
+from seen_filter import SeenFilter
+from deadline import DEFAULT_RUN_BUDGET, RunDeadline, activate, cap_timeout, time_left, wait_timeout
+from journal import DEFAULT_JOURNAL_PATH, DEFAULT_RESUME_MAX_AGE_HOURS, RunJournal
+from snapshot import SNAPSHOT_ENV_VAR, create_snapshot, restore_snapshot
+from cassette import replaying, start_recording, start_replay
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ai_news_automation.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging (queued, rotating; LOG_FORMAT=json for structured lines)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Narrow queries fanned out concurrently instead of one broad combined query
+DEFAULT_NEWSAPI_QUERIES = [
+    '"artificial intelligence"',
+    '"machine learning"',
+    '"generative AI" OR LLM OR "large language model"',
+    '"AI technology" OR "AI startup"',
+]
+
+# Compact per-feed memory of processed items (12 hex chars per GUID/link)
+MAX_SEEN_ITEMS_PER_FEED = 2000
+# With less of the run deadline left than this, a stage skips its slow step instead of overrunning
+MIN_ENRICH_SECONDS = 3.0
+MIN_GENERATION_SECONDS = 5.0
+MIN_POST_SECONDS = 30.0
+
+def _item_key(value: str) -> str:
+    """Compact fingerprint of an RSS item's GUID or link"""
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=6).hexdigest()
+
+# Keywords are matched against Article.search_text, which is already lowercased
+RSS_AI_KEYWORDS = ('ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network')
+AI_KEYWORDS = (
+    'artificial intelligence', 'ai', 'machine learning', 'ml', 'deep learning',
+    'neural network', 'chatgpt', 'gpt', 'llm', 'large language model',
+    'computer vision', 'natural language processing', 'nlp', 'robotics',
+    'autonomous', 'algorithm', 'data science', 'automation'
+)
+
 class AINewsAutomation:
     def __init__(self):
         self.linkedin_email = os.getenv('LINKEDIN_EMAIL')
         self.linkedin_password = os.getenv('LINKEDIN_PASSWORD')
         self.news_api_key = os.getenv('NEWS_API_KEY', 'demo')  # Free tier key
+        self.news_api_url = os.getenv('NEWS_API_URL', 'https://newsapi.org/v2/everything')
+        self.techcrunch_feed_url = os.getenv('TECHCRUNCH_FEED_URL', 'https://techcrunch.com/feed/')
+        self.venturebeat_feed_url = os.getenv('VENTUREBEAT_FEED_URL', 'https://venturebeat.com/feed/')
+        self.newsapi_queries = [
+            query.strip() for query in os.getenv('NEWS_API_QUERIES', '').split('|') if query.strip()
+        ] or DEFAULT_NEWSAPI_QUERIES
+        self.newsapi_page_size = int(os.getenv('NEWS_API_PAGE_SIZE', '20'))
+        self.newsapi_max_pages = int(os.getenv('NEWS_API_MAX_PAGES', '5'))
         self.posted_articles_file = 'posted_articles.json'
-        self.load_posted_articles()
+        self.fetch_state_file = 'fetch_state.json'
+        self.journal_path = os.getenv('RUN_JOURNAL', DEFAULT_JOURNAL_PATH)
+        self.resume_max_age_hours = float(os.getenv('RESUME_MAX_AGE_HOURS', DEFAULT_RESUME_MAX_AGE_HOURS))
+        self.backlog_max_age_days = float(os.getenv('BACKLOG_MAX_AGE_DAYS', '7'))
+        self.enrich_articles = os.getenv('ENRICH_ARTICLES', '1').lower() not in ('0', 'false', 'no')
+        self.post_image = os.getenv('POST_IMAGE', '0').lower() in ('1', 'true', 'yes')
+        self.pipeline_mode = os.getenv('PIPELINE_MODE', 'stream').lower()
+        self.pipeline_queue_size = int(os.getenv('PIPELINE_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+        self.select_score_threshold = float(os.getenv('SELECT_SCORE_THRESHOLD', DEFAULT_SCORE_THRESHOLD))
+        # One generated draft per article, rendered for every channel in POST_CHANNELS
+        self.draft_cache = DraftCache(os.getenv('POST_DRAFT_CACHE_DIR', os.path.join('cache', 'posts')))
+        self.post_channels = parse_channels(os.getenv('POST_CHANNELS', 'linkedin,x,mastodon,newsletter'))
+        self.channel_output_dir = os.getenv('CHANNEL_OUTPUT_DIR', DEFAULT_CHANNEL_DIR)
+        # Set once the streaming pipeline has its candidate; sources poll it to stop early
+        self.fetch_cancelled = threading.Event()
+        # Held by sources while they update fetch_state and by save_fetch_state while it writes it
+        self.fetch_state_lock = threading.Lock()
+        # Wall-clock budget for a whole run, sliced per stage (RUN_DEADLINE_SECONDS=0 disables it)
+        self.run_budget = float(os.getenv('RUN_DEADLINE_SECONDS', DEFAULT_RUN_BUDGET))
+        self.deadline = RunDeadline(None)
+        self.load_fetch_state()
+        # Every NewsAPI poll costs at least one request per query; by default space polls so a
+        # day of them fits the plan's daily request quota
+        newsapi_min_interval = os.getenv('POLL_MIN_INTERVAL_NEWSAPI') or (
+            86400 * len(self.newsapi_queries) / float(os.getenv('NEWS_API_DAILY_REQUESTS', '100'))
+        )
+        self.poller = AdaptivePoller(
+            self.fetch_state.setdefault('polling', {}),
+            min_interval=float(os.getenv('POLL_MIN_INTERVAL', DEFAULT_MIN_INTERVAL)),
+            max_interval=float(os.getenv('POLL_MAX_INTERVAL', DEFAULT_MAX_INTERVAL)),
+            target_items=float(os.getenv('POLL_TARGET_ITEMS', DEFAULT_TARGET_ITEMS)),
+            jitter=float(os.getenv('POLL_JITTER', '0.1')),
+            source_min_intervals={'NewsAPI': float(newsapi_min_interval)}
+        )
+        # Set by the daemon so sources are only fetched when their adaptive schedule says so
+        self.respect_poll_schedule = False
+        # WebSub push ingestion (daemon only); the callback URL must be reachable by the hubs
+        self.websub_callback_url = os.getenv('WEBSUB_CALLBACK_URL')
+        self.websub_port = int(os.getenv('WEBSUB_PORT', DEFAULT_WEBSUB_PORT))
+        self.websub_lease_seconds = int(os.getenv('WEBSUB_LEASE_SECONDS', DEFAULT_WEBSUB_LEASE_SECONDS))
+        self.websub_hubs = dict(
+            item.strip().split('=', 1) for item in os.getenv('WEBSUB_HUBS', '').split(',') if '=' in item
+        )
+        self.websub = None
+        self.websub_no_hub = set()
+        if replaying():
+            # Recorded responses need no spacing; replay runs at full speed
+            self.scheduler = HostScheduler(min_interval=0, respect_robots=False)
+        else:
+            self.scheduler = HostScheduler(
+                min_interval=float(os.getenv('FETCH_MIN_INTERVAL', '1.0')),
+                max_concurrency=int(os.getenv('FETCH_HOST_CONCURRENCY', '2')),
+                host_intervals=parse_host_intervals(os.getenv('FETCH_HOST_INTERVALS', 'newsapi.org=0.25')),
+                robots_cache=self.fetch_state.setdefault('robots', {}),
+                cache_lock=self.fetch_state_lock,
+                respect_robots=os.getenv('FETCH_RESPECT_ROBOTS', '1').lower() not in ('0', 'false', 'no')
+            )
+        self.open_article_store()
+        self.open_seen_filter()
         
-    def load_posted_articles(self):
-        """Load previously posted articles to avoid duplicates"""
+    def load_posted_articles(self) -> List[Dict]:
+        """Read the posted-article history (only to record a post or seed an empty seen filter)"""
         try:
             if os.path.exists(self.posted_articles_file):
                 with open(self.posted_articles_file, 'r') as f:
-                    self.posted_articles = json.load(f)
-            else:
-                self.posted_articles = []
+                    return json.load(f)
         except Exception as e:
             logger.error(f"Error loading posted articles: {e}")
-            self.posted_articles = []
+        return []
     
-    def save_posted_articles(self):
+    def save_posted_articles(self, posted_articles: List[Dict]):
         """Save posted articles to avoid duplicates"""
         try:
             with open(self.posted_articles_file, 'w') as f:
-                json.dump(self.posted_articles, f, indent=2)
+                json.dump(posted_articles, f, indent=2)
         except Exception as e:
             logger.error(f"Error saving posted articles: {e}")
     
-    def fetch_ai_news(self) -> List[Dict]:
-        """Fetch AI technology news from multiple sources"""
-        news_sources = [
-            self._fetch_from_newsapi,
-            self._fetch_from_techcrunch,
-            self._fetch_from_venturebeat
-        ]
+    def record_posted(self, article: Article):
+        """Append the article to the posted history and mark it posted in the seen filter and the warehouse"""
+        posted_articles = self.load_posted_articles()
+        posted_articles.append({
+            'url': article.url,
+            'title': article.title,
+            'posted_at': datetime.now().isoformat()
+        })
+        self.save_posted_articles(posted_articles)
+        if self.seen_filter is not None:
+            try:
+                self.seen_filter.add(article.fingerprint)
+            except Exception as e:
+                logger.error(f"Error adding a posted article to the seen filter: {e}")
+        if self.article_store:
+            self.article_store.mark_posted(article.url)
+    
+    def open_article_store(self):
+        """Open the local article warehouse (fetched articles survive between runs)"""
+        try:
+            self.article_store = ArticleStore(os.getenv('ARTICLE_DB_PATH', 'articles.db'))
+        except Exception as e:
+            logger.error(f"Error opening article store: {e}")
+            self.article_store = None
+    
+    def open_seen_filter(self):
+        """Open the Bloom filter of fingerprints posted in earlier runs (memory-mapped, nothing loaded)"""
+        try:
+            self.seen_filter = SeenFilter(
+                os.getenv('SEEN_FILTER_DIR', os.path.join('cache', 'seen_filter')),
+                retention_days=float(os.getenv('ARTICLE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+            )
+            if not self.seen_filter.live:
+                self._seed_seen_filter()
+        except Exception as e:
+            logger.error(f"Error opening seen filter: {e}")
+            self.seen_filter = None
+    
+    def _seed_seen_filter(self):
+        """Fill an empty filter (first run, or a lost cache) from posted_articles.json"""
+        fingerprints, timestamps = [], []
+        for posted in self.load_posted_articles():
+            if not posted.get('url'):
+                continue
+            try:
+                posted_at = datetime.fromisoformat(posted['posted_at']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                posted_at = time.time()
+            fingerprints.append(url_fingerprint(posted['url']))
+            timestamps.append(posted_at)
+        if fingerprints:
+            seeded = self.seen_filter.add_many(fingerprints, timestamps)
+            logger.info(f"Seen filter: seeded with {seeded} posted articles")
+    
+    def posted_before(self, fingerprints: List[str]) -> Set[str]:
+        """The fingerprints posted in earlier runs; a filter miss means never posted, with no database lookup"""
+        if self.seen_filter is None:
+            return self.article_store.posted(fingerprints) if self.article_store else set()
+        hits = {fingerprint for fingerprint in fingerprints if fingerprint in self.seen_filter}
+        if not hits or not self.article_store:
+            return hits
+        # A hit the warehouse holds unposted is a false positive; one it does not hold at all
+        # was posted before it was stored (or the database was lost), so it counts as posted
+        return hits - self.article_store.unposted(hits)
+    
+    def _drop_seen(self, articles: List[Article]) -> List[Article]:
+        """Articles not posted in an earlier run
         
-        all_news = []
+        Only posted articles go into the filter, so most articles miss it and are kept
+        without a warehouse lookup. Hits are confirmed in the warehouse, which keeps
+        the filter's rare false positives as candidates.
+        """
+        try:
+            posted = self.posted_before([article.fingerprint for article in articles])
+        except Exception as e:
+            logger.error(f"Error checking posted articles: {e}")
+            return articles
         
-        for source_func in news_sources:
+        fresh = [article for article in articles if article.fingerprint not in posted]
+        logger.info(f"Seen filter: {len(fresh)} candidates, {len(posted)} posted in earlier runs")
+        return fresh
+    
+    def store_articles(self, articles: List[Article]):
+        """Persist fetched articles to the warehouse"""
+        if not self.article_store:
+            return
+        try:
+            inserted = self.article_store.add_articles(articles)
+            logger.info(f"Article store: {inserted} new")
+        except Exception as e:
+            logger.error(f"Error storing articles: {e}")
+    
+    def prune_articles(self):
+        """Apply the warehouse retention policies; once per run, after fetching"""
+        if not self.article_store:
+            return
+        try:
+            pruned = self.article_store.prune(
+                float(os.getenv('ARTICLE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)),
+                int(os.getenv('ARTICLE_STORE_MAX_ROWS', DEFAULT_MAX_ARTICLES))
+            )
+            logger.info(f"Article store: {pruned} pruned")
+        except Exception as e:
+            logger.error(f"Error pruning the article store: {e}")
+    
+    def load_backlog(self) -> List[Article]:
+        """Recent AI articles from the warehouse that were fetched but never posted"""
+        if not self.article_store:
+            return []
+        try:
+            backlog = self.article_store.backlog(limit=50, max_age_days=self.backlog_max_age_days)
+            return self._filter_ai_news(backlog)
+        except Exception as e:
+            logger.error(f"Error loading article backlog: {e}")
+            return []
+    
+    def backfill(self, paths: List[str], workers: Optional[int] = None) -> Dict:
+        """Seed the warehouse and poll history from archived feed dumps"""
+        try:
+            summary = Backfill(
+                self.article_store, self.poller,
+                poll_sources=[name for name, _ in self.news_sources()],
+                keywords=None if os.getenv('BACKFILL_ALL_TOPICS', '0').lower() in ('1', 'true', 'yes') else AI_KEYWORDS,
+                workers=workers or int(os.getenv('BACKFILL_WORKERS', '0')) or None,
+                batch_size=int(os.getenv('BACKFILL_BATCH_SIZE', DEFAULT_BACKFILL_BATCH_SIZE)),
+                retention_days=float(os.getenv('ARTICLE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+            ).run(paths)
+        except Exception as e:
+            logger.error(f"Error during backfill: {e}")
+            return {}
+        self.save_fetch_state()
+        return summary
+    
+    def load_fetch_state(self):
+        """Load incremental fetch watermarks from previous runs"""
+        try:
+            if os.path.exists(self.fetch_state_file):
+                with open(self.fetch_state_file, 'r') as f:
+                    self.fetch_state = json.load(f)
+            else:
+                self.fetch_state = {}
+        except Exception as e:
+            logger.error(f"Error loading fetch state: {e}")
+            self.fetch_state = {}
+    
+    def save_fetch_state(self):
+        """Save incremental fetch watermarks for the next run"""
+        try:
+            with self.fetch_state_lock:
+                if self.websub:
+                    self.fetch_state['websub'] = self.websub.export()
+                with open(self.fetch_state_file, 'w') as f:
+                    json.dump(self.fetch_state, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving fetch state: {e}")
+    
+    def news_sources(self) -> List[Tuple[str, Callable[[], List[Article]]]]:
+        """(name, fetch function) for every configured news source (only those due, in the daemon)"""
+        sources = [
+            ('NewsAPI', self._fetch_from_newsapi),
+            ('TechCrunch', self._fetch_from_techcrunch),
+            ('VentureBeat', self._fetch_from_venturebeat),
+        ]
+        if self.respect_poll_schedule:
+            sources = [(name, source_func) for name, source_func in sources if self.poller.due(name)]
+        return sources
+    
+    def fetch_ai_news(self) -> List[Article]:
+        """Fetch AI technology news from multiple sources"""
+        news_sources = self.news_sources()
+        
+        def run_source(source) -> List[Article]:
+            name, source_func = source
             try:
-                news = source_func()
-                if news:
-                    all_news.extend(news)
-                time.sleep(1)  # Be respectful to APIs
+                with stage(name):
+                    return source_func() or []
             except Exception as e:
-                logger.error(f"Error fetching from {source_func.__name__}: {e}")
+                logger.error(f"Error fetching from {name}: {e}")
+                return []
+        
+        # Sources run in parallel; the scheduler spaces out requests that share a host
+        self.fetch_cancelled.clear()
+        executor = ThreadPoolExecutor(max_workers=max(1, len(news_sources)), initializer=inherit_log_context())
+        futures = {executor.submit(run_source, source): source[0] for source in news_sources}
+        done, late = wait(futures, timeout=wait_timeout())
+        if late:
+            # Late sources see the cancel flag and leave their state alone, so their items are fetched again next run
+            self.fetch_cancelled.set()
+            self.deadline.degrade('fetch', f"budget spent; skipping {', '.join(sorted(futures[f] for f in late))}")
+        executor.shutdown(wait=False, cancel_futures=True)
+        all_news = [article for future in futures if future in done for article in future.result()]
+        
+        self.save_fetch_state()
         
         # Remove duplicates and filter for AI-related content
-        unique_news = self._deduplicate_news(all_news)
-        ai_filtered_news = self._filter_ai_news(unique_news)
+        with stage('normalize'):
+            all_news = self._normalize_news(all_news)
+        with stage('dedup'):
+            unique_news = self._deduplicate_news(all_news)
+        with stage('seen'):
+            fresh_news = self._drop_seen(unique_news)
+        with stage('store'):
+            self.store_articles(unique_news)
+        with stage('filter'):
+            ai_filtered_news = self._filter_ai_news(fresh_news)
         
         logger.info(f"Fetched {len(ai_filtered_news)} AI-related news articles")
         return ai_filtered_news
     
-    def _fetch_from_newsapi(self) -> List[Dict]:
-        """Fetch news from NewsAPI (free tier)"""
+    def stream_ai_news(self) -> List[Article]:
+        """Fetch through the streaming pipeline, best-scoring candidates first
+        
+        Stops as soon as an unposted candidate reaches select_score_threshold; only the
+        candidates that cleared it are returned then, otherwise every candidate is.
+        """
+        dedup_seen = set()
+        
+        def dedup(batch: List[Article]) -> List[Article]:
+            unique = []
+            for article in self._deduplicate_news(batch):
+                if article.fingerprint not in dedup_seen:
+                    dedup_seen.add(article.fingerprint)
+                    unique.append(article)
+            return unique
+        
+        def drop_seen(batch: List[Article]) -> List[Article]:
+            fresh = self._drop_seen(batch)
+            self.store_articles(batch)
+            return fresh
+        
+        self.fetch_cancelled.clear()
+        pipeline = StreamingPipeline(
+            self.news_sources(),
+            [('normalize', self._normalize_news), ('dedup', dedup), ('seen', drop_seen), ('filter', self._filter_ai_news)],
+            queue_size=self.pipeline_queue_size,
+            cancelled=self.fetch_cancelled
+        )
+        
+        now = time.time()
+        scored: List[Tuple[float, Article]] = []
+        for source, batch in pipeline.batches(timeout=wait_timeout()):
+            scored.extend((score_article(article, AI_KEYWORDS, now), article) for article in batch)
+            best_score, best = max(scored, key=lambda pair: pair[0], default=(0.0, None))
+            if best_score >= self.select_score_threshold:
+                logger.info(f"'{best.title}' from {source} scored {best_score:.1f} "
+                            f"(threshold {self.select_score_threshold:.1f}); selecting now")
+                pipeline.cancel()
+                break
+        if pipeline.timed_out:
+            self.deadline.degrade('fetch', f"budget spent; skipping {', '.join(pipeline.pending) or 'queued batches'}")
+            pipeline.cancel()
+        
+        # Sources still running see the cancel flag under fetch_state_lock and leave their state alone
+        self.save_fetch_state()
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        qualified = [article for score, article in scored if score >= self.select_score_threshold]
+        logger.info(f"Streamed {len(scored)} AI-related candidates, {len(qualified)} above the threshold "
+                    f"(sources done: {pipeline.arrivals})")
+        return qualified or [article for _, article in scored]
+    
+    def _fetch_from_newsapi(self) -> List[Article]:
+        """Fetch news from NewsAPI (free tier), only articles newer than each query's watermark"""
         try:
-            url = "https://newsapi.org/v2/everything"
-            params = {
-                'q': 'artificial intelligence OR machine learning OR AI technology',
-                'language': 'en',
-                'sortBy': 'publishedAt',
-                'pageSize': 20,
-                'apiKey': self.news_api_key
-            }
+            watermarks = self.fetch_state.setdefault('newsapi', {})
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            # Narrow queries run concurrently; each keeps its own publishedAt watermark
+            with ThreadPoolExecutor(max_workers=len(self.newsapi_queries),
+                                    initializer=inherit_log_context()) as executor:
+                results = list(executor.map(
+                    lambda query: self._fetch_newsapi_query(query, watermarks.get(query)),
+                    self.newsapi_queries
+                ))
             
-            data = response.json()
             articles = []
+            seen = set()
+            for query_articles, _, _ in results:
+                for article in query_articles:
+                    if article.fingerprint not in seen:
+                        seen.add(article.fingerprint)
+                        articles.append(article)
+            articles.sort(key=lambda article: article.published_ts or 0, reverse=True)
             
-            for article in data.get('articles', []):
-                articles.append({
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'source': article.get('source', {}).get('name', ''),
-                    'published_at': article.get('publishedAt', ''),
-                    'content': article.get('content', '')
-                })
-            
+            with self.fetch_state_lock:
+                if self.fetch_cancelled.is_set():
+                    # Keep the old watermarks so these articles are offered again next run
+                    logger.info("NewsAPI arrived after selection; skipping")
+                    return []
+                for query, (_, newest, _) in zip(self.newsapi_queries, results):
+                    if newest:
+                        watermarks[query] = newest
+                if all(failed for _, _, failed in results):
+                    # No query got an answer: back off instead of counting it as a quiet poll
+                    self.poller.failed('NewsAPI')
+                    logger.warning("Every NewsAPI query failed; backing off")
+                    return articles
+                self.poller.observe('NewsAPI', [article.published_ts for article in articles])
+            logger.info(f"NewsAPI returned {len(articles)} new articles across {len(self.newsapi_queries)} queries")
             return articles
             
         except Exception as e:
             logger.error(f"Error fetching from NewsAPI: {e}")
             return []
     
-    def _fetch_from_techcrunch(self) -> List[Dict]:
-        """Fetch AI news from TechCrunch RSS feed"""
+    def _fetch_newsapi_query(self, query: str, watermark: Optional[str]) -> Tuple[List[Article], Optional[str], bool]:
+        """Page through one NewsAPI query until the watermark is reached; also returns whether a request failed"""
+        articles = []
+        newest = watermark
+        
         try:
-            url = "https://techcrunch.com/feed/"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # Simple XML parsing for RSS feed
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-            
-            articles = []
-            ai_keywords = ['ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network']
-            
-            for item in root.findall('.//item'):
-                title = item.find('title').text if item.find('title') is not None else ''
-                description = item.find('description').text if item.find('description') is not None else ''
-                link = item.find('link').text if item.find('link') is not None else ''
-                pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ''
+            for page in range(1, self.newsapi_max_pages + 1):
+                # Selection already has its article; keep the old watermark so nothing is skipped
+                if self.fetch_cancelled.is_set():
+                    return articles, watermark, False
+                params = {
+                    'q': query,
+                    'language': 'en',
+                    'sortBy': 'publishedAt',
+                    'pageSize': self.newsapi_page_size,
+                    'page': page,
+                    'apiKey': self.news_api_key
+                }
+                if watermark:
+                    params['from'] = watermark
                 
-                # Check if article is AI-related
-                if any(keyword in title.lower() or keyword in description.lower() for keyword in ai_keywords):
-                    articles.append({
-                        'title': title,
-                        'description': description,
-                        'url': link,
-                        'source': 'TechCrunch',
-                        'published_at': pub_date,
-                        'content': description
-                    })
-            
-            return articles[:10]  # Limit to 10 articles
-            
+                response = self.scheduler.get(self.news_api_url, params=params, timeout=cap_timeout(10))
+                response.raise_for_status()
+                data = response.json()
+                page_articles = data.get('articles', [])
+                
+                reached_watermark = False
+                for article in page_articles:
+                    published_at = article.get('publishedAt') or ''
+                    # 'from' is inclusive, so anything at or before the watermark was seen last run
+                    if watermark and published_at <= watermark:
+                        reached_watermark = True
+                        break
+                    if not newest or published_at > newest:
+                        newest = published_at
+                    articles.append(Article(
+                        article.get('title'),
+                        article.get('description'),
+                        article.get('url'),
+                        (article.get('source') or {}).get('name'),
+                        published_at,
+                        article.get('content')
+                    ))
+                
+                # Without a watermark (first run) only the newest page is wanted
+                if reached_watermark or not watermark:
+                    break
+                if len(page_articles) < self.newsapi_page_size:
+                    break
+                if page * self.newsapi_page_size >= data.get('totalResults', 0):
+                    break
+            else:
+                # Page budget spent before the watermark: keep it, so the pages not read are fetched next run
+                logger.warning(f"NewsAPI query '{query}' has more than {self.newsapi_max_pages} pages of new "
+                               f"articles; keeping its watermark")
+                return articles, watermark, False
+        
         except Exception as e:
-            logger.error(f"Error fetching from TechCrunch: {e}")
-            return []
+            # Keep the old watermark so anything missed on a later page is picked up next run
+            logger.error(f"Error fetching NewsAPI query '{query}': {e}")
+            return articles, watermark, True
+        
+        return articles, newest, False
+    
+    def _fetch_from_techcrunch(self) -> List[Article]:
+        """Fetch AI news from TechCrunch RSS feed"""
+        return self._fetch_rss_feed('TechCrunch', self.techcrunch_feed_url)
     
-    def _fetch_from_venturebeat(self) -> List[Dict]:
+    def _fetch_from_venturebeat(self) -> List[Article]:
         """Fetch AI news from VentureBeat RSS feed"""
+        return self._fetch_rss_feed('VentureBeat', self.venturebeat_feed_url)
+    
+    def _fetch_rss_feed(self, source: str, url: str, limit: int = 10) -> List[Article]:
+        """Fetch AI news from an RSS feed, skipping items processed on earlier runs"""
         try:
-            url = "https://venturebeat.com/feed/"
+            feed_state = self.fetch_state.setdefault('rss', {}).setdefault(source, {})
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
+            if feed_state.get('etag'):
+                headers['If-None-Match'] = feed_state['etag']
+            if feed_state.get('last_modified'):
+                headers['If-Modified-Since'] = feed_state['last_modified']
             
-            articles = []
-            ai_keywords = ['ai', 'artificial intelligence', 'machine learning', 'deep learning', 'neural network']
-            
-            for item in root.findall('.//item'):
-                title = item.find('title').text if item.find('title') is not None else ''
-                description = item.find('description').text if item.find('description') is not None else ''
-                link = item.find('link').text if item.find('link') is not None else ''
-                pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ''
-                
-                # Check if article is AI-related
-                if any(keyword in title.lower() or keyword in description.lower() for keyword in ai_keywords):
-                    articles.append({
-                        'title': title,
-                        'description': description,
-                        'url': link,
-                        'source': 'VentureBeat',
-                        'published_at': pub_date,
-                        'content': description
-                    })
+            response = self.scheduler.get(url, headers=headers, timeout=cap_timeout(10))
+            if response.status_code == 304:
+                logger.info(f"{source} feed unchanged since last run")
+                with self.fetch_state_lock:
+                    self.poller.observe(source, [])
+                return []
+            response.raise_for_status()
             
-            return articles[:10]  # Limit to 10 articles
+            with self.fetch_state_lock:
+                if self.fetch_cancelled.is_set():
+                    # Leave this feed's state alone so its items are offered again next run
+                    logger.info(f"{source} arrived after selection; skipping")
+                    return []
+                if response.headers.get('ETag'):
+                    feed_state['etag'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    feed_state['last_modified'] = response.headers['Last-Modified']
+                articles, new_published = self._parse_rss_items(source, response.content, limit)
+                # Every new item counts towards the publish rate, AI-related or not
+                self.poller.observe(source, new_published)
+            return articles
             
         except Exception as e:
-            logger.error(f"Error fetching from VentureBeat: {e}")
+            logger.error(f"Error fetching from {source}: {e}")
             return []
     
-    def _deduplicate_news(self, news_list: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles based on URL"""
-        seen_urls = set()
+    def _parse_rss_items(self, source: str, content: bytes, limit: int = 10) -> Tuple[List[Article], List[Optional[float]]]:
+        """AI-related articles among a feed's new items, plus every new item's publish time; updates the feed's seen state"""
+        feed_state = self.fetch_state.setdefault('rss', {}).setdefault(source, {})
+        seen_keys = feed_state.get('seen', [])
+        seen = set(seen_keys)
+        last_published = feed_state.get('last_published_ts')
+        newest_published = last_published
+        new_keys = []
+        new_published = []
+        skipped = 0
+        capped = False
+        
+        articles = []
+        
+        # Stream the feed so parsing stops as soon as we reach items from earlier runs
+        for _, item in ET.iterparse(io.BytesIO(content)):
+            if item.tag != 'item':
+                continue
+        
+            key = _item_key(item.findtext('guid') or item.findtext('link') or item.findtext('title') or '')
+            if key in seen:
+                skipped += 1
+                item.clear()
+                continue
+        
+            pub_date = item.findtext('pubDate') or ''
+            published = parse_published(pub_date)
+            if published is not None and last_published is not None and published < last_published:
+                # Feeds are newest first, so everything below this item was processed before
+                break
+        
+            new_keys.append(key)
+            new_published.append(published)
+            if published is not None and (newest_published is None or published > newest_published):
+                newest_published = published
+        
+            description = item.findtext('description')
+            article = Article(
+                item.findtext('title'), description, item.findtext('link'), source,
+                pub_date, description, published_ts=published
+            )
+            item.clear()
+        
+            # Check if article is AI-related
+            if any(keyword in article.search_text for keyword in RSS_AI_KEYWORDS):
+                articles.append(article)
+                if len(articles) >= limit:
+                    capped = True
+                    break
+        
+        # Oldest keys are dropped first; new_keys arrive newest first
+        feed_state['seen'] = (seen_keys + new_keys[::-1])[-MAX_SEEN_ITEMS_PER_FEED:]
+        # Items below the cap were not visited and are older than the ones that were, so the
+        # watermark stays put until a run reads down to it; the seen keys skip the visited ones
+        if newest_published is not None and not capped:
+            feed_state['last_published_ts'] = newest_published
+        
+        logger.info(f"{source}: {len(new_keys)} new items, {skipped} already seen")
+        return articles, new_published
+    
+    def _normalize_news(self, news_list: List[Article]) -> List[Article]:
+        """Drop entries with no title or URL, and NewsAPI's placeholders for withdrawn articles"""
+        return [
+            article for article in news_list
+            if article.url and article.title and article.title != '[Removed]'
+        ]
+    
+    def _deduplicate_news(self, news_list: List[Article]) -> List[Article]:
+        """Remove duplicate articles based on URL fingerprint"""
+        seen = set()
         unique_news = []
         
         for article in news_list:
-            if article.get('url') and article['url'] not in seen_urls:
-                seen_urls.add(article['url'])
+            if article.url and article.fingerprint not in seen:
+                seen.add(article.fingerprint)
                 unique_news.append(article)
         
         return unique_news
     
-    def _filter_ai_news(self, news_list: List[Dict]) -> List[Dict]:
+    def _filter_ai_news(self, news_list: List[Article]) -> List[Article]:
         """Filter news to ensure they are AI-related"""
-        ai_keywords = [
-            'artificial intelligence', 'ai', 'machine learning', 'ml', 'deep learning',
-            'neural network', 'chatgpt', 'gpt', 'llm', 'large language model',
-            'computer vision', 'natural language processing', 'nlp', 'robotics',
-            'autonomous', 'algorithm', 'data science', 'automation'
-        ]
-        
         filtered_news = []
         
         for article in news_list:
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            content = article.get('content', '').lower()
-            
             # Check if any AI keyword is present
-            if any(keyword in title or keyword in description or keyword in content for keyword in ai_keywords):
+            text = article.search_text
+            if any(keyword in text for keyword in AI_KEYWORDS):
                 filtered_news.append(article)
         
         return filtered_news
     
-    def select_best_article(self, news_list: List[Dict]) -> Optional[Dict]:
+    def select_best_article(self, news_list: List[Article]) -> Optional[Article]:
         """Select the best article to post (not previously posted)"""
         if not news_list:
             return None
         
         # Filter out previously posted articles
+        posted = self.posted_before([article.fingerprint for article in news_list])
         available_articles = [
-            article for article in news_list 
-            if article.get('url') not in [posted.get('url') for posted in self.posted_articles]
+            article for article in news_list
+            if article.fingerprint not in posted
         ]
         
         if not available_articles:
@@ -246,44 +687,41 @@ class AINewsAutomation:
         
         # Select a random article from the top 5 (to add variety)
         top_articles = available_articles[:5]
+        
+        # Fetch the full text of the top candidates in parallel and prefer ones that have it
+        if self.enrich_articles and time_left() < MIN_ENRICH_SECONDS:
+            self.deadline.degrade('select', "budget spent; selecting without full-text enrichment")
+        elif self.enrich_articles:
+            try:
+                ArticleEnricher(
+                    max_bytes=int(os.getenv('ENRICH_MAX_BYTES', str(2 * 1024 * 1024))),
+                    timeout=cap_timeout(float(os.getenv('ENRICH_TIMEOUT', '10'))),
+                    scheduler=self.scheduler
+                ).enrich(top_articles)
+                top_articles = [article for article in top_articles if article.full_text] or top_articles
+            except Exception as e:
+                logger.warning(f"Article enrichment failed: {e}")
+        
         selected_article = random.choice(top_articles)
         
         return selected_article
     
-    def create_linkedin_post(self, article: Dict) -> str:
+    def create_linkedin_post(self, article: Article) -> str:
         """Create an engaging LinkedIn post from the article using AI generation"""
-        title = article.get('title', '')
-        description = article.get('description', '')
-        url = article.get('url', '')
-        source = article.get('source', '')
-        
-        # Clean up description (remove HTML tags if present)
-        import re
-        clean_description = re.sub(r'<[^>]+>', '', description)
+        return render(self.create_post_draft(article), 'linkedin')
+    
+    def create_post_draft(self, article: Article) -> PostDraft:
+        """Generate the channel-neutral draft of the post once; every channel is rendered from it"""
+        cached = self.draft_cache.get(article)
+        if cached:
+            logger.info("Using the cached post draft for this article")
+            return cached
+        
+        # Description is already HTML-free (cleaned once at ingest); used by the template fallback
+        clean_description = article.description
         clean_description = clean_description[:300] + '...' if len(clean_description) > 300 else clean_description
         
-        # Create AI prompt for dynamic post generation
-        ai_prompt = f"""Create a unique, engaging LinkedIn post about this AI technology news. 
-
-News Title: {title}
-News Description: {clean_description}
-Source: {source}
-
-Requirements:
-- Write in first person as a business professional who helps companies implement AI solutions
-- Use a conversational, storytelling tone
-- Focus on business value and practical applications
-- Include 2-3 paragraphs of thoughtful commentary
-- End with an engaging question for the audience
-- Include the URL and relevant hashtags
-- Make it sound natural and personal, not automated
-- Vary the writing style and approach each time
-- Keep it professional but conversational
-- Focus on how AI can help businesses solve real problems
-
-The post should be unique and different from typical AI news posts. Make it sound like a real person sharing insights about AI technology and its business impact."""
-
-                # Use Cohere AI (free tier) for post generation (works with GitHub Actions)
+        # Use Cohere AI (free tier) for post generation (works with GitHub Actions)
         try:
             import cohere
             
@@ -292,57 +730,49 @@ The post should be unique and different from typical AI news posts. Make it soun
             if not cohere_api_key:
                 logger.warning("Cohere API key not found, using fallback template system")
                 raise Exception("No Cohere API key")
+            if time_left() < MIN_GENERATION_SECONDS:
+                self.deadline.degrade('generate', "budget spent; using the template instead of Cohere")
+                raise Exception("no time left for generation")
             
-            # Configure Cohere client
-            co = cohere.Client(cohere_api_key)
+            # Configure Cohere client; its timeout covers the non-streaming call
+            co = cohere.Client(cohere_api_key, timeout=int(cap_timeout(120)))
             
-            # Create AI prompt for dynamic post generation
-            ai_prompt = f"""Create a unique, engaging LinkedIn post about this AI technology news. 
-
-News Title: {title}
-News Description: {clean_description}
-Source: {source}
-
-Requirements:
-- Write in first person as a business professional who helps companies implement AI solutions
-- Use a conversational, storytelling tone
-- Focus on business value and practical applications
-- Include 2-3 paragraphs of thoughtful commentary
-- End with an engaging question for the audience
-- Include the URL and relevant hashtags
-- Make it sound natural and personal, not automated
-- Vary the writing style and approach
-- Keep it professional but conversational
-- Focus on how AI can help businesses solve real problems
-- Maximum 300 words total
-
-The post should be unique and different from typical AI news posts. Make it sound like a real person sharing insights about AI technology and its business impact.
-
-Format the response as a complete LinkedIn post ready to publish."""
-
-            # Generate post using Cohere AI
-            response = co.generate(
-                model='command',
-                prompt=ai_prompt,
-                max_tokens=500,
-                temperature=0.8,
-                k=0,
-                stop_sequences=[],
-                return_likelihoods='NONE'
+            # Instructions and article context under an explicit input-token budget
+            ai_prompt, prompt_stats = build_post_prompt(
+                article,
+                input_budget=int(os.getenv('PROMPT_TOKEN_BUDGET', str(DEFAULT_INPUT_BUDGET))),
+                target_words=int(os.getenv('POST_TARGET_WORDS', str(DEFAULT_TARGET_WORDS)))
             )
+            logger.info(f"Prompt ~{prompt_stats['input_tokens']}/{prompt_stats['input_budget']} tokens, "
+                        f"max_tokens {prompt_stats['max_tokens']}"
+                        f"{', excerpt trimmed' if prompt_stats['excerpt_trimmed'] else ''}")
+
+            generate_kwargs = dict(model='command', temperature=0.8, k=0, stop_sequences=[], return_likelihoods='NONE')
+            if os.getenv('GENERATION_STREAM', '1').lower() not in ('0', 'false', 'no'):
+                # Stream tokens and stop as soon as the post is complete (or the time budget runs out)
+                post_content, stream_info = stream_post(
+                    co, ai_prompt, prompt_stats['max_tokens'],
+                    target_words=int(os.getenv('POST_TARGET_WORDS', str(DEFAULT_TARGET_WORDS))),
+                    time_budget=cap_timeout(float(os.getenv('GENERATION_TIME_BUDGET', str(DEFAULT_TIME_BUDGET)))),
+                    **generate_kwargs
+                )
+                logger.info(f"Streamed {stream_info['words']} words in {stream_info['seconds']}s "
+                            f"(stopped: {stream_info['reason']}, first token {stream_info['first_token_s']}s)")
+                if not post_content:
+                    raise Exception("no text generated within the time budget")
+            else:
+                # Generate post using Cohere AI
+                response = co.generate(prompt=ai_prompt, max_tokens=prompt_stats['max_tokens'], **generate_kwargs)
+                
+                # Extract the generated post
+                post_content = response.generations[0].text.strip()
             
-            # Extract the generated post
-            post_content = response.generations[0].text.strip()
-            
-            # Ensure the post includes the URL and hashtags
-            if url not in post_content:
-                post_content += f"\n\nRead more: {url}"
-            
-            if "#AI" not in post_content:
-                post_content += "\n\n#AI #ArtificialIntelligence #Technology #Innovation #MachineLearning #BusinessGrowth"
+            # Sections become the draft; the link and default hashtags are filled in if missing
+            draft = parse_draft(post_content, article)
+            self.draft_cache.put(article, draft)
             
             logger.info("Successfully generated post using Cohere AI")
-            return post_content
+            return draft
             
         except Exception as e:
             logger.warning(f"Cohere AI generation failed: {e}, using fallback template system")
@@ -402,24 +832,13 @@ Format the response as a complete LinkedIn post ready to publish."""
             value = random.choice(business_value)
             question = random.choice(questions)
             
-            # Create the post
-            post_content = f"""{intro}
-
-{clean_description}
-
-{insight}
-
-{value}
-
-{question}
-
-Read more: {url}
-
-#AI #ArtificialIntelligence #Technology #Innovation #MachineLearning #BusinessGrowth"""
+            # Create the post; template drafts are not cached so the next attempt tries Cohere again
+            draft = PostDraft(intro, clean_description, f"{insight}\n\n{value}", question, DEFAULT_HASHTAGS,
+                              article.url, article.title, article.source)
         
-        return post_content
+        return draft
     
-    def post_to_linkedin(self, post_content: str) -> bool:
+    def post_to_linkedin(self, post_content: str, image_path: Optional[str] = None) -> bool:
         """Post content to LinkedIn using Selenium (free alternative)"""
         try:
             if not self.linkedin_email or not self.linkedin_password:
@@ -429,7 +848,7 @@ Read more: {url}
             # Try to use Selenium for automated posting
             try:
                 from linkedin_api_poster import post_to_linkedin
-                success = post_to_linkedin(self.linkedin_email, self.linkedin_password, post_content)
+                success = post_to_linkedin(self.linkedin_email, self.linkedin_password, post_content, image_path)
                 if success:
                     logger.info("Successfully posted to LinkedIn using Selenium")
                     return True
@@ -448,53 +867,344 @@ Read more: {url}
             logger.error(f"Error posting to LinkedIn: {e}")
             return False
     
-    def run_automation(self):
-        """Main automation function"""
-        logger.info("Starting AI News Automation...")
+    def prepare_image(self, article: Article) -> Optional[str]:
+        """Cached, LinkedIn-sized copy of the article's og:image"""
+        with stage('image'):
+            return MediaCache(os.getenv('MEDIA_CACHE_DIR', DEFAULT_MEDIA_DIR), self.scheduler,
+                              timeout=cap_timeout(10)).image_for(article)
+    
+    def _gather_candidates(self, journal: RunJournal) -> List[Article]:
+        """Fetched candidates plus any backlog top-up, from the journal when resuming"""
+        fetched = journal.get('fetched')
+        if fetched is not None:
+            logger.info(f"Resuming with {len(fetched['articles'])} journaled candidates")
+            return [Article.from_dict(data) for data in fetched['articles']]
+        
+        with stage('fetch'), self.deadline.stage('fetch'):
+            if self.pipeline_mode == 'batch':
+                news_list = self.fetch_ai_news()
+            else:
+                news_list = self.stream_ai_news()
+        with stage('prune'):
+            self.prune_articles()
+        
+        # Top up from the warehouse when feeds are quiet, unreachable or out of time (not when the stream stopped early)
+        if len(news_list) < 5 and (not self.fetch_cancelled.is_set() or 'fetch' in self.deadline.degraded):
+            with stage('backlog'):
+                backlog = self.load_backlog()
+            if backlog:
+                logger.info(f"Adding {len(backlog)} backlog articles to {len(news_list)} fresh ones")
+                news_list = self._deduplicate_news(news_list + backlog)
+        
+        journal.record('fetched', {'articles': [article.to_dict() for article in news_list]})
+        return news_list
+    
+    def _publish(self, journal: RunJournal, post_content: str, image_path: Optional[str]) -> bool:
+        """Post once; an attempt interrupted before its outcome was journaled is never repeated"""
+        posted = journal.get('posted')
+        if posted is not None:
+            return posted['success']
+        
+        if journal.get('post_started') is not None:
+            # The interrupted attempt may have gone through; a duplicate post is worse than a manual one
+            logger.warning("Previous posting attempt ended without an outcome; "
+                           "saving the post to linkedin_post.txt instead of posting again")
+            with open('linkedin_post.txt', 'w') as f:
+                f.write(post_content)
+            success = True
+        else:
+            journal.record('post_started')
+            with stage('post'), self.deadline.stage('post'):
+                success = self.post_to_linkedin(post_content, image_path)
+        
+        journal.record('posted', {'success': success})
+        return success
+    
+    def run_automation(self, resume: bool = False):
+        """Main automation function; with resume, continue an interrupted run from its journal"""
+        self.deadline = RunDeadline(self.run_budget)
+        with activate(self.deadline):
+            self._run(resume)
+        if self.deadline.bounded:
+            summary = self.deadline.summary()
+            logger.info(f"Run took {summary['elapsed_s']:.0f}s of its {summary['budget_s']:.0f}s deadline "
+                        f"(stages: {summary['spent_s']}{', degraded: ' + str(summary['degraded']) if summary['degraded'] else ''})")
+    
+    def _run(self, resume: bool):
+        journal = RunJournal(self.journal_path)
+        # A post queued by an earlier run that ran out of time is always picked up
+        if (resume or journal.last_stage == 'queued') and journal.resumable(self.resume_max_age_hours):
+            run_id = set_run_id(journal.run_id)
+            logger.info(f"Resuming AI News Automation run {run_id} after its '{journal.last_stage}' stage...")
+        else:
+            if resume:
+                logger.info("No interrupted run to resume; starting a new one")
+            run_id = set_run_id()
+            journal.begin(run_id)
+            logger.info(f"Starting AI News Automation (run {run_id})...")
         
         try:
-            # Fetch AI news
-            news_list = self.fetch_ai_news()
-            
-            if not news_list:
-                logger.warning("No AI news found today")
-                return
+            selected = journal.get('selected')
+            if selected is not None:
+                selected_article = Article.from_dict(selected['article'])
+            else:
+                news_list = self._gather_candidates(journal)
+                
+                if not news_list:
+                    logger.warning("No AI news found today")
+                    journal.record('done')
+                    return
+                
+                # Select best article
+                with stage('select'), self.deadline.stage('select'):
+                    selected_article = self.select_best_article(news_list)
+                
+                if not selected_article:
+                    logger.info("No suitable article to post today")
+                    journal.record('done')
+                    return
+                
+                # Full text from enrichment is journaled too, so a resumed generation needs no download
+                journal.record('selected', {'article': selected_article.to_dict()})
             
-            # Select best article
-            selected_article = self.select_best_article(news_list)
+            generated = journal.get('generated')
+            if generated is not None:
+                post_content = generated['post']
+                image_path = generated['image_path']
+                if image_path and not os.path.exists(image_path):
+                    image_path = None
+            else:
+                # The preview image downloads and re-encodes while the post is generated
+                with stage('generate'), self.deadline.stage('generate'):
+                    executor = ThreadPoolExecutor(max_workers=1, initializer=inherit_log_context())
+                    image_future = executor.submit(self.prepare_image, selected_article) if self.post_image else None
+                    
+                    # Create the post once and render it for LinkedIn and the other channels
+                    draft = self.create_post_draft(selected_article)
+                    outputs = self.draft_cache.renders(selected_article, draft, self.post_channels)
+                    post_content = outputs['linkedin']
+                    
+                    try:
+                        image_path = image_future.result(timeout=wait_timeout()) if image_future else None
+                    except FutureTimeoutError:
+                        self.deadline.degrade('generate', "budget spent; posting without the preview image")
+                        image_path = None
+                    executor.shutdown(wait=False)
+                write_outputs(outputs, self.channel_output_dir)
+                logger.info(f"Rendered the post for {', '.join(outputs)} in {self.channel_output_dir}/")
+                journal.record('generated', {'post': post_content, 'image_path': image_path,
+                                             'draft': draft.to_dict()})
             
-            if not selected_article:
-                logger.info("No suitable article to post today")
+            if (journal.get('post_started') is None and journal.get('posted') is None
+                    and self.deadline.allot('post') < MIN_POST_SECONDS):
+                # Posting now could overrun the runner's limit; the next run posts it from the journal
+                self.deadline.degrade('post', "budget spent; post queued for the next run")
+                journal.record('queued')
                 return
             
-            # Create LinkedIn post
-            post_content = self.create_linkedin_post(selected_article)
-            
             # Post to LinkedIn
-            success = self.post_to_linkedin(post_content)
+            success = self._publish(journal, post_content, image_path)
             
             if success:
-                # Mark article as posted (even if just saved to file)
-                self.posted_articles.append({
-                    'url': selected_article.get('url'),
-                    'title': selected_article.get('title'),
-                    'posted_at': datetime.now().isoformat()
-                })
-                self.save_posted_articles()
+                # Mark article as posted (even if just saved to file); a resumed run may already have
+                if not self.posted_before([selected_article.fingerprint]):
+                    self.record_posted(selected_article)
                 
-                logger.info(f"Successfully processed: {selected_article.get('title')}")
+                logger.info(f"Successfully processed: {selected_article.title}")
             else:
                 logger.warning("LinkedIn posting failed, but article was processed")
+            journal.record('done')
         
         except Exception as e:
             logger.error(f"Error in automation: {e}")
             # Don't let the automation fail completely
             logger.info("Automation completed with errors, but system is still functional")
+    
+    def poll_due_feeds(self) -> int:
+        """Fetch only the sources whose adaptive schedule is due and store what they return for the next post"""
+        due_sources = [(name, source_func) for name, source_func in self.news_sources() if self.poller.due(name)]
+        if not due_sources:
+            return 0
+        
+        started = time.time()
+        # A run that stopped early leaves the flag set; polls want every source's answer
+        self.fetch_cancelled.clear()
+        
+        def run_source(source) -> List[Article]:
+            name, source_func = source
+            try:
+                with stage(name):
+                    return source_func() or []
+            except Exception as e:
+                logger.error(f"Error fetching from {name}: {e}")
+                return []
+        
+        with ThreadPoolExecutor(max_workers=len(due_sources), initializer=inherit_log_context()) as executor:
+            all_news = [article for news in executor.map(run_source, due_sources) for article in news]
+        
+        # A source that never reached observe() failed before getting an answer
+        for name, _ in due_sources:
+            if not self.poller.polled_since(name, started):
+                self.poller.failed(name)
+        
+        for name, _ in due_sources:
+            logger.info(f"{name}: next poll in {self.poller.seconds_until(name) / 60:.0f} min")
+        return self._ingest(all_news, f"Polled {len(due_sources)} sources")
+    
+    def _ingest(self, articles: List[Article], label: str) -> int:
+        """Normalize, deduplicate and store articles collected outside a run; returns how many are new"""
+        unique_news = self._deduplicate_news(self._normalize_news(articles))
+        fresh_news = self._drop_seen(unique_news)
+        self.store_articles(unique_news)
+        self.save_fetch_state()
+        logger.info(f"{label}: {len(fresh_news)} unposted articles")
+        return len(fresh_news)
+    
+    def _websub_hub(self, name: str, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """(hub, topic) for a feed: WEBSUB_HUBS first, otherwise whatever the feed advertises"""
+        if name in self.websub_hubs:
+            return self.websub_hubs[name], url
+        try:
+            response = self.scheduler.get(url, timeout=10)
+            response.raise_for_status()
+            return discover_hub(response.content, response.links)
+        except Exception as e:
+            logger.error(f"Error looking up the WebSub hub for {name}: {e}")
+            return None, None
+    
+    def renew_websub(self):
+        """Subscribe every RSS feed with a hub that has no subscription yet or whose lease is running out"""
+        if not self.websub:
+            return
+        renewals = set(self.websub.renewals_due())
+        for name, url in (('TechCrunch', self.techcrunch_feed_url), ('VentureBeat', self.venturebeat_feed_url)):
+            if name in self.websub_no_hub or (self.websub.active(name) and name not in renewals):
+                continue
+            hub, topic = self._websub_hub(name, url)
+            if hub:
+                self.websub.subscribe(name, topic or url, hub)
+            else:
+                # Looked up again when the daemon restarts
+                logger.info(f"{name} does not advertise a WebSub hub; polling only")
+                self.websub_no_hub.add(name)
+        self.save_fetch_state()
+    
+    def start_websub(self) -> bool:
+        """Start the WebSub callback server and subscribe the feeds that support it"""
+        if not self.websub_callback_url:
+            return False
+        try:
+            self.websub = WebSubSubscriber(
+                self.websub_callback_url, port=self.websub_port, lease_seconds=self.websub_lease_seconds,
+                subscriptions=self.fetch_state.get('websub'),
+                secrets_file=os.getenv('WEBSUB_SECRETS_FILE', DEFAULT_WEBSUB_SECRETS_FILE)
+            ).start()
+        except OSError as e:
+            logger.error(f"Error starting the WebSub callback server: {e}")
+            return False
+        self.renew_websub()
+        return True
+    
+    def ingest_pushed(self) -> int:
+        """Run feed updates pushed by WebSub hubs through the same seen/dedup/store path as polled ones"""
+        pushed = self.websub.drain() if self.websub else []
+        if not pushed:
+            return 0
+        
+        articles = []
+        for name, body in pushed:
+            try:
+                found, new_published = self._parse_rss_items(name, body)
+            except Exception as e:
+                logger.error(f"Error parsing WebSub push for {name}: {e}")
+                continue
+            self.poller.observe(name, new_published)
+            # The hub is delivering, so polling this feed is only a safety net
+            self.poller.defer(name, self.poller.max_interval)
+            articles.extend(found)
+        return self._ingest(articles, f"Received {len(pushed)} WebSub pushes")
+    
+    def run_daemon(self, post_time: str):
+        """Poll feeds on their adaptive schedules and post once a day at post_time (HH:MM, local time)"""
+        import schedule
+        
+        self.respect_poll_schedule = True
+        tick = max(1, int(os.getenv('POLL_TICK_SECONDS', '30')))
+        schedule.every(tick).seconds.do(self.poll_due_feeds)
+        schedule.every().day.at(post_time).do(self.run_automation)
+        if self.start_websub():
+            schedule.every(tick).seconds.do(self.ingest_pushed)
+            schedule.every().hour.do(self.renew_websub)
+        logger.info(f"Daemon started: checking feeds every {tick}s, posting daily at {post_time}")
+        
+        try:
+            self.poll_due_feeds()
+            while True:
+                schedule.run_pending()
+                time.sleep(min(tick, max(1, schedule.idle_seconds() or tick)))
+        except KeyboardInterrupt:
+            logger.info("Daemon stopped")
+        finally:
+            # Subscriptions are kept: their leases let the next daemon receive pushes without resubscribing
+            if self.websub:
+                self.websub.stop()
+            self.save_fetch_state()
 
 def main():
     """Main function"""
-    automation = AINewsAutomation()
-    automation.run_automation()
+    parser = argparse.ArgumentParser(description='Fetch AI news and post it to LinkedIn')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the run with cProfile and tracemalloc (also enabled by AI_NEWS_PROFILE=1)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run from its journal (starts a new run if there is none)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running: poll feeds on their adaptive schedules and post once a day')
+    parser.add_argument('--post-time', default=os.getenv('POST_TIME', '09:00'),
+                        help='Daily posting time in daemon mode (HH:MM, local time)')
+    parser.add_argument('--backfill', nargs='+', metavar='PATH',
+                        help='Load archived RSS/Atom dumps and NewsAPI JSON exports (files or directories) and exit')
+    parser.add_argument('--workers', type=int, help='Parser processes for --backfill (default: one per CPU)')
+    parser.add_argument('--snapshot', default=os.getenv(SNAPSHOT_ENV_VAR),
+                        help='Restore state from this snapshot before the run and rewrite it afterwards')
+    network = parser.add_mutually_exclusive_group()
+    network.add_argument('--record', metavar='CASSETTE', default=os.getenv('RECORD_CASSETTE'),
+                         help='Record every HTTP exchange (and the starting state) into a cassette')
+    network.add_argument('--replay', metavar='CASSETTE', default=os.getenv('REPLAY_CASSETTE'),
+                         help='Run offline against a recorded cassette in a scratch directory')
+    args = parser.parse_args()
+    if args.record and args.replay:
+        # The group only sees the flags; either may also come from RECORD_CASSETTE/REPLAY_CASSETTE
+        parser.error("--record (RECORD_CASSETTE) and --replay (REPLAY_CASSETTE) cannot be used together")
+    
+    cassette = None
+    if args.replay:
+        # Replay brings its own starting state and must never rewrite the live snapshot
+        args.snapshot = None
+        cassette = start_replay(args.replay)
+    elif args.snapshot:
+        # Ephemeral runners start warm from the previous run's state
+        restore_snapshot(args.snapshot)
+    if args.record:
+        cassette = start_recording(args.record)
+    
+    try:
+        automation = AINewsAutomation()
+        if args.backfill:
+            automation.backfill(args.backfill, args.workers)
+        elif args.daemon:
+            automation.run_daemon(args.post_time)
+        elif profiling_requested(args.profile):
+            run_profiled(lambda: automation.run_automation(resume=args.resume))
+        else:
+            automation.run_automation(resume=args.resume)
+    finally:
+        if cassette:
+            cassette.stop()
+        if args.snapshot:
+            try:
+                create_snapshot(args.snapshot)
+            except Exception as e:
+                logger.error(f"Error writing state snapshot: {e}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
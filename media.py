@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Link-preview images for AI News Automation
+Finds an article's og:image, fits it to LinkedIn's limits and keeps it in a content-addressed cache
+"""
+
+import os
+import io
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from lxml import etree, html as lxml_html
+
+from article import Article, url_fingerprint
+from enrichment import USER_AGENT, download_html
+from politeness import HostScheduler
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it images are only size-checked
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_DIR = os.path.join('cache', 'media')
+HEAD_BYTES = 128 * 1024
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_DIMENSION = 1200
+MIN_DIMENSION = 200
+JPEG_QUALITY = 85
+PASSTHROUGH_TYPES = {'image/jpeg': '.jpg', 'image/png': '.png'}
+# A page without og:image may have been an error or anti-bot page, so look again after this long
+MISSING_IMAGE_TTL = 24 * 3600
+
+
+def extract_og_image(page: bytes, base_url: str) -> Optional[str]:
+    """Absolute og:image (or twitter:image) URL from an HTML page"""
+    if not page:
+        return None
+    try:
+        document = lxml_html.fromstring(page)
+    except (etree.ParserError, ValueError):
+        return None
+    for xpath in ('//meta[@property="og:image:secure_url"]/@content', '//meta[@property="og:image"]/@content',
+                  '//meta[@name="twitter:image"]/@content'):
+        values = [value.strip() for value in document.xpath(xpath) if value.strip()]
+        if values:
+            return urljoin(base_url, values[0])
+    return None
+
+
+class MediaCache:
+    """Downloads and re-encodes preview images once, keyed by content hash
+
+    index.json maps article URLs to image URLs, image URLs to the SHA-256 of the
+    downloaded bytes, and those to the SHA-256 of the processed file, so a retry,
+    another account or a later run reuses the same file without any network or
+    encoding work. Articles whose page had no og:image are remembered for
+    MISSING_IMAGE_TTL only; failed downloads are not remembered at all.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_MEDIA_DIR, scheduler: Optional[HostScheduler] = None,
+                 timeout: float = 10):
+        self.cache_dir = cache_dir
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        for key in ('articles', 'images', 'processed', 'missing'):
+            index.setdefault(key, {})
+        cutoff = time.time() - MISSING_IMAGE_TTL
+        index['missing'] = {key: checked_at for key, checked_at in index['missing'].items() if checked_at >= cutoff}
+        return index
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _file_for(self, digest: str) -> Optional[str]:
+        for suffix in ('.jpg', '.png'):
+            path = os.path.join(self.cache_dir, f"{digest}{suffix}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _image_url(self, article: Article) -> Optional[str]:
+        key = url_fingerprint(article.url)
+        if self.index['articles'].get(key):
+            return self.index['articles'][key]
+        if key in self.index['missing']:
+            return None
+        # Timeouts and error statuses raise here, so only a page that actually arrived is recorded
+        page = download_html(article.url, HEAD_BYTES, self.timeout, scheduler=self.scheduler)
+        image_url = extract_og_image(page, article.url)
+        with self._lock:
+            if image_url:
+                self.index['articles'][key] = image_url
+            else:
+                self.index['articles'].pop(key, None)
+                self.index['missing'][key] = time.time()
+        return image_url
+
+    def _download(self, image_url: str) -> Optional[bytes]:
+        if self.scheduler:
+            response = self.scheduler.get(image_url, headers={'User-Agent': USER_AGENT}, timeout=self.timeout, stream=True)
+        else:
+            response = requests.get(image_url, headers={'User-Agent': USER_AGENT}, timeout=self.timeout, stream=True)
+        try:
+            response.raise_for_status()
+            if not response.headers.get('Content-Type', '').startswith('image/'):
+                logger.info(f"og:image is not an image ({response.headers.get('Content-Type')}): {image_url}")
+                return None
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                received += len(chunk)
+                # Originals far past the limit are rarely worth re-encoding
+                if received > MAX_IMAGE_BYTES * 4:
+                    logger.info(f"og:image too large, skipping: {image_url}")
+                    return None
+            return b''.join(chunks)
+        finally:
+            response.close()
+
+    def _process(self, data: bytes) -> Optional[Tuple[bytes, str]]:
+        """(bytes, suffix) fitted to LinkedIn's limits, or None if the image is unusable"""
+        if Image is None:
+            kind = 'image/png' if data.startswith(b'\x89PNG') else 'image/jpeg' if data.startswith(b'\xff\xd8') else None
+            if kind and len(data) <= MAX_IMAGE_BYTES:
+                return data, PASSTHROUGH_TYPES[kind]
+            logger.info("Pillow not installed and image needs conversion; posting without it")
+            return None
+
+        with Image.open(io.BytesIO(data)) as image:
+            if min(image.size) < MIN_DIMENSION:
+                logger.info(f"og:image too small ({image.size[0]}x{image.size[1]}), skipping")
+                return None
+            image = image.convert('RGB')
+            image.thumbnail((MAX_DIMENSION, MAX_DIMENSION))
+            quality = JPEG_QUALITY
+            while True:
+                output = io.BytesIO()
+                image.save(output, 'JPEG', quality=quality, optimize=True, progressive=True)
+                if output.tell() <= MAX_IMAGE_BYTES or quality <= 40:
+                    return output.getvalue(), '.jpg'
+                quality -= 15
+
+    def image_for(self, article: Article) -> Optional[str]:
+        """Path of a ready-to-upload preview image for the article, or None"""
+        try:
+            image_url = self._image_url(article)
+            if not image_url:
+                return None
+
+            raw_digest = self.index['images'].get(image_url)
+            if raw_digest is None:
+                data = self._download(image_url)
+                if not data:
+                    return None
+                raw_digest = hashlib.sha256(data).hexdigest()
+                with self._lock:
+                    self.index['images'][image_url] = raw_digest
+            else:
+                data = None
+
+            processed_digest = self.index['processed'].get(raw_digest)
+            path = self._file_for(processed_digest) if processed_digest else None
+            if path:
+                logger.info(f"Preview image from cache: {path}")
+                return path
+
+            if data is None:
+                data = self._download(image_url)
+                if not data:
+                    return None
+            processed = self._process(data)
+            if not processed:
+                return None
+            content, suffix = processed
+            processed_digest = hashlib.sha256(content).hexdigest()
+            path = os.path.join(self.cache_dir, f"{processed_digest}{suffix}")
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            with self._lock:
+                self.index['processed'][raw_digest] = processed_digest
+            logger.info(f"Preview image ready: {path} ({len(content)} bytes)")
+            return path
+        except Exception as e:
+            logger.warning(f"Could not prepare preview image for {article.url}: {e}")
+            return None
+        finally:
+            with self._lock:
+                try:
+                    self._save_index()
+                except OSError as e:
+                    logger.warning(f"Could not save media index: {e}")
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for LinkedIn used to exercise the posting backends
+Serves the ugcPosts REST API, the linkedin_api login handshake and a minimal feed/editor page, with injectable latency and errors
+"""
+
+import json
+import time
+import uuid
+import random
+import logging
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+MOCK_ACCESS_TOKEN = 'mock-access-token'
+MOCK_PERSON_ID = 'mock-person'
+# Endpoints that create something; error injection only applies to these
+WRITE_ENDPOINTS = ('ugcPosts', 'registerUpload', 'upload', 'web_post')
+
+LOGIN_PAGE = """<!DOCTYPE html><html><head><title>LinkedIn Login</title></head><body>
+<form method="post" action="/login">
+  <input id="username" name="session_key" type="text">
+  <input id="password" name="session_password" type="password">
+  <button type="submit">Sign in</button>
+</form></body></html>"""
+
+CHALLENGE_PAGE = """<!DOCTYPE html><html><head><title>Security Verification</title></head><body>
+<h1>Let's do a quick security check</h1><p>Enter the code we sent to your email.</p>
+<input id="input__email_verification_pin" type="text"></body></html>"""
+
+# Mirrors the selectors in post_editor.py that the browser posters wait for; pasted text is inserted like LinkedIn's editor does
+FEED_PAGE = """<!DOCTYPE html><html><head><title>Feed | LinkedIn</title></head><body>
+<div data-test-id="nav-home">Home</div>
+<button aria-label="Start a post" onclick="openEditor()">Start a post</button>
+<script>
+function openEditor() {
+  if (document.querySelector("div[data-test-id='post-modal']")) return;
+  const modal = document.createElement('div');
+  modal.setAttribute('data-test-id', 'post-modal');
+  modal.innerHTML = '<div role="textbox" contenteditable="true"></div>' +
+    '<input type="file" accept="image/*"><div class="preview"></div>' +
+    '<button data-test-id="post-button">Post</button>';
+  document.body.appendChild(modal);
+  const editor = modal.querySelector("div[role='textbox']");
+  editor.addEventListener('paste', (event) => {
+    event.preventDefault();
+    document.execCommand('insertText', false, event.clipboardData.getData('text/plain'));
+  });
+  let image = null;
+  modal.querySelector("input[type='file']").addEventListener('change', (event) => {
+    const reader = new FileReader();
+    reader.onload = () => {
+      image = reader.result;
+      const img = document.createElement('img');
+      img.src = image;
+      modal.querySelector('.preview').appendChild(img);
+    };
+    reader.readAsDataURL(event.target.files[0]);
+  });
+  modal.querySelector("button[data-test-id='post-button']").addEventListener('click', () => {
+    fetch('/mock/web-post', {method: 'POST', headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({text: editor.innerText, image: image !== null})})
+      .then((response) => { document.title = 'posted ' + response.status; });
+  });
+}
+</script></body></html>"""
+
+
+class MockLinkedInConfig:
+    """Latency and fault injection settings; safe to change while the server runs"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_statuses: Tuple[int, ...] = (429, 503), retry_after: float = 1.0,
+                 challenge_rate: float = 0.0, lost_response_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.challenge_rate = challenge_rate
+        # The post is created but the client sees a 500, as when a response is lost in transit
+        self.lost_response_rate = lost_response_rate
+        self.random = random.Random(seed)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Route requests to the REST, auth and web handlers of MockLinkedInServer"""
+
+    def _send(self, status: int, body=b'', content_type: str = 'application/json', headers: Optional[Dict] = None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode('utf-8')
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            for item in (value if isinstance(value, list) else [value]):
+                self.send_header(name, item)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _cookies(self) -> Dict[str, str]:
+        cookie = SimpleCookie(self.headers.get('Cookie') or '')
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+    def _handle(self, method: str):
+        parts = urlsplit(self.path)
+        self.server.dispatch(self, method, parts.path, parse_qs(parts.query))
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockLinkedInServer(ThreadingHTTPServer):
+    """Local HTTP server standing in for api.linkedin.com and www.linkedin.com
+
+    Routes:
+        POST /v2/ugcPosts                         create a post (Bearer token, 422 on duplicate text)
+        POST /v2/assets?action=registerUpload     register an image upload
+        PUT  /mock/upload/<asset>                 receive image bytes
+        GET  /v2/userinfo                         person ID for the token
+        GET|POST /uas/authenticate                linkedin_api login handshake (PASS or CHALLENGE)
+        GET  /, /login, /feed/, /checkpoint/...   login form, feed and post editor for Selenium
+        POST /login, /mock/web-post               form login and the editor's submit
+        GET  /mock/stats, POST /mock/reset        counters for load harnesses
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, config: Optional[MockLinkedInConfig] = None):
+        super().__init__((host, port), _MockHandler)
+        self.config = config or MockLinkedInConfig()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.posts: List[Dict] = []
+            self.requests: Dict[str, int] = {}
+            self.injected: Dict[str, int] = {}
+            self.duplicates = 0
+            self.challenges = 0
+            self.lost_responses = 0
+            self.sessions = set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'posts': len(self.posts),
+                'images': sum(1 for post in self.posts if post['image']),
+                'requests': dict(self.requests),
+                'injected_errors': dict(self.injected),
+                'duplicates': self.duplicates,
+                'challenges': self.challenges,
+                'lost_responses': self.lost_responses,
+            }
+
+    def url(self, path: str = '') -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    # Fault injection
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def _inject(self, handler: _MockHandler, endpoint: str) -> bool:
+        """Send an injected error for write endpoints; True if the request was answered"""
+        config = self.config
+        if endpoint not in WRITE_ENDPOINTS or config.random.random() >= config.error_rate:
+            return False
+        status = config.random.choice(config.error_statuses)
+        with self._lock:
+            self.injected[str(status)] = self.injected.get(str(status), 0) + 1
+        headers = {'Retry-After': str(int(config.retry_after))} if status in (429, 503) else {}
+        handler._send(status, {'status': status, 'message': 'Injected error'}, headers=headers)
+        return True
+
+    def _create_post(self, text: str, image: bool) -> Tuple[int, Dict]:
+        with self._lock:
+            if any(post['text'] == text for post in self.posts):
+                self.duplicates += 1
+                return 422, {'status': 422, 'message': 'Content is a duplicate'}
+            post_id = f"urn:li:share:{len(self.posts) + 1}"
+            self.posts.append({'id': post_id, 'text': text, 'image': image, 'created_at': time.time()})
+        if self.config.random.random() < self.config.lost_response_rate:
+            with self._lock:
+                self.lost_responses += 1
+            return 500, {'status': 500, 'message': 'Internal Server Error'}
+        return 201, {'id': post_id}
+
+    # Routing
+
+    def dispatch(self, handler: _MockHandler, method: str, path: str, query: Dict):
+        config = self.config
+        if not path.startswith('/mock/stats'):
+            delay = config.latency + (config.random.uniform(0, config.jitter) if config.jitter else 0)
+            if delay > 0:
+                time.sleep(delay)
+
+        if path == '/v2/ugcPosts' and method == 'POST':
+            endpoint = 'ugcPosts'
+        elif path == '/v2/assets' and method == 'POST':
+            endpoint = 'registerUpload'
+        elif path.startswith('/mock/upload/') and method == 'PUT':
+            endpoint = 'upload'
+        elif path == '/mock/web-post' and method == 'POST':
+            endpoint = 'web_post'
+        else:
+            endpoint = path.rstrip('/').rsplit('/', 1)[-1] or 'home'
+        self._count(endpoint)
+        if self._inject(handler, endpoint):
+            return
+
+        route = {
+            'ugcPosts': self._ugc_posts,
+            'registerUpload': self._register_upload,
+            'upload': self._upload,
+            'web_post': self._web_post,
+        }.get(endpoint)
+        if route:
+            route(handler)
+        elif path == '/v2/userinfo':
+            self._userinfo(handler)
+        elif path == '/uas/authenticate':
+            self._uas_authenticate(handler, method)
+        elif path == '/login':
+            self._login(handler, method)
+        elif path.startswith('/checkpoint/'):
+            handler._send(200, CHALLENGE_PAGE, 'text/html; charset=utf-8')
+        elif path in ('/', '/feed', '/feed/'):
+            self._feed(handler, path)
+        elif path == '/mock/stats':
+            handler._send(200, self.stats())
+        elif path == '/mock/reset' and method == 'POST':
+            self.reset()
+            handler._send(204)
+        else:
+            handler._send(404, {'status': 404, 'message': f"No mock route for {method} {path}"})
+
+    # REST API
+
+    def _authorized(self, handler: _MockHandler) -> bool:
+        if handler.headers.get('Authorization') == f"Bearer {MOCK_ACCESS_TOKEN}":
+            return True
+        handler._send(401, {'serviceErrorCode': 65600, 'message': 'Invalid access token', 'status': 401})
+        return False
+
+    def _userinfo(self, handler: _MockHandler):
+        if self._authorized(handler):
+            handler._send(200, {'sub': MOCK_PERSON_ID, 'name': 'Mock Member'})
+
+    def _register_upload(self, handler: _MockHandler):
+        handler._body()
+        if not self._authorized(handler):
+            return
+        asset = uuid.uuid4().hex[:12]
+        handler._send(200, {'value': {
+            'asset': f"urn:li:digitalmediaAsset:{asset}",
+            'uploadMechanism': {'com.linkedin.digitalmedia.uploadMechanism.MediaUploadHttpRequest': {
+                'uploadUrl': self.url(f"/mock/upload/{asset}")
+            }},
+        }})
+
+    def _upload(self, handler: _MockHandler):
+        handler._body()
+        if self._authorized(handler):
+            handler._send(201)
+
+    def _ugc_posts(self, handler: _MockHandler):
+        try:
+            data = json.loads(handler._body() or b'{}')
+        except ValueError:
+            handler._send(400, {'status': 400, 'message': 'Malformed JSON'})
+            return
+        if not self._authorized(handler):
+            return
+        content = (data.get('specificContent') or {}).get('com.linkedin.ugc.ShareContent') or {}
+        text = (content.get('shareCommentary') or {}).get('text')
+        if not data.get('author') or not text:
+            handler._send(422, {'status': 422, 'message': 'author and shareCommentary.text are required'})
+            return
+        status, body = self._create_post(text, content.get('shareMediaCategory') == 'IMAGE')
+        handler._send(status, body, headers={'X-RestLi-Id': body['id']} if status == 201 else None)
+
+    # linkedin_api login handshake
+
+    def _uas_authenticate(self, handler: _MockHandler, method: str):
+        if method == 'GET':
+            handler._send(200, b'', headers={'Set-Cookie': 'JSESSIONID="ajax:mock"; Path=/'})
+            return
+        handler._body()
+        if self.config.random.random() < self.config.challenge_rate:
+            with self._lock:
+                self.challenges += 1
+            handler._send(200, {'login_result': 'CHALLENGE', 'challenge_url': self.url('/checkpoint/challenge/')})
+            return
+        session = uuid.uuid4().hex
+        with self._lock:
+            self.sessions.add(session)
+        handler._send(200, {'login_result': 'PASS'}, headers={'Set-Cookie': f"li_at={session}; Path=/"})
+
+    # Web pages for Selenium
+
+    def _logged_in(self, handler: _MockHandler) -> bool:
+        with self._lock:
+            return handler._cookies().get('li_at') in self.sessions
+
+    def _login(self, handler: _MockHandler, method: str):
+        if method == 'GET':
+            handler._send(200, LOGIN_PAGE, 'text/html; charset=utf-8')
+            return
+        form = parse_qs(handler._body().decode('utf-8'))
+        if not form.get('session_key') or not form.get('session_password'):
+            handler._send(200, LOGIN_PAGE, 'text/html; charset=utf-8')
+            return
+        if self.config.random.random() < self.config.challenge_rate:
+            with self._lock:
+                self.challenges += 1
+            handler._send(302, headers={'Location': '/checkpoint/challenge/'})
+            return
+        session = uuid.uuid4().hex
+        with self._lock:
+            self.sessions.add(session)
+        handler._send(302, headers={'Location': '/feed/', 'Set-Cookie': f"li_at={session}; Path=/"})
+
+    def _feed(self, handler: _MockHandler, path: str):
+        if self._logged_in(handler):
+            handler._send(200, FEED_PAGE, 'text/html; charset=utf-8')
+        elif path == '/':
+            # Cookies can only be set on a loaded page, so the root answers without a session
+            handler._send(200, '<!DOCTYPE html><html><body>LinkedIn</body></html>', 'text/html; charset=utf-8')
+        else:
+            handler._send(302, headers={'Location': '/login'})
+
+    def _web_post(self, handler: _MockHandler):
+        try:
+            data = json.loads(handler._body() or b'{}')
+        except ValueError:
+            data = {}
+        if not self._logged_in(handler):
+            handler._send(401, {'status': 401, 'message': 'Not signed in'})
+            return
+        status, body = self._create_post((data.get('text') or '').strip(), bool(data.get('image')))
+        handler._send(status, body)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a local stand-in for LinkedIn')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of write requests answered with an error')
+    parser.add_argument('--error-statuses', type=int, nargs='+', default=[429, 503])
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--challenge-rate', type=float, default=0.0, help='Share of logins sent to a security check')
+    parser.add_argument('--lost-response-rate', type=float, default=0.0,
+                        help='Share of created posts answered with a 500')
+    args = parser.parse_args()
+
+    server = MockLinkedInServer(port=args.port, config=MockLinkedInConfig(
+        args.latency, args.jitter, args.error_rate, tuple(args.error_statuses), args.retry_after,
+        args.challenge_rate, args.lost_response_rate
+    )).start()
+    print(f"Mock LinkedIn on {server.url('/')}")
+    print(f"  LINKEDIN_API_BASE={server.url()} LINKEDIN_WEB_BASE={server.url()} "
+          f"LINKEDIN_ACCESS_TOKEN={MOCK_ACCESS_TOKEN}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a WebSub hub used to exercise push ingestion
+Accepts subscriptions, verifies intent against the subscriber's callback and distributes signed feed updates
+"""
+
+import hmac
+import time
+import hashlib
+import logging
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 24 * 3600
+
+
+class _HubHandler(BaseHTTPRequestHandler):
+    """Route subscription and publish requests to LocalHub"""
+
+    def _send(self, status: int, body: str = ''):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/stats':
+            self._send(200, repr(self.server.stats()))
+        else:
+            self._send(404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+        status, message = self.server.handle_form(form)
+        self._send(status, message)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalHub(ThreadingHTTPServer):
+    """Minimal WebSub hub on localhost
+
+    Routes:
+        POST /   hub.mode=subscribe|unsubscribe   202, then verifies intent with a GET to the callback
+        POST /   hub.mode=publish&hub.url=<topic>  fetches the topic and pushes it to its subscribers
+        GET  /stats                                subscription and delivery counters
+
+    publish() pushes a given body directly, which is what tests and benchmarks use.
+    Deliveries are signed with X-Hub-Signature (sha256) when the subscriber sent a secret.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, verify_async: bool = True):
+        super().__init__((host, port), _HubHandler)
+        self.verify_async = verify_async
+        self.session = requests.Session()
+        # topic -> callback -> {'secret', 'expires_at'}
+        self.subscriptions: Dict[str, Dict[str, Dict]] = {}
+        self.deliveries = 0
+        self.failed_deliveries = 0
+        self.failed_verifications = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def url(self, path: str = '/') -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'topics': len(self.subscriptions),
+                'subscriptions': sum(len(callbacks) for callbacks in self.subscriptions.values()),
+                'deliveries': self.deliveries,
+                'failed_deliveries': self.failed_deliveries,
+                'failed_verifications': self.failed_verifications,
+            }
+
+    def subscribers(self, topic: str) -> List[str]:
+        now = time.time()
+        with self._lock:
+            return [callback for callback, sub in self.subscriptions.get(topic, {}).items()
+                    if sub['expires_at'] > now]
+
+    def handle_form(self, form: Dict[str, str]):
+        mode = form.get('hub.mode')
+        if mode == 'publish':
+            topic = form.get('hub.url') or form.get('hub.topic')
+            if not topic:
+                return 400, 'hub.url is required'
+            threading.Thread(target=self._publish_fetched, args=(topic,), daemon=True).start()
+            return 204, ''
+        if mode not in ('subscribe', 'unsubscribe'):
+            return 400, f"Unsupported hub.mode {mode}"
+        if not form.get('hub.callback') or not form.get('hub.topic'):
+            return 400, 'hub.callback and hub.topic are required'
+        if self.verify_async:
+            threading.Thread(target=self._verify, args=(form,), daemon=True).start()
+        else:
+            self._verify(form)
+        return 202, ''
+
+    def _verify(self, form: Dict[str, str]):
+        """Confirm the subscriber really asked for this (un)subscription before applying it"""
+        mode, topic, callback = form['hub.mode'], form['hub.topic'], form['hub.callback']
+        lease = int(form.get('hub.lease_seconds') or DEFAULT_LEASE_SECONDS)
+        challenge = secrets.token_urlsafe(16)
+        params = {'hub.mode': mode, 'hub.topic': topic, 'hub.challenge': challenge}
+        if mode == 'subscribe':
+            params['hub.lease_seconds'] = str(lease)
+        try:
+            response = self.session.get(callback, params=params, timeout=10)
+            confirmed = response.status_code // 100 == 2 and response.text.strip() == challenge
+        except requests.RequestException as e:
+            logger.warning(f"Hub could not reach {callback}: {e}")
+            confirmed = False
+
+        with self._lock:
+            if not confirmed:
+                self.failed_verifications += 1
+                return
+            callbacks = self.subscriptions.setdefault(topic, {})
+            if mode == 'subscribe':
+                callbacks[callback] = {'secret': form.get('hub.secret'), 'expires_at': time.time() + lease}
+            else:
+                callbacks.pop(callback, None)
+
+    def _publish_fetched(self, topic: str):
+        try:
+            response = self.session.get(topic, timeout=10)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Hub could not fetch {topic}: {e}")
+            return
+        self.publish(topic, response.content, response.headers.get('Content-Type', 'application/rss+xml'))
+
+    def publish(self, topic: str, content: bytes, content_type: str = 'application/rss+xml') -> Dict[str, int]:
+        """Push content to every subscriber of topic; returns each callback's status (0 if unreachable)"""
+        with self._lock:
+            targets = [(callback, sub.get('secret')) for callback, sub in self.subscriptions.get(topic, {}).items()
+                       if sub['expires_at'] > time.time()]
+        statuses = {}
+        for callback, secret in targets:
+            headers = {
+                'Content-Type': content_type,
+                'Link': f'<{self.url()}>; rel="hub", <{topic}>; rel="self"',
+            }
+            if secret:
+                digest = hmac.new(secret.encode('utf-8'), content, hashlib.sha256).hexdigest()
+                headers['X-Hub-Signature'] = f"sha256={digest}"
+            try:
+                status = self.session.post(callback, data=content, headers=headers, timeout=10).status_code
+            except requests.RequestException:
+                status = 0
+            statuses[callback] = status
+            with self._lock:
+                if status // 100 == 2:
+                    self.deliveries += 1
+                else:
+                    self.failed_deliveries += 1
+                    if status == 410:
+                        self.subscriptions.get(topic, {}).pop(callback, None)
+        return statuses
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a local stand-in for a WebSub hub')
+    parser.add_argument('--port', type=int, default=8200)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    hub = LocalHub(port=args.port).start()
+    print(f"Local WebSub hub on {hub.url()}")
+    print(f"  WEBSUB_HUBS=TechCrunch={hub.url()},VentureBeat={hub.url()}")
+    print(f"  publish: curl -d hub.mode=publish -d hub.url=<feed URL> {hub.url()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        hub.stop()
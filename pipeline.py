@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Streaming fetch pipeline for AI News Automation
+Runs sources and processing stages on threads joined by bounded queues so candidates are scored as soon as they arrive
+"""
+
+import re
+import time
+import queue
+import logging
+import threading
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from article import Article
+from logging_config import inherit_log_context
+from profiling import stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_SCORE_THRESHOLD = 6.0
+FRESHNESS_HOURS = 48.0
+_DONE = object()
+
+Batch = List[Article]
+Source = Tuple[str, Callable[[], Batch]]
+Stage = Tuple[str, Callable[[Batch], Batch]]
+
+
+@lru_cache(maxsize=8)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    return re.compile(r'\b(?:%s)\b' % '|'.join(re.escape(keyword) for keyword in keywords))
+
+
+def score_article(article: Article, keywords: Sequence[str], now: Optional[float] = None) -> float:
+    """Quality score out of 9: topical relevance (4.5), freshness (3) and substance (1.5)
+
+    Keywords are matched on word boundaries, so 'ai' counts in a headline but not in 'said'.
+    Articles without a parseable date get a third of the freshness points.
+    """
+    pattern = _keyword_pattern(tuple(keywords))
+    title_hits = set(pattern.findall(article.title.lower()))
+    body_hits = set(pattern.findall(article.description.lower())) - title_hits
+    relevance = min(len(title_hits), 2) * 1.5 + min(len(body_hits), 3) * 0.5
+
+    if article.published_ts:
+        age_hours = ((now or time.time()) - article.published_ts) / 3600
+        freshness = 3.0 * min(1.0, max(0.0, 1 - age_hours / FRESHNESS_HOURS))
+    else:
+        freshness = 1.0
+
+    substance = 1.5 * min(1.0, len(article.description) / 200)
+    return round(relevance + freshness + substance, 2)
+
+
+class StreamingPipeline:
+    """Sources feed batches of articles through a chain of stage threads
+
+    Every source runs on its own daemon thread and every stage on one worker, linked
+    by bounded queues, so a fast source's batch is deduplicated and filtered while
+    slower sources are still downloading. The caller reads finished batches from
+    batches() and may cancel() as soon as it has what it needs: sources still running
+    are abandoned instead of waited on, and anything they return afterwards still
+    runs through the stages (so it is stored) but is never handed to the caller.
+    Sources can poll the shared cancelled event to stop early.
+    """
+
+    def __init__(self, sources: List[Source], stages: List[Stage], queue_size: int = DEFAULT_QUEUE_SIZE,
+                 cancelled: Optional[threading.Event] = None):
+        self.sources = sources
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.cancelled = cancelled or threading.Event()
+        self.arrivals = {}
+        self._pending = {name for name, _ in sources}
+        self.timed_out = False
+        self._lock = threading.Lock()
+        self._started = None
+
+    @property
+    def pending(self) -> List[str]:
+        """Sources that have not returned yet"""
+        with self._lock:
+            return sorted(self._pending)
+
+    def _emit(self, outbox: queue.Queue, item, final: bool):
+        # Nobody reads the final queue after cancel(), so late output is dropped there
+        while True:
+            try:
+                outbox.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if final and self.cancelled.is_set():
+                    return
+
+    def _run_source(self, name: str, fetch: Callable[[], Batch], outbox: queue.Queue, initializer):
+        initializer()
+        try:
+            with stage(name):
+                batch = fetch() or []
+        except Exception as e:
+            logger.error(f"Error fetching from {name}: {e}")
+            batch = []
+
+        elapsed = time.monotonic() - self._started
+        self.arrivals[name] = round(elapsed, 3)
+        if self.cancelled.is_set():
+            logger.info(f"{name} returned {len(batch)} articles after selection stopped ({elapsed:.2f}s)")
+        else:
+            logger.info(f"{name} returned {len(batch)} articles after {elapsed:.2f}s")
+        if batch:
+            self._emit(outbox, (name, batch), final=False)
+
+        # The last source to finish closes the stream, after its own batch
+        with self._lock:
+            self._pending.discard(name)
+            last = not self._pending
+        if last:
+            self._emit(outbox, _DONE, final=False)
+
+    def _run_stage(self, name: str, process: Callable[[Batch], Batch], inbox: queue.Queue, outbox: queue.Queue,
+                   final: bool, initializer):
+        initializer()
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                self._emit(outbox, _DONE, final)
+                return
+            source, batch = item
+            try:
+                with stage(name):
+                    batch = process(batch)
+            except Exception as e:
+                logger.error(f"Pipeline stage {name} failed on a batch from {source}: {e}")
+                continue
+            if batch:
+                self._emit(outbox, (source, batch), final)
+
+    def batches(self, timeout: Optional[float] = None) -> Iterator[Tuple[str, Batch]]:
+        """Start every source and stage, then yield (source, batch) as each batch clears the last stage
+
+        With a timeout, stops yielding once that many seconds have passed and sets timed_out;
+        the caller decides whether to cancel() the sources still running.
+        """
+        self._started = time.monotonic()
+        initializer = inherit_log_context()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        for index, (name, process) in enumerate(self.stages):
+            threading.Thread(
+                target=self._run_stage, name=f"pipeline-{name}", daemon=True,
+                args=(name, process, queues[index], queues[index + 1], index == len(self.stages) - 1, initializer)
+            ).start()
+        for name, fetch in self.sources:
+            threading.Thread(
+                target=self._run_source, name=f"source-{name}", daemon=True,
+                args=(name, fetch, queues[0], initializer)
+            ).start()
+        if not self.sources:
+            queues[0].put(_DONE)
+
+        results = queues[-1]
+        ends = self._started + timeout if timeout is not None else None
+        while not self.cancelled.is_set():
+            try:
+                item = results.get(timeout=max(0.0, ends - time.monotonic()) if ends is not None else None)
+            except queue.Empty:
+                self.timed_out = True
+                return
+            if item is _DONE:
+                return
+            yield item
+
+    def cancel(self):
+        """Stop handing out batches and let sources still running know they are no longer wanted"""
+        pending = self.pending
+        self.cancelled.set()
+        if pending:
+            logger.info(f"Pipeline cancelled; not waiting for {', '.join(pending)}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Per-host politeness scheduling for AI News Automation
+Spaces requests to the same host, honors Retry-After and robots.txt Crawl-delay, lets distinct hosts run in parallel
+"""
+
+import time
+import logging
+import threading
+import requests
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_HOST_CONCURRENCY = 2
+DEFAULT_MAX_RETRY_WAIT = 60.0
+ROBOTS_TTL = 24 * 3600
+ROBOTS_TIMEOUT = 5
+RETRY_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_host_intervals(value: Optional[str]) -> Dict[str, float]:
+    """Per-host interval overrides from "host=seconds,host=seconds" """
+    intervals = {}
+    for pair in (value or '').split(','):
+        host, _, seconds = pair.partition('=')
+        if host.strip() and seconds.strip():
+            intervals[host.strip().lower()] = float(seconds)
+    return intervals
+
+
+class _HostState:
+    def __init__(self, interval: float, concurrency: int):
+        self.interval = interval
+        self.next_start = 0.0
+        self.lock = threading.Lock()
+        self.slots = threading.Semaphore(concurrency)
+        self.robots_checked = False
+
+
+class HostScheduler:
+    """Reserves request start times per host so each host sees at most one request per interval
+
+    Requests to different hosts never wait on each other. A host's interval is the
+    larger of min_interval (or its override) and its robots.txt Crawl-delay, and a
+    Retry-After response pushes that host's next start back.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, max_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+                 host_intervals: Optional[Dict[str, float]] = None, robots_cache: Optional[Dict] = None,
+                 respect_robots: bool = True, user_agent: str = '*', max_retry_wait: float = DEFAULT_MAX_RETRY_WAIT,
+                 cache_lock: Optional[threading.Lock] = None):
+        self.min_interval = min_interval
+        self.max_concurrency = max(1, max_concurrency)
+        self.host_intervals = host_intervals or {}
+        self.robots_cache = robots_cache if robots_cache is not None else {}
+        # Shared with whoever saves robots_cache, so it is never written mid-update
+        self.cache_lock = cache_lock or threading.Lock()
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.max_retry_wait = max_retry_wait
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> _HostState:
+        parts = urlsplit(url)
+        key = parts.netloc.lower()
+        with self._lock:
+            state = self._hosts.get(key)
+            if state is None:
+                interval = self.host_intervals.get(parts.hostname or key, self.min_interval)
+                state = self._hosts[key] = _HostState(interval, self.max_concurrency)
+        if self.respect_robots and not state.robots_checked:
+            with state.lock:
+                if not state.robots_checked:
+                    crawl_delay = self._crawl_delay(parts.scheme, key)
+                    if crawl_delay and crawl_delay > state.interval:
+                        logger.info(f"{key}: robots.txt Crawl-delay {crawl_delay}s")
+                        state.interval = crawl_delay
+                    state.robots_checked = True
+        return state
+
+    def _crawl_delay(self, scheme: str, host: str) -> Optional[float]:
+        """Crawl-delay from the host's robots.txt, cached in robots_cache for a day"""
+        cached = self.robots_cache.get(host)
+        if cached and time.time() - cached.get('checked_at', 0) < ROBOTS_TTL:
+            return cached.get('crawl_delay')
+
+        crawl_delay = None
+        try:
+            response = requests.get(f"{scheme}://{host}/robots.txt", timeout=ROBOTS_TIMEOUT,
+                                    headers={'User-Agent': self.user_agent})
+            if response.status_code == 200:
+                parser = RobotFileParser()
+                parser.parse(response.text.splitlines())
+                parser.modified()
+                delay = parser.crawl_delay(self.user_agent)
+                crawl_delay = float(delay) if delay is not None else None
+        except Exception as e:
+            logger.debug(f"Could not read robots.txt for {host}: {e}")
+        with self.cache_lock:
+            self.robots_cache[host] = {'crawl_delay': crawl_delay, 'checked_at': time.time()}
+        return crawl_delay
+
+    @contextmanager
+    def slot(self, url: str):
+        """Wait for this host's next free start time, holding one of its concurrency slots"""
+        state = self._host(url)
+        with state.slots:
+            with state.lock:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + state.interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+    def defer(self, url: str, seconds: float):
+        """Keep new requests away from url's host for the given number of seconds"""
+        state = self._host(url)
+        with state.lock:
+            state.next_start = max(state.next_start, time.monotonic() + seconds)
+
+    def get(self, url: str, session: Optional[requests.Session] = None, retries: int = 1,
+            **kwargs) -> requests.Response:
+        """GET through the scheduler, waiting out a short Retry-After once before giving up"""
+        for attempt in range(retries + 1):
+            with self.slot(url):
+                response = (session or requests).get(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            if delay is None:
+                return response
+            self.defer(url, delay)
+            if attempt == retries or delay > self.max_retry_wait:
+                return response
+            logger.warning(f"{urlsplit(url).netloc} answered {response.status_code}, retrying in {delay:.0f}s")
+            response.close()
+        return response
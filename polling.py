@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Adaptive feed polling for AI News Automation
+Learns each source's publish rate from item timestamps and schedules its next poll to match
+"""
+
+import time
+import random
+import logging
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 10 * 60
+DEFAULT_MAX_INTERVAL = 24 * 3600
+DEFAULT_TARGET_ITEMS = 1
+DEFAULT_JITTER = 0.1
+HISTORY_ITEMS = 50
+HISTORY_DAYS = 14
+# Publish dates this far in the future are clock skew, not real items
+MAX_CLOCK_SKEW = 300
+
+
+class AdaptivePoller:
+    """Per-source poll intervals derived from recent publish timestamps
+
+    The rate is the number of remembered items divided by the time since the oldest
+    of them, so a feed that has gone quiet slows down even without new items. The
+    next poll comes after about target_items new items are expected, clamped to
+    [min_interval, max_interval] and spread by +/- jitter so sources sharing a
+    schedule do not fire together. Sources with a request quota can have a higher
+    floor in source_min_intervals. State lives in a plain dict (fetch_state['polling'])
+    so it is saved with the fetch watermarks.
+    """
+
+    def __init__(self, state: Dict, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL, target_items: float = DEFAULT_TARGET_ITEMS,
+                 jitter: float = DEFAULT_JITTER, source_min_intervals: Optional[Dict[str, float]] = None):
+        self.state = state
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.target_items = target_items
+        self.jitter = jitter
+        self.source_min_intervals = source_min_intervals or {}
+
+    def min_interval_for(self, name: str) -> float:
+        """The source's own floor if it has one above the shared minimum"""
+        return max(self.min_interval, self.source_min_intervals.get(name, 0))
+
+    def _feed(self, name: str) -> Dict:
+        return self.state.setdefault(name, {})
+
+    def due(self, name: str, now: Optional[float] = None) -> bool:
+        """True if the source has never been polled or its next poll time has passed"""
+        next_poll = self.state.get(name, {}).get('next_poll')
+        return next_poll is None or (now or time.time()) >= next_poll
+
+    def seconds_until(self, name: str, now: Optional[float] = None) -> float:
+        next_poll = self.state.get(name, {}).get('next_poll')
+        return 0.0 if next_poll is None else max(0.0, next_poll - (now or time.time()))
+
+    def _schedule(self, name: str, interval: float, now: float) -> float:
+        feed = self._feed(name)
+        # A source's floor wins over max_interval, so a quota is never overrun
+        interval = max(self.min_interval_for(name), min(self.max_interval, interval))
+        feed['interval'] = round(interval, 1)
+        spread = random.uniform(1 - self.jitter, 1 + self.jitter) if self.jitter else 1.0
+        feed['next_poll'] = now + interval * spread
+        return interval
+
+    def observe(self, name: str, published: Iterable[Optional[float]], now: Optional[float] = None) -> float:
+        """Record a successful poll and the publish times of the new items it found; returns the new interval"""
+        now = now or time.time()
+        feed = self._feed(name)
+        published = list(published)
+        cutoff = now - HISTORY_DAYS * 86400
+        recent = [ts for ts in published if ts and cutoff <= ts <= now + MAX_CLOCK_SKEW]
+        undated = [ts for ts in published if not ts]
+        history = sorted(set(ts for ts in feed.get('published', []) if ts >= cutoff) | set(recent))[-HISTORY_ITEMS:]
+        feed['published'] = history
+        feed['last_poll'] = now
+        feed['failures'] = 0
+
+        previous = feed.get('interval')
+        if len(history) >= 2:
+            rate = len(history) / max(now - history[0], 60.0)
+            interval = self.target_items / rate
+            feed['rate_per_day'] = round(rate * 86400, 2)
+        else:
+            feed.pop('rate_per_day', None)
+            if recent or undated:
+                # Fresh items but too few dates for a rate: poll sooner than last time
+                interval = (previous or self.max_interval) / 2
+            else:
+                interval = (previous or self.min_interval) * 2
+        return self._schedule(name, interval, now)
+
+    def seed(self, name: str, published: Iterable[Optional[float]], now: Optional[float] = None):
+        """Merge archived publish times into a source's history without counting it as a poll"""
+        now = now or time.time()
+        feed = self._feed(name)
+        cutoff = now - HISTORY_DAYS * 86400
+        recent = set(ts for ts in published if ts and cutoff <= ts <= now + MAX_CLOCK_SKEW)
+        history = sorted(set(ts for ts in feed.get('published', []) if ts >= cutoff) | recent)[-HISTORY_ITEMS:]
+        feed['published'] = history
+        if len(history) >= 2:
+            feed['rate_per_day'] = round(len(history) / max(now - history[0], 60.0) * 86400, 2)
+
+    def failed(self, name: str, now: Optional[float] = None) -> float:
+        """Back off exponentially from the minimum interval after a poll that produced no answer"""
+        now = now or time.time()
+        feed = self._feed(name)
+        feed['failures'] = feed.get('failures', 0) + 1
+        feed['last_failure'] = now
+        return self._schedule(name, self.min_interval_for(name) * 2 ** (feed['failures'] - 1), now)
+
+    def defer(self, name: str, seconds: float, now: Optional[float] = None):
+        """Push the next poll at least seconds into the future, e.g. while another channel delivers updates"""
+        feed = self._feed(name)
+        feed['next_poll'] = max(feed.get('next_poll') or 0, (now or time.time()) + seconds)
+
+    def polled_since(self, name: str, since: float) -> bool:
+        """True if a poll of the source was recorded since then, answered or failed"""
+        feed = self.state.get(name, {})
+        return max(feed.get('last_poll', 0), feed.get('last_failure', 0)) >= since
+
+    def summary(self) -> Dict[str, Dict]:
+        """Rate and schedule per source, for logs and the CLI"""
+        return {
+            name: {
+                'rate_per_day': feed.get('rate_per_day'),
+                'interval_min': round(feed['interval'] / 60, 1) if feed.get('interval') else None,
+                'next_poll_in_min': round(self.seconds_until(name) / 60, 1),
+                'failures': feed.get('failures', 0),
+            }
+            for name, feed in sorted(self.state.items())
+        }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'fetch_state.json'
+    try:
+        with open(path, 'r') as f:
+            polling = json.load(f).get('polling', {})
+    except FileNotFoundError:
+        polling = {}
+    if not polling:
+        print(f"No polling state in {path}")
+        exit(0)
+    print(f"{'source':<16} {'items/day':>10} {'interval':>10} {'next poll':>10} {'failures':>9}")
+    for name, info in AdaptivePoller(polling).summary().items():
+        rate = f"{info['rate_per_day']:.1f}" if info['rate_per_day'] is not None else '-'
+        interval = f"{info['interval_min']:.0f} min" if info['interval_min'] is not None else '-'
+        print(f"{name:<16} {rate:>10} {interval:>10} {info['next_poll_in_min']:>6.0f} min {info['failures']:>9}")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+LinkedIn post editor helpers shared by the browser posters
+Bulk text insertion script and the text normalization used to verify it
+"""
+
+# Replaces the editor contents in one step. insertText and paste both go through the
+# editor's beforeinput/input handling, unlike assigning innerHTML, so its model stays in sync.
+# Written as a function so Selenium (execute_script) and Playwright (evaluate) can both call it.
+INSERT_TEXT_FUNCTION = """(editor, text, method) => {
+    editor.focus();
+    const selection = window.getSelection();
+    selection.removeAllRanges();
+    const range = document.createRange();
+    range.selectNodeContents(editor);
+    selection.addRange(range);
+    if (method === 'insertText') {
+        document.execCommand('insertText', false, text);
+    } else {
+        const data = new DataTransfer();
+        data.setData('text/plain', text);
+        editor.dispatchEvent(new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true}));
+    }
+}"""
+
+# Editor elements and controls both posters drive; mock_linkedin.py serves the same ones
+FEED_READY_SELECTOR = "div[data-test-id='nav-home']"
+START_POST_SELECTOR = "button[aria-label='Start a post']"
+POST_MODAL_SELECTOR = "div[data-test-id='post-modal']"
+EDITOR_SELECTOR = "div[data-test-id='post-modal'] div[role='textbox']"
+FILE_INPUT_SELECTOR = "div[data-test-id='post-modal'] input[type='file']"
+IMAGE_PREVIEW_SELECTOR = "div[data-test-id='post-modal'] img"
+POST_BUTTON_SELECTOR = "button[data-test-id='post-button']"
+
+
+def normalize_editor_text(text):
+    """Collapse the differences contenteditable introduces (NBSPs, CRLF, trailing spaces, blank-line runs)"""
+    lines = (text or '').replace('\u00a0', ' ').replace('\r\n', '\n').split('\n')
+    normalized = '\n'.join(line.rstrip() for line in lines).strip()
+    while '\n\n\n' in normalized:
+        normalized = normalized.replace('\n\n\n', '\n\n')
+    return normalized
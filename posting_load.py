@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Load harness for the LinkedIn posting backends
+Drives each backend against mock_linkedin.py and reports posts/minute, latency percentiles and retry behavior
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import importlib
+import tempfile
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from benchmark import build_synthetic_image, patched_env
+from mock_linkedin import MOCK_ACCESS_TOKEN, MockLinkedInConfig, MockLinkedInServer
+
+# backend name -> (module, function, accepts an image)
+BACKENDS = {
+    'rest': ('linkedin_api_poster', 'post_to_linkedin_rest_api', True),
+    'linkedin_api': ('linkedin_api_poster', 'post_to_linkedin_api', False),
+    'selenium': ('linkedin_poster', 'post_to_linkedin_selenium', True),
+    'playwright': ('linkedin_playwright_poster', 'post_to_linkedin_playwright', True),
+    # An engine class: one browser shared by every post of the run, posts overlapping on its event loop
+    'playwright_shared': ('linkedin_playwright_poster', 'PlaywrightPostingEngine', True),
+    'chain': ('linkedin_api_poster', 'post_to_linkedin', True),
+}
+# Optional libraries a backend needs beyond its own module
+REQUIRES = {'playwright': 'playwright.async_api', 'playwright_shared': 'playwright.async_api'}
+# Per-post browser backends: one browser is launched up front, so a missing browser is reported as
+# skipped like it is for playwright_shared (whose engine launches it anyway) instead of as failed posts
+BROWSER_PROBES = {'playwright': ('linkedin_playwright_poster', 'PlaywrightPostingEngine')}
+# Requests that try to create a post; more of them than posts means the backend retried
+CREATE_ENDPOINTS = ('ugcPosts', 'web_post')
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def mock_env(server: MockLinkedInServer, workdir: str) -> Dict:
+    """Point every backend at the mock server with credentials it accepts"""
+    return {
+        'LINKEDIN_API_BASE': server.url(),
+        'LINKEDIN_WEB_BASE': server.url(),
+        'LINKEDIN_ACCESS_TOKEN': MOCK_ACCESS_TOKEN,
+        'LINKEDIN_PERSON_ID': None,
+        'LINKEDIN_COOKIE_FILE': os.path.join(workdir, 'linkedin_cookies.json'),
+        'SELENIUM_HEADLESS': '1',
+    }
+
+
+def mock_web_base(module_name: str, url: str):
+    """Point the linkedin_api client at the mock for the backends built on it, until the run ends"""
+    if module_name != 'linkedin_api_poster':
+        return nullcontext()
+    from linkedin_api_poster import web_base
+    return web_base(url)
+
+
+def run_backend(server: MockLinkedInServer, backend: str, posts: int, concurrency: int,
+                image_path: Optional[str] = None) -> Dict:
+    """Publish posts through one backend and summarize what the mock server saw"""
+    module_name, function_name, accepts_image = BACKENDS[backend]
+    try:
+        target = getattr(importlib.import_module(module_name), function_name)
+        if backend in REQUIRES:
+            importlib.import_module(REQUIRES[backend])
+    except ImportError as e:
+        return {'skipped': f"{module_name} unavailable: {e}"}
+
+    server.reset()
+    tag = f"{backend}-{int(time.time() * 1000)}"
+    texts = [f"Load test post {i} from the {backend} backend ({tag}).\n\nWhat do you think?\n\n#AI #Testing"
+             for i in range(posts)]
+
+    def publish(text: str) -> Dict:
+        started = time.perf_counter()
+        try:
+            args = ('mock-user@example.com', 'mock-password', text)
+            ok = bool(post(*args, image_path) if accepts_image and image_path else post(*args))
+            error = None
+        except Exception as e:
+            ok, error = False, str(e)
+        return {'text': text, 'ok': ok, 'latency_s': time.perf_counter() - started, 'error': error}
+
+    with tempfile.TemporaryDirectory(prefix='posting-load-') as workdir:
+        with patched_env(**mock_env(server, workdir)), mock_web_base(module_name, server.url()):
+            try:
+                engine = target(max_concurrency=concurrency) if isinstance(target, type) else None
+                if backend in BROWSER_PROBES:
+                    probe_module, probe_class = BROWSER_PROBES[backend]
+                    getattr(importlib.import_module(probe_module), probe_class)(max_concurrency=1).close()
+            except Exception as e:
+                # e.g. Playwright installed without its browser
+                return {'skipped': f"{backend} could not start: {str(e).splitlines()[0]}"}
+            post = engine.post if engine else target
+            started = time.perf_counter()
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                    outcomes = list(executor.map(publish, texts))
+            finally:
+                if engine:
+                    engine.close()
+            duration = time.perf_counter() - started
+
+    stats = server.stats()
+    published = {entry['text'] for entry in server.posts}
+    confirmed = sum(1 for outcome in outcomes if outcome['text'].strip() in published)
+    reported = sum(1 for outcome in outcomes if outcome['ok'])
+    latencies = [outcome['latency_s'] for outcome in outcomes]
+    attempts = sum(stats['requests'].get(endpoint, 0) for endpoint in CREATE_ENDPOINTS)
+    return {
+        'posts': posts,
+        'concurrency': concurrency,
+        'duration_s': round(duration, 3),
+        'reported_success': reported,
+        'confirmed': confirmed,
+        # Success claimed without the post existing, and posts that exist though the caller saw a failure
+        'false_success': sum(1 for o in outcomes if o['ok'] and o['text'].strip() not in published),
+        'unreported_posts': sum(1 for o in outcomes if not o['ok'] and o['text'].strip() in published),
+        'posts_per_min': round(confirmed / duration * 60, 1) if duration else None,
+        'latency_p50_s': round(percentile(latencies, 50), 4),
+        'latency_p90_s': round(percentile(latencies, 90), 4),
+        'latency_p99_s': round(percentile(latencies, 99), 4),
+        'latency_max_s': round(max(latencies), 4),
+        'create_attempts': attempts,
+        'retries': max(0, attempts - posts),
+        'server': stats,
+        'errors': sorted({outcome['error'] for outcome in outcomes if outcome['error']})[:5],
+    }
+
+
+def print_report(results: Dict):
+    print(f"\n{'backend':<14} {'ok/posts':>9} {'posts/min':>10} {'p50':>8} {'p90':>8} {'p99':>8} "
+          f"{'retries':>8} {'dupes':>6} {'false ok':>9}")
+    for backend, result in results.items():
+        if 'skipped' in result:
+            print(f"{backend:<14} skipped: {result['skipped']}")
+            continue
+        print(f"{backend:<14} {result['confirmed']:>4}/{result['posts']:<4} {result['posts_per_min']:>10} "
+              f"{result['latency_p50_s']:>7.3f}s {result['latency_p90_s']:>7.3f}s {result['latency_p99_s']:>7.3f}s "
+              f"{result['retries']:>8} {result['server']['duplicates']:>6} {result['false_success']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the LinkedIn posting backends against a mock server')
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=['rest'])
+    parser.add_argument('--posts', type=int, default=50, help='Posts per backend')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every mock response')
+    parser.add_argument('--jitter', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of write requests failed on purpose')
+    parser.add_argument('--error-statuses', type=int, nargs='+', default=[429, 503])
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--challenge-rate', type=float, default=0.0)
+    parser.add_argument('--lost-response-rate', type=float, default=0.0)
+    parser.add_argument('--image', action='store_true', help='Attach a generated PNG to every post')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write the results as JSON')
+    args = parser.parse_args()
+
+    from logging_config import configure_logging
+    # Backends log every failure; the report is the output unless LOG_LEVEL asks for more
+    configure_logging(level=os.getenv('LOG_LEVEL', 'CRITICAL'))
+
+    config = MockLinkedInConfig(args.latency, args.jitter, args.error_rate, tuple(args.error_statuses),
+                                args.retry_after, args.challenge_rate, args.lost_response_rate, args.seed)
+    server = MockLinkedInServer(config=config).start()
+    image_path = None
+    results = {}
+    try:
+        if args.image:
+            image_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+            image_file.write(build_synthetic_image(1, 1200, 627))
+            image_file.close()
+            image_path = image_file.name
+        for backend in args.backends:
+            print(f"📮 {backend}: {args.posts} posts, concurrency {args.concurrency}...")
+            results[backend] = run_backend(server, backend, args.posts, args.concurrency, image_path)
+    finally:
+        server.stop()
+        if image_path:
+            os.remove(image_path)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Profiling hooks for AI News Automation
+Wraps a run with cProfile and tracemalloc and records per-stage allocations
+"""
+
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from logging_config import log_stage
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = 'AI_NEWS_PROFILE'
+PROFILE_DIR_ENV_VAR = 'AI_NEWS_PROFILE_DIR'
+DEFAULT_PROFILE_DIR = 'profiles'
+
+_active_profiler = None
+
+
+def profiling_requested(flag: bool = False) -> bool:
+    """True when --profile was passed or the CI environment toggle is set"""
+    return flag or os.getenv(PROFILE_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class RunProfiler:
+    """Collects a cProfile trace plus tracemalloc statistics for each pipeline stage"""
+
+    def __init__(self, output_dir: Optional[str] = None, top_allocations: int = 10):
+        self.output_dir = output_dir or os.getenv(PROFILE_DIR_ENV_VAR, DEFAULT_PROFILE_DIR)
+        self.top_allocations = top_allocations
+        self.run_name = datetime.now().strftime('run-%Y%m%d-%H%M%S')
+        self.stages: List[Dict] = []
+        self._stack: List[list] = []
+        self.peak_bytes = 0
+        self._profiler = cProfile.Profile()
+        self._started_at = None
+        self._thread_id = None
+
+    def start(self):
+        # cProfile and the stage stack only follow the thread that started the run
+        self._thread_id = threading.get_ident()
+        tracemalloc.start(10)
+        self._started_at = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self) -> Dict[str, str]:
+        self._profiler.disable()
+        elapsed = time.perf_counter() - self._started_at
+        current, _ = tracemalloc.get_traced_memory()
+        self._fold_peak()
+        tracemalloc.stop()
+        return self._write_artifacts(elapsed, current)
+
+    def _fold_peak(self):
+        # tracemalloc has a single peak counter, so fold it into every open stage before resetting
+        _, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(self.peak_bytes, peak)
+        for entry in self._stack:
+            entry[1] = max(entry[1], peak)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record wall time, net allocations and peak memory for one stage"""
+        # Keep snapshot bookkeeping out of the CPU profile
+        self._profiler.disable()
+        self._fold_peak()
+        tracemalloc.reset_peak()
+        entry = [name, 0]
+        self._stack.append(entry)
+        path = '/'.join(item[0] for item in self._stack)
+        before = tracemalloc.take_snapshot()
+        current_before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._profiler.disable()
+            current_after, _ = tracemalloc.get_traced_memory()
+            self._fold_peak()
+            after = tracemalloc.take_snapshot()
+            top = after.compare_to(before, 'lineno')[:self.top_allocations]
+            self.stages.append({
+                'stage': path,
+                'seconds': round(elapsed, 6),
+                'net_allocated_bytes': current_after - current_before,
+                'peak_bytes': entry[1],
+                'top_allocations': [
+                    {
+                        'location': str(stat.traceback[0]),
+                        'size_diff_bytes': stat.size_diff,
+                        'count_diff': stat.count_diff,
+                    }
+                    for stat in top
+                ],
+            })
+            self._stack.pop()
+            self._profiler.enable()
+
+    def _write_artifacts(self, elapsed: float, current: int) -> Dict[str, str]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, self.run_name)
+        paths = {
+            'pstats': f"{base}.pstats",
+            'report': f"{base}-cpu.txt",
+            'memory': f"{base}-memory.json",
+        }
+
+        self._profiler.dump_stats(paths['pstats'])
+
+        report = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=report)
+        stats.sort_stats('cumulative').print_stats(40)
+        stats.sort_stats('tottime').print_stats(20)
+        with open(paths['report'], 'w') as f:
+            f.write(report.getvalue())
+
+        with open(paths['memory'], 'w') as f:
+            json.dump({
+                'run': self.run_name,
+                'total_seconds': round(elapsed, 6),
+                'peak_bytes': self.peak_bytes,
+                'final_traced_bytes': current,
+                'stages': self.stages,
+            }, f, indent=2)
+
+        return paths
+
+
+@contextmanager
+def stage(name: str):
+    """Mark a pipeline stage for log records, and for the profiler when a profiled run is active
+
+    Stages entered from worker threads are only tagged in the logs.
+    """
+    with log_stage(name):
+        if _active_profiler is None or _active_profiler._thread_id != threading.get_ident():
+            yield
+            return
+        with _active_profiler.stage(name):
+            yield
+
+
+def run_profiled(func: Callable, output_dir: Optional[str] = None):
+    """Run func under cProfile and tracemalloc and write the artifacts"""
+    global _active_profiler
+
+    profiler = RunProfiler(output_dir)
+    _active_profiler = profiler
+    profiler.start()
+    try:
+        return func()
+    finally:
+        _active_profiler = None
+        paths = profiler.stop()
+        peak_mb = profiler.peak_bytes / (1024 * 1024)
+        logger.info(f"Profile written to {paths['pstats']} (peak memory {peak_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Print the hottest functions from a saved profile
+    if len(sys.argv) < 2:
+        print("Usage: python profiling.py profiles/run-YYYYmmdd-HHMMSS.pstats [limit]")
+        exit(1)
+
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    pstats.Stats(sys.argv[1]).sort_stats('cumulative').print_stats(limit)
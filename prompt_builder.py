@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Prompt construction for AI News Automation
+Assembles the post-generation prompt under an input-token budget and sizes the completion
+"""
+
+import re
+import math
+from typing import Dict, List, Tuple
+
+from article import Article
+
+DEFAULT_INPUT_BUDGET = 500
+DEFAULT_TARGET_WORDS = 300
+TOKENS_PER_WORD = 1.3
+# Room for the section labels and the hashtag line the post must end with
+TAIL_TOKENS = 40
+DESCRIPTION_MAX_TOKENS = 100
+
+TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+INSTRUCTIONS = """Write a LinkedIn post about this AI news, in first person, as a professional who helps companies adopt AI.
+- Conversational, storytelling tone; natural, not automated
+- Business value and practical applications, at most {words} words in total
+- Do not include the URL; it is added for you
+- Answer in exactly these labelled sections, one paragraph each, and nothing else:
+HOOK: one attention-grabbing opening sentence
+SUMMARY: what happened, in two or three sentences
+INSIGHT: why it matters for businesses
+QUESTION: an engaging question for readers
+HASHTAGS: five or six relevant hashtags"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough subword token count: one per word or symbol, plus one per extra 6 characters of long words"""
+    if not text:
+        return 0
+    return sum(1 + max(0, len(piece) - 6) // 6 for piece in TOKEN_PIECES.findall(text))
+
+
+def completion_tokens(target_words: int = DEFAULT_TARGET_WORDS) -> int:
+    """max_tokens for a post of target_words plus its URL and hashtags"""
+    return math.ceil(target_words * TOKENS_PER_WORD) + TAIL_TOKENS
+
+
+def _trim_to_budget(text: str, budget: int) -> str:
+    """Longest prefix of whole paragraphs, then whole sentences, that fits the budget"""
+    if budget <= 0:
+        return ''
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept: List[str] = []
+    used = 0
+    for paragraph in text.split('\n\n'):
+        cost = estimate_tokens(paragraph) + 1
+        if used + cost <= budget:
+            kept.append(paragraph)
+            used += cost
+            continue
+        sentences = []
+        for sentence in SENTENCE_END.split(paragraph):
+            cost = estimate_tokens(sentence) + 1
+            if used + cost > budget:
+                break
+            sentences.append(sentence)
+            used += cost
+        if sentences:
+            kept.append(' '.join(sentences))
+        elif not kept:
+            # A single overlong first sentence: fall back to whole words
+            words = []
+            for word in paragraph.split():
+                used += estimate_tokens(word)
+                if used > budget:
+                    break
+                words.append(word)
+            kept.append(' '.join(words) + '...')
+        break
+    return '\n\n'.join(kept)
+
+
+def build_post_prompt(article: Article, input_budget: int = DEFAULT_INPUT_BUDGET,
+                      target_words: int = DEFAULT_TARGET_WORDS) -> Tuple[str, Dict]:
+    """Prompt for one article within input_budget tokens
+
+    Instructions and title are always kept. The remaining budget goes to the
+    description (capped at DESCRIPTION_MAX_TOKENS), then the full-text excerpt,
+    so the excerpt's tail is always the first context to be cut.
+    """
+    instructions = INSTRUCTIONS.format(words=target_words)
+    header = f"Title: {article.title}\nSource: {article.source}\nURL: {article.url}"
+    remaining = input_budget - estimate_tokens(instructions) - estimate_tokens(header) - 8
+
+    description = _trim_to_budget(article.description, min(remaining, DESCRIPTION_MAX_TOKENS))
+    remaining -= estimate_tokens(description)
+    excerpt = _trim_to_budget(article.full_text, remaining - 4) if article.full_text else ''
+
+    sections = [instructions, header]
+    if description:
+        sections.append(f"Summary: {description}")
+    if excerpt:
+        sections.append(f"Article excerpt:\n{excerpt}")
+    prompt = '\n\n'.join(sections)
+
+    stats = {
+        'input_tokens': estimate_tokens(prompt),
+        'input_budget': input_budget,
+        'max_tokens': completion_tokens(target_words),
+        'excerpt_chars': len(excerpt),
+        'excerpt_trimmed': len(excerpt) < len(article.full_text),
+        'description_trimmed': len(description) < len(article.description),
+    }
+    return prompt, stats
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Seen-article filter for AI News Automation
+Time-partitioned, memory-mapped Bloom filters in front of the article warehouse
+"""
+
+import os
+import re
+import math
+import mmap
+import time
+import struct
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILTER_DIR = os.path.join('cache', 'seen_filter')
+DEFAULT_PARTITION_DAYS = 7
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.001
+
+MAGIC = b'AINBLM1\0'
+HEADER = struct.Struct('<8sQQQ')  # magic, bit count, hash count, items added
+HEADER_SIZE = HEADER.size
+PARTITION_FILE = re.compile(r'^(\d+)\.bloom$')
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """Bit and hash counts for a Bloom filter holding capacity keys at error_rate"""
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomPartition:
+    """One memory-mapped Bloom filter file covering a fixed time window"""
+
+    def __init__(self, path: str, bits: int, hashes: int):
+        self.path = path
+        exists = os.path.exists(path)
+        self.file = open(path, 'r+b' if exists else 'w+b')
+        if not exists:
+            self.file.write(HEADER.pack(MAGIC, bits, hashes, 0))
+            self.file.truncate(HEADER.size + bits // 8)
+            self.file.flush()
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        magic, self.bits, self.hashes, self.count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or len(self.map) != HEADER.size + self.bits // 8:
+            self.close()
+            raise ValueError(f"Corrupt Bloom filter partition {path}")
+
+    def add(self, positions: List[int]):
+        data = self.map
+        for position in positions:
+            index = HEADER_SIZE + (position >> 3)
+            data[index] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains(self, positions: List[int]) -> bool:
+        data = self.map
+        for position in positions:
+            if not data[HEADER_SIZE + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def flush(self):
+        HEADER.pack_into(self.map, 0, MAGIC, self.bits, self.hashes, self.count)
+        self.map.flush()
+
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+
+class SeenFilter:
+    """Probabilistic set of article fingerprints seen in recent runs
+
+    Keys go into the partition for the current time window; lookups check every
+    live partition without touching disk beyond the mapped pages. A negative answer
+    is exact, a positive one should be confirmed against the warehouse. Partitions
+    older than retention_days are deleted, so memory and disk stay bounded.
+    """
+
+    def __init__(self, directory: str = DEFAULT_FILTER_DIR, partition_days: float = DEFAULT_PARTITION_DAYS,
+                 retention_days: float = DEFAULT_RETENTION_DAYS, capacity: int = DEFAULT_CAPACITY,
+                 error_rate: float = DEFAULT_ERROR_RATE):
+        self.directory = directory
+        self.partition_seconds = partition_days * 86400
+        self.retention_partitions = max(1, math.ceil(retention_days / partition_days))
+        self.bits, self.hashes = bloom_parameters(capacity, error_rate)
+        self.partitions: Dict[int, BloomPartition] = {}
+        os.makedirs(directory, exist_ok=True)
+        self.prune()
+
+    def _current_index(self) -> int:
+        return int(time.time() // self.partition_seconds)
+
+    def _positions(self, key: str) -> List[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest(), 'little')
+        h1, h2, bits = digest >> 64, (digest & 0xFFFFFFFFFFFFFFFF) | 1, self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def _partition(self, index: int) -> BloomPartition:
+        partition = self.partitions.get(index)
+        if partition is None:
+            partition = BloomPartition(os.path.join(self.directory, f"{index}.bloom"), self.bits, self.hashes)
+            if (partition.bits, partition.hashes) != (self.bits, self.hashes):
+                # Sized under different settings; positions would not line up
+                partition.close()
+                os.remove(partition.path)
+                partition = BloomPartition(partition.path, self.bits, self.hashes)
+            self.partitions[index] = partition
+        return partition
+
+    def _live_indexes(self) -> List[int]:
+        indexes = []
+        for name in os.listdir(self.directory):
+            match = PARTITION_FILE.match(name)
+            if match:
+                indexes.append(int(match.group(1)))
+        return sorted(indexes, reverse=True)
+
+    def add_many(self, keys: Iterable[str], timestamps: Optional[Sequence[float]] = None) -> int:
+        """Record keys in the current partition, or in the partition covering each key's timestamp"""
+        current = self._current_index()
+        if timestamps is None:
+            groups = {current: keys}
+        else:
+            # Backfilled keys age out with their own time window; ones already past retention are skipped
+            oldest = current - self.retention_partitions + 1
+            groups: Dict[int, List[str]] = {}
+            for key, timestamp in zip(keys, timestamps):
+                index = min(current, int(timestamp // self.partition_seconds))
+                if index >= oldest:
+                    groups.setdefault(index, []).append(key)
+        added = 0
+        for index, group in groups.items():
+            partition = self._partition(index)
+            if index not in self.live:
+                self.live = sorted(self.live + [index], reverse=True)
+            for key in group:
+                if key:
+                    partition.add(self._positions(key))
+                    added += 1
+            partition.flush()
+        return added
+
+    def add(self, key: str):
+        self.add_many([key])
+
+    def __contains__(self, key: str) -> bool:
+        if not key:
+            return False
+        positions = self._positions(key)
+        for index in list(self.live):
+            try:
+                if self._partition(index).contains(positions):
+                    return True
+            except ValueError as e:
+                logger.warning(f"{e}; removing it")
+                self.live.remove(index)
+                os.remove(os.path.join(self.directory, f"{index}.bloom"))
+        return False
+
+    def prune(self) -> int:
+        """Delete partitions that fell out of the retention window"""
+        oldest = self._current_index() - self.retention_partitions + 1
+        removed = 0
+        for index in self._live_indexes():
+            if index < oldest:
+                partition = self.partitions.pop(index, None)
+                if partition:
+                    partition.close()
+                os.remove(os.path.join(self.directory, f"{index}.bloom"))
+                removed += 1
+        self.live = self._live_indexes()
+        return removed
+
+    def close(self):
+        for partition in self.partitions.values():
+            partition.close()
+        self.partitions.clear()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Warm-state snapshots for AI News Automation
+Packs every persistent file into one versioned, checksummed archive and restores it at startup
+"""
+
+import os
+import io
+import json
+import time
+import shutil
+import sqlite3
+import tarfile
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ENV_VAR = 'STATE_SNAPSHOT'
+SESSIONS_ENV_VAR = 'SNAPSHOT_INCLUDE_SESSIONS'
+MANIFEST_NAME = 'manifest.json'
+COMPRESS_LEVEL = 6
+
+# Everything a run reads back on the next run: history, watermarks, journal, warehouse, caches
+DEFAULT_STATE_PATHS = (
+    'posted_articles.json',
+    'fetch_state.json',
+    'run_journal.jsonl',
+    'articles.db',
+    'cache',
+)
+# Live LinkedIn logins; anyone who can read the snapshot can use them, so they are opt-in
+SESSION_PATHS = ('sessions',)
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+SKIP_SUFFIXES = ('.tmp', '-wal', '-shm', '-journal')
+
+
+def state_paths(include_sessions: Optional[bool] = None) -> Tuple[str, ...]:
+    """State paths to snapshot; sessions only when asked for (SNAPSHOT_INCLUDE_SESSIONS=1)"""
+    if include_sessions is None:
+        include_sessions = os.getenv(SESSIONS_ENV_VAR, '0').lower() in ('1', 'true', 'yes')
+    return DEFAULT_STATE_PATHS + SESSION_PATHS if include_sessions else DEFAULT_STATE_PATHS
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _collect_files(paths: Iterable[str]) -> List[str]:
+    """Expand state paths into the files they contain, skipping temporary and SQLite side files"""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    files.append(os.path.join(root, name))
+    return [os.path.normpath(f) for f in files if not f.endswith(SKIP_SUFFIXES)]
+
+
+def _sqlite_copy(path: str, target: str):
+    """Consistent copy of a live SQLite database (including un-checkpointed WAL pages)"""
+    source = sqlite3.connect(path)
+    try:
+        destination = sqlite3.connect(target)
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+    finally:
+        source.close()
+
+
+def create_snapshot(snapshot_path: str, paths: Optional[Iterable[str]] = None) -> Optional[Dict]:
+    """Write all state files to a compressed tarball with a manifest of sizes and SHA-256 digests"""
+    started = time.perf_counter()
+    files = _collect_files(state_paths() if paths is None else paths)
+    if not files:
+        logger.info("No state files to snapshot")
+        return None
+
+    snapshot_dir = os.path.dirname(os.path.abspath(snapshot_path))
+    os.makedirs(snapshot_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix='snapshot-', dir=snapshot_dir)
+    tmp_path = f"{snapshot_path}.tmp"
+    try:
+        # Databases are copied through the backup API first so the archive never holds a torn page
+        sources = {}
+        for path in files:
+            if path.endswith(SQLITE_SUFFIXES):
+                copy_path = os.path.join(staging_dir, hashlib.sha1(path.encode('utf-8')).hexdigest())
+                _sqlite_copy(path, copy_path)
+                sources[path] = copy_path
+            else:
+                sources[path] = path
+
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'created_at': time.time(),
+            'files': {
+                path.replace(os.sep, '/'): {'size': os.path.getsize(source), 'sha256': _sha256_file(source)}
+                for path, source in sources.items()
+            },
+        }
+
+        with tarfile.open(tmp_path, 'w:gz', compresslevel=COMPRESS_LEVEL) as tar:
+            manifest_bytes = json.dumps(manifest, indent=2).encode('utf-8')
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(manifest_bytes)
+            info.mtime = int(manifest['created_at'])
+            tar.addfile(info, io.BytesIO(manifest_bytes))
+            for path, source in sources.items():
+                tar.add(source, arcname=path.replace(os.sep, '/'), recursive=False)
+        os.replace(tmp_path, snapshot_path)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"Snapshot of {len(files)} files written to {snapshot_path} "
+                f"({os.path.getsize(snapshot_path)} bytes, {time.perf_counter() - started:.2f}s)")
+    return manifest
+
+
+def _safe_member_path(name: str, target_dir: str) -> str:
+    target_root = os.path.abspath(target_dir)
+    destination = os.path.abspath(os.path.join(target_root, name))
+    if os.path.commonpath([target_root, destination]) != target_root:
+        raise ValueError(f"Snapshot member escapes target directory: {name}")
+    return destination
+
+
+def restore_snapshot(snapshot_path: str, target_dir: str = '.') -> bool:
+    """Restore state files from a snapshot; nothing is replaced unless every checksum matches"""
+    if not os.path.exists(snapshot_path):
+        logger.info(f"No snapshot at {snapshot_path}, starting cold")
+        return False
+
+    started = time.perf_counter()
+    staged = {}
+    try:
+        with tarfile.open(snapshot_path, 'r:gz') as tar:
+            manifest_file = tar.extractfile(MANIFEST_NAME)
+            if manifest_file is None:
+                raise ValueError("missing manifest")
+            manifest = json.load(manifest_file)
+            if manifest.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version {manifest.get('version')}")
+
+            for member in tar:
+                if member.name == MANIFEST_NAME:
+                    continue
+                expected = manifest['files'].get(member.name)
+                if expected is None or not member.isfile():
+                    raise ValueError(f"unexpected member {member.name}")
+
+                destination = _safe_member_path(member.name, target_dir)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                staged_path = f"{destination}.restore"
+                staged[destination] = staged_path
+
+                digest = hashlib.sha256()
+                source = tar.extractfile(member)
+                with open(staged_path, 'wb') as out:
+                    for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                        out.write(chunk)
+                if digest.hexdigest() != expected['sha256']:
+                    raise ValueError(f"checksum mismatch for {member.name}")
+
+            missing = set(manifest['files']) - {
+                os.path.relpath(path, os.path.abspath(target_dir)).replace(os.sep, '/') for path in staged
+            }
+            if missing:
+                raise ValueError(f"members missing from archive: {sorted(missing)}")
+    except Exception as e:
+        logger.error(f"Ignoring snapshot {snapshot_path}: {e}")
+        for staged_path in staged.values():
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+        return False
+
+    for destination, staged_path in staged.items():
+        if destination.endswith(SQLITE_SUFFIXES):
+            # A leftover WAL from an older database would be replayed onto the restored one
+            for side_file in (f"{destination}-wal", f"{destination}-shm"):
+                if os.path.exists(side_file):
+                    os.remove(side_file)
+        os.replace(staged_path, destination)
+
+    age_hours = (time.time() - manifest['created_at']) / 3600
+    logger.info(f"Restored {len(staged)} state files from {snapshot_path} "
+                f"(taken {age_hours:.1f}h ago) in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return True
+
+
+def inspect_snapshot(snapshot_path: str) -> Dict:
+    """Manifest of a snapshot without extracting it"""
+    with tarfile.open(snapshot_path, 'r:gz') as tar:
+        return json.load(tar.extractfile(MANIFEST_NAME))
+
+
+if __name__ == "__main__":
+    import argparse
+    from logging_config import configure_logging
+
+    configure_logging()
+    parser = argparse.ArgumentParser(description='Snapshot or restore the automation state')
+    parser.add_argument('command', choices=['create', 'restore', 'inspect'])
+    parser.add_argument('snapshot', nargs='?', default=os.getenv(SNAPSHOT_ENV_VAR, 'state/ai-news-state.tar.gz'))
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='State file or directory to include (repeatable; defaults to all known state)')
+    parser.add_argument('--include-sessions', action='store_true',
+                        help='Also snapshot the saved LinkedIn sessions (default: SNAPSHOT_INCLUDE_SESSIONS)')
+    args = parser.parse_args()
+
+    if args.command == 'create':
+        paths = args.paths or state_paths(True if args.include_sessions else None)
+        ok = create_snapshot(args.snapshot, paths) is not None
+    elif args.command == 'restore':
+        ok = restore_snapshot(args.snapshot)
+    else:
+        manifest = inspect_snapshot(args.snapshot)
+        for name, entry in manifest['files'].items():
+            print(f"{entry['size']:>12}  {entry['sha256'][:12]}  {name}")
+        print(f"\nversion {manifest['version']}, created {time.ctime(manifest['created_at'])}")
+        ok = True
+    exit(0 if ok else 1)
@@ -0,0 +1,30 @@
+"""
+Shared pytest setup: modules are imported from the repository root
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# main.py configures logging at import; keep the test run's log out of the working tree
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.gettempdir(), 'ai_news_automation_tests.log'))
+
+
+@pytest.fixture
+def bot(tmp_path):
+    """AINewsAutomation without __init__: empty fetch state saved under tmp_path, no clients or stores"""
+    from main import AINewsAutomation
+    from polling import AdaptivePoller
+
+    instance = AINewsAutomation.__new__(AINewsAutomation)
+    instance.fetch_state = {}
+    instance.fetch_state_file = str(tmp_path / 'fetch_state.json')
+    instance.fetch_state_lock = threading.Lock()
+    instance.fetch_cancelled = threading.Event()
+    instance.poller = AdaptivePoller(instance.fetch_state.setdefault('polling', {}))
+    instance.websub = None
+    return instance
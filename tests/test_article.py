@@ -0,0 +1,42 @@
+from article import Article, clean_text, normalize_url, parse_published, url_fingerprint
+
+
+def test_normalize_url_drops_tracking_and_fragment():
+    assert normalize_url(' HTTPS://Example.COM/a/b/?utm_source=x&id=3&fbclid=y#top ') == 'https://example.com/a/b?id=3'
+    assert normalize_url('https://example.com') == 'https://example.com/'
+
+
+def test_fingerprint_is_stable_across_url_variants():
+    assert url_fingerprint('https://example.com/a/') == url_fingerprint('https://EXAMPLE.com/a?utm_medium=rss')
+    assert url_fingerprint('https://example.com/a') != url_fingerprint('https://example.com/b')
+
+
+def test_parse_published_formats():
+    assert parse_published('2024-01-02T03:04:05Z') == 1704164645.0
+    assert parse_published('Tue, 02 Jan 2024 03:04:05 +0000') == 1704164645.0
+    assert parse_published('yesterday') is None
+    assert parse_published('') is None
+
+
+def test_clean_text_strips_markup():
+    assert clean_text('<p>Fish &amp; <b>chips</b></p>\n\n  now') == 'Fish & chips now'
+    assert clean_text(None) == ''
+
+
+def test_article_normalizes_once():
+    article = Article('<b>AI</b> news', 'A &lt;great&gt; story', ' https://example.com/x ', 'Feed',
+                      'Tue, 02 Jan 2024 03:04:05 +0000', 'A &lt;great&gt; story')
+    assert article.title == 'AI news'
+    assert article.content is article.description
+    assert article.url == 'https://example.com/x'
+    assert article.published_ts == 1704164645.0
+    assert article.search_text == 'ai news\na <great> story\n'
+
+
+def test_dict_round_trip_keeps_full_text():
+    article = Article('Title', 'Description', 'https://example.com/x', 'Feed', content='Body')
+    article.full_text = 'Full body'
+    copy = Article.from_dict(article.to_dict())
+    assert copy.to_dict() == article.to_dict()
+    assert copy.get('full_text') == 'Full body'
+    assert copy.get('missing', 'default') == 'default'
@@ -0,0 +1,99 @@
+import time
+
+from article import Article
+from article_store import ArticleStore
+from deadline import RunDeadline
+from journal import RunJournal
+
+
+def article(n, title='OpenAI ships a new model', source='TechCrunch'):
+    return Article(title, f"Story number {n}", f"https://example.com/story/{n}", source)
+
+
+def make_store(tmp_path):
+    return ArticleStore(str(tmp_path / 'articles.db'))
+
+
+def test_add_is_idempotent_per_fingerprint(tmp_path):
+    store = make_store(tmp_path)
+    assert store.add_articles([article(1), article(2)]) == 2
+    # Same URL with tracking parameters is the same article
+    duplicate = Article('Other title', '', 'https://EXAMPLE.com/story/1?utm_source=x', 'NewsAPI')
+    assert store.add_articles([duplicate, article(3)]) == 1
+    assert store.stats()['articles'] == 3
+
+
+def test_known_returns_stored_subset(tmp_path):
+    store = make_store(tmp_path)
+    stored = [article(n) for n in range(3)]
+    store.add_articles(stored)
+    assert store.known([stored[0].fingerprint, 'missing']) == {stored[0].fingerprint}
+
+
+def test_posted_articles_leave_the_backlog(tmp_path):
+    store = make_store(tmp_path)
+    store.add_articles([article(1), article(2)])
+    store.mark_posted('https://example.com/story/1/')
+    assert [a.url for a in store.backlog()] == ['https://example.com/story/2']
+
+
+def test_search_matches_stemmed_words(tmp_path):
+    store = make_store(tmp_path)
+    store.add_articles([article(1, 'Robots are learning to walk'), article(2, 'Quarterly earnings report')])
+    results = store.search('learn')
+    assert [r['url'] for r in results] == ['https://example.com/story/1']
+
+
+def test_prune_keeps_posted_and_recent(tmp_path):
+    store = make_store(tmp_path)
+    store.add_articles([article(n) for n in range(5)])
+    store.mark_posted('https://example.com/story/0')
+    old = time.time() - 100 * 86400
+    store.conn.execute('UPDATE articles SET last_seen_at = ?, fetched_at = ? WHERE fingerprint != ?',
+                       (old, old, article(4).fingerprint))
+    store.conn.commit()
+    assert store.prune(retention_days=90) == 3
+    assert store.stats()['articles'] == 2
+
+
+def test_import_keeps_the_search_index_in_step(tmp_path):
+    store = make_store(tmp_path)
+    store.add_articles([article(1, 'Robots are learning to walk')])
+    old = time.time() - 30 * 86400
+    imported = [(article(n, f"Archived robot story {n}"), old) for n in range(1, 5)]
+    # Story 1 is already stored and stays as it was
+    assert store.import_articles(imported) == 3
+    assert store.import_articles(imported) == 0
+    store.conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('integrity-check')")
+    assert len(store.search('robot')) == 4
+    assert store.search('archived')[0]['url'] != 'https://example.com/story/1'
+
+    # The per-row trigger is back after the import
+    store.add_articles([article(9, 'Robot vacuum review')])
+    assert len(store.search('robot')) == 5
+
+
+def test_imported_articles_stay_out_of_the_backlog(tmp_path):
+    store = make_store(tmp_path)
+    store.import_articles([(article(1), time.time() - 30 * 86400)])
+    assert store.backlog() == []
+    assert store.prune(retention_days=7) == 1
+
+
+def test_retention_runs_once_per_run_not_per_batch(bot, tmp_path, monkeypatch):
+    bot.article_store = make_store(tmp_path)
+    bot.pipeline_mode = 'stream'
+    bot.deadline = RunDeadline(None)
+    bot.backlog_max_age_days = 7
+    prunes = []
+    monkeypatch.setattr(bot.article_store, 'prune', lambda *args: prunes.append(args) or 0)
+
+    def stream():
+        for n in range(3):
+            bot.store_articles([article(n)])
+        return [article(n) for n in range(5)]
+
+    bot.stream_ai_news = stream
+    bot._gather_candidates(RunJournal(str(tmp_path / 'run_journal.jsonl')))
+    assert len(prunes) == 1
+    assert bot.article_store.stats()['articles'] == 3
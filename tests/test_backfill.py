@@ -0,0 +1,99 @@
+import gzip
+import json
+import time
+from email.utils import formatdate
+
+from article_store import ArticleStore
+from backfill import Backfill, archive_files, parse_archive
+from polling import AdaptivePoller
+
+KEYWORDS = ['ai']
+
+
+def rss(items, title='TechCrunch'):
+    body = ''.join(
+        f"<item><title>{name}</title><link>https://example.com/{slug}</link>"
+        f"<description>{name}</description><pubDate>{formatdate(ts)}</pubDate></item>"
+        for slug, name, ts in items
+    )
+    return f"<rss><channel><title>{title}</title>{body}</channel></rss>"
+
+
+ATOM = """<feed xmlns="http://www.w3.org/2005/Atom"><title>Lab blog</title>
+<entry><title>AI entry</title><link rel="alternate" href="https://example.com/entry"/>
+<summary>Summary of the AI entry</summary><published>2026-01-02T03:04:05Z</published></entry>
+</feed>"""
+
+
+def newsapi(items):
+    return {'status': 'ok', 'articles': [
+        {'title': name, 'description': name, 'url': f"https://example.com/{slug}", 'source': {'name': 'Wire'},
+         'publishedAt': '2026-01-01T00:00:00Z'}
+        for slug, name in items
+    ]}
+
+
+def test_archive_files_filters_by_suffix(tmp_path):
+    (tmp_path / 'feeds').mkdir()
+    for name in ('a.xml', 'b.rss.gz', 'c.jsonl', 'notes.txt', 'd.json.gz'):
+        (tmp_path / 'feeds' / name).write_bytes(b'')
+    (tmp_path / 'single.atom').write_bytes(b'')
+    found = archive_files([str(tmp_path / 'feeds'), str(tmp_path / 'single.atom'), str(tmp_path / 'missing')])
+    assert [path.rsplit('/', 1)[-1] for path in found] == ['a.xml', 'b.rss.gz', 'c.jsonl', 'd.json.gz', 'single.atom']
+
+
+def test_parse_rss_keeps_ai_items(tmp_path):
+    path = tmp_path / 'feed.xml'
+    path.write_text(rss([('one', 'AI model ships', 1700000000), ('two', 'Garden tips', 1700000100),
+                         ('three', '', 1700000200)]))
+    result = parse_archive(str(path), KEYWORDS)
+    assert [article.title for article, _ in result['articles']] == ['AI model ships']
+    assert result['articles'][0][1] == 1700000000
+    assert result['items'] == 3 and result['dropped'] == 2
+    assert result['published'] == {'TechCrunch': [1700000000, 1700000100, 1700000200]}
+
+
+def test_parse_atom_and_gzip(tmp_path):
+    path = tmp_path / 'blog.atom.gz'
+    path.write_bytes(gzip.compress(ATOM.encode('utf-8')))
+    result = parse_archive(str(path), KEYWORDS)
+    (article, _), = result['articles']
+    assert (article.title, article.url, article.source) == ('AI entry', 'https://example.com/entry', 'Lab blog')
+    assert result['error'] is None
+
+
+def test_parse_newsapi_exports(tmp_path):
+    json_path = tmp_path / 'export.json'
+    json_path.write_text(json.dumps([newsapi([('a', 'AI one')]), newsapi([('b', '[Removed]')])]))
+    lines_path = tmp_path / 'export.jsonl'
+    lines_path.write_text(json.dumps(newsapi([('c', 'AI two')])['articles'][0]) + '\n\n')
+    assert [a.title for a, _ in parse_archive(str(json_path))['articles']] == ['AI one']
+    assert [a.source for a, _ in parse_archive(str(lines_path))['articles']] == ['Wire']
+    assert set(parse_archive(str(json_path))['published']) == {'NewsAPI'}
+
+
+def test_truncated_archive_keeps_what_was_read(tmp_path):
+    path = tmp_path / 'feed.xml'
+    document = rss([('one', 'AI first', 1700000000), ('two', 'AI second', 1700000100)])
+    path.write_text(document[:document.index('AI second')])
+    result = parse_archive(str(path), KEYWORDS)
+    assert result['error'] and [a.title for a, _ in result['articles']] == ['AI first']
+
+
+def test_backfill_deduplicates_across_files(tmp_path):
+    now = time.time()
+    archive = tmp_path / 'archive'
+    archive.mkdir()
+    (archive / 'a.xml').write_text(rss([('one', 'AI one', now - 3600), ('two', 'AI two', now - 7200)]))
+    (archive / 'b.xml').write_text(rss([('two', 'AI two again', now - 7200), ('old', 'AI old', now - 90 * 86400)]))
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    poller = AdaptivePoller({})
+    backfill = Backfill(store, poller, poll_sources=['TechCrunch'], keywords=KEYWORDS, workers=1,
+                        batch_size=2, retention_days=30)
+
+    summary = backfill.run([str(archive)])
+    assert summary['files'] == 2 and summary['items'] == 4
+    assert summary['duplicates'] == 1 and summary['expired'] == 1
+    assert summary['inserted'] == 2
+    assert store.stats()['articles'] == 2
+    assert len(poller.state['TechCrunch']['published']) == 2
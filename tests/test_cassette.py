@@ -0,0 +1,102 @@
+import os
+import sys
+from datetime import timedelta
+
+import pytest
+import requests
+
+import main
+from cassette import Cassette, find_secret, redact_url
+
+
+def exchange(url, body=b'{}', status=200, headers=None, method='GET'):
+    request = requests.Request(method, url).prepare()
+    response = requests.Response()
+    response.status_code = status
+    response.reason = 'OK'
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response._content = body
+    response.elapsed = timedelta(milliseconds=5)
+    return request, response
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in list(os.environ):
+        if name.endswith(('PASSWORD', 'SECRET', 'TOKEN', 'API_KEY')):
+            monkeypatch.delenv(name)
+    return tmp_path
+
+
+def record(path, exchanges):
+    cassette = Cassette(str(path), 'record')
+    cassette.meta = {'version': 1, 'recorded_at': 0, 'seed': 1}
+    for request, response in exchanges:
+        cassette._record(request, response)
+    cassette.stop()
+    return cassette
+
+
+def replayer(path):
+    cassette = Cassette(str(path), 'replay')
+    cassette._load(str(path.parent))
+    return cassette
+
+
+def test_redact_url_masks_credentials():
+    assert redact_url('https://newsapi.org/v2/everything?q=ai&apiKey=abc&page=2') == \
+        'https://newsapi.org/v2/everything?q=ai&apiKey=%2A%2A%2A&page=2'
+    assert redact_url('https://example.com/feed') == 'https://example.com/feed'
+
+
+def test_cookies_and_login_bodies_are_not_stored(workdir):
+    cassette = record(workdir / 'run.cassette', [
+        exchange('https://www.linkedin.com/uas/authenticate', b'{"login_result": "PASS"}', method='POST',
+                 headers={'Set-Cookie': 'li_at=session; Path=/', 'Content-Type': 'application/json'}),
+        exchange('https://example.com/feed', b'<rss/>', headers={'Set-Cookie2': 'a=b', 'ETag': '"1"'}),
+    ])
+    login, feed = cassette.interactions
+    assert login['redacted'] and login['body'] == ''
+    assert login['headers'] == {'Content-Type': 'application/json'}
+    assert feed['headers'] == {'ETag': '"1"'} and 'redacted' not in feed
+
+    served = replayer(workdir / 'run.cassette')._replay(exchange('https://example.com/feed')[0])
+    assert served.content == b'<rss/>' and served.headers['ETag'] == '"1"'
+
+
+def test_replay_order_and_query_drift(workdir):
+    record(workdir / 'run.cassette', [
+        exchange('https://example.com/api?page=1', b'first'),
+        exchange('https://example.com/api?page=1', b'second'),
+        exchange('https://example.com/other?since=1', b'other'),
+    ])
+    cassette = replayer(workdir / 'run.cassette')
+    assert cassette._replay(exchange('https://example.com/api?page=1')[0]).content == b'first'
+    assert cassette._replay(exchange('https://example.com/api?page=1')[0]).content == b'second'
+    assert cassette._replay(exchange('https://example.com/other?since=2')[0]).content == b'other'
+    with pytest.raises(requests.ConnectionError):
+        cassette._replay(exchange('https://example.com/api?page=1')[0])
+
+
+def test_secret_in_a_body_blocks_the_write(workdir, monkeypatch):
+    monkeypatch.setenv('COHERE_API_KEY', 'live-key-0123456789')
+    record(workdir / 'run.cassette', [exchange('https://example.com/echo', b'{"key": "live-key-0123456789"}')])
+    assert not os.path.exists(workdir / 'run.cassette')
+    assert not os.path.exists(workdir / 'run.cassette.tmp')
+
+
+def test_find_secret_matches_url_encoded_values():
+    secrets = {'LINKEDIN_PASSWORD': 'p@ss word!'}
+    assert find_secret(iter([b'session_password=p%40ss+word%21']), secrets) == 'LINKEDIN_PASSWORD'
+    assert find_secret(iter([b'nothing here']), secrets) is None
+
+
+def test_record_and_replay_env_vars_conflict(monkeypatch, capsys):
+    monkeypatch.setenv('RECORD_CASSETTE', 'a.cassette')
+    monkeypatch.setenv('REPLAY_CASSETTE', 'b.cassette')
+    monkeypatch.setattr(sys, 'argv', ['main.py'])
+    with pytest.raises(SystemExit) as exit_info:
+        main.main()
+    assert exit_info.value.code == 2
+    assert 'cannot be used together' in capsys.readouterr().err
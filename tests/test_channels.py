@@ -0,0 +1,131 @@
+import json
+
+import channels
+from article import Article
+from channels import (LIMITS, SHORT_LINK_LENGTH, DraftCache, PostDraft, parse_channels, parse_draft, render,
+                      shorten, weighted_length)
+
+LINK = 'https://example.com/news/' + 'a-very-long-article-slug-' * 4
+
+
+def article():
+    return Article('AI lab ships a model', 'A lab released a new model today.', LINK, 'Example News')
+
+
+def draft(**overrides):
+    fields = dict(hook='Big news in AI.', summary='A lab shipped a model.', insight='It changes pricing.',
+                  question='Will you switch?', hashtags=['#AI', '#ML', '#Tech', '#News', '#Cloud', '#Data'],
+                  link=LINK, title='AI lab ships a model', source='Example News')
+    fields.update(overrides)
+    return PostDraft(**fields)
+
+
+def test_labelled_draft():
+    text = ("**Hook:** Big news in AI.\nSummary: A lab shipped a model.\nIt is fast.\n"
+            "Insight: Pricing changes. See https://spam.example.com/x\nQuestion: Will you switch?\n"
+            "Hashtags: #AI #LLM")
+    parsed = parse_draft(text, article())
+    assert parsed.hook == 'Big news in AI.'
+    assert parsed.summary == 'A lab shipped a model. It is fast.'
+    assert parsed.insight == 'Pricing changes. See'
+    assert parsed.question == 'Will you switch?'
+    assert parsed.hashtags == ['#AI', '#LLM']
+    assert parsed.link == LINK
+
+
+def test_free_form_draft():
+    text = ("Big news in AI.\n\nA lab shipped a model.\n\nIt changes pricing.\n\nMore detail.\n\n"
+            "Will you switch?\n\nRead more: https://spam.example.com/x\n\n#AI #LLM")
+    parsed = parse_draft(text, article())
+    assert parsed.hook == 'Big news in AI.'
+    assert parsed.summary == 'A lab shipped a model.'
+    assert parsed.insight == 'It changes pricing.\n\nMore detail.'
+    assert parsed.question == 'Will you switch?'
+    assert parsed.hashtags == ['#AI', '#LLM']
+
+
+def test_empty_draft_falls_back_to_the_article():
+    parsed = parse_draft('', article())
+    assert parsed.hook == 'AI lab ships a model'
+    assert parsed.summary == 'A lab released a new model today.'
+    assert parsed.hashtags == channels.DEFAULT_HASHTAGS
+
+
+def test_weighted_length_counts_links_as_short_links():
+    assert weighted_length(f"Read {LINK}") == 5 + SHORT_LINK_LENGTH
+
+
+def test_shorten_cuts_at_a_word():
+    assert shorten('one two three', 20) == 'one two three'
+    assert shorten('one two three', 10) == 'one two…'
+    assert len(shorten('x' * 50, 10)) == 10
+
+
+def test_short_draft_renders_in_full():
+    text = render(draft(), 'linkedin')
+    assert text.startswith('Big news in AI.\n\nA lab shipped a model.')
+    assert text.endswith(f"Read more: {LINK}\n\n#AI #ML #Tech #News #Cloud #Data")
+
+
+def test_long_linkedin_post_keeps_its_link_and_hashtags():
+    text = render(draft(hook='Hook. ' * 100, summary='Summary sentence. ' * 100, insight='Insight. ' * 300), 'linkedin')
+    assert len(text) <= LIMITS['linkedin']
+    assert text.endswith(f"Read more: {LINK}\n\n#AI #ML #Tech #News #Cloud #Data")
+    assert 'Insight.' not in text and 'Will you switch?' in text
+
+
+def test_linkedin_hook_is_shortened_when_nothing_else_fits():
+    text = render(draft(hook='word ' * 1000), 'linkedin')
+    assert len(text) <= LIMITS['linkedin']
+    assert text.startswith('word word') and '…' in text
+    assert text.endswith('#Data')
+
+
+def test_short_channels_stay_within_their_limits():
+    long = draft(hook='Hook sentence. ' * 40, summary='Summary sentence. ' * 40, question='Why? ' * 40)
+    for channel in ('x', 'mastodon'):
+        text = render(long, channel)
+        assert weighted_length(text) <= LIMITS[channel]
+        assert LINK in text
+    assert render(long, 'x').endswith('#AI #ML')
+    assert render(long, 'mastodon').endswith('#AI #ML #Tech #News #Cloud')
+
+
+def test_newsletter_links_the_title():
+    text = render(draft(), 'newsletter')
+    assert text.startswith(f"### [AI lab ships a model]({LINK})")
+    assert 'Source: Example News' in text
+
+
+def test_parse_channels():
+    assert parse_channels('x, Mastodon,unknown,x') == ['linkedin', 'x', 'mastodon']
+    assert parse_channels('') == ['linkedin']
+
+
+def test_draft_cache_round_trip(tmp_path):
+    cache = DraftCache(str(tmp_path))
+    item = article()
+    assert cache.get(item) is None
+    cache.put(item, draft())
+    assert cache.get(item).to_dict() == draft().to_dict()
+
+    outputs = cache.renders(item, cache.get(item), ['linkedin', 'x'])
+    with open(tmp_path / f"{item.fingerprint}.json") as f:
+        assert json.load(f)['renders'] == outputs
+
+
+def test_draft_cache_ignores_other_versions(tmp_path):
+    cache = DraftCache(str(tmp_path))
+    item = article()
+    (tmp_path / f"{item.fingerprint}.json").write_text(
+        json.dumps({'version': channels.DRAFT_VERSION - 1, 'draft': draft().to_dict(), 'renders': {}}))
+    assert cache.get(item) is None
+
+
+def test_cached_renders_are_for_the_same_draft_only(tmp_path):
+    cache = DraftCache(str(tmp_path))
+    item = article()
+    cache.put(item, draft())
+    cache.renders(item, draft(), ['x'])
+    changed = draft(hook='Different hook.')
+    assert cache.renders(item, changed, ['x'])['x'].startswith('Different hook.')
@@ -0,0 +1,73 @@
+import pytest
+
+import deadline as deadline_module
+from deadline import MIN_TIMEOUT, RunDeadline, activate, cap_timeout, current, time_left, wait_timeout
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(deadline_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_stages_get_their_share_of_the_time_left(clock):
+    deadline = RunDeadline(100)
+    assert deadline.allot('fetch') == 30
+    assert deadline.allot('select') == pytest.approx(100 / 7)
+    assert deadline.allot('post') == 100
+    assert deadline.allot('unknown') == 100
+
+
+def test_unused_time_rolls_forward(clock):
+    deadline = RunDeadline(100)
+    with deadline.stage('fetch') as budget:
+        assert budget == 30
+        clock[0] += 10
+    # 90s left for select, generate and post (weights 1, 2, 4)
+    assert deadline.allot('select') == pytest.approx(90 / 7)
+    assert deadline.spent == {'fetch': 10}
+
+
+def test_time_left_and_cap_follow_the_open_stage(clock):
+    deadline = RunDeadline(100)
+    assert deadline.time_left() == 100
+    with deadline.stage('fetch'):
+        clock[0] += 25
+        assert deadline.time_left() == 5
+        assert deadline.cap(10) == 5
+        assert deadline.cap(2) == 2
+        clock[0] += 10
+        assert deadline.time_left() == 0
+        assert deadline.cap(10) == MIN_TIMEOUT
+    assert deadline.time_left() == 65
+
+
+def test_unbounded_deadline_caps_nothing(clock):
+    deadline = RunDeadline(None)
+    assert not deadline.bounded
+    with deadline.stage('fetch') as budget:
+        assert budget == float('inf')
+        assert deadline.cap(30) == 30
+
+
+def test_overruns_and_degradations_are_recorded(clock):
+    deadline = RunDeadline(100)
+    with deadline.stage('fetch'):
+        clock[0] += 50
+        deadline.degrade('fetch', 'skipping NewsAPI')
+    summary = deadline.summary()
+    assert summary['spent_s'] == {'fetch': 50}
+    assert summary['degraded'] == {'fetch': 'skipping NewsAPI'}
+    assert summary['elapsed_s'] == 50
+
+
+def test_activate_sets_the_process_deadline(clock):
+    assert not current().bounded and wait_timeout() is None
+    deadline = RunDeadline(100)
+    with activate(deadline):
+        assert current() is deadline
+        with deadline.stage('fetch'):
+            assert time_left() == 30 and wait_timeout() == 30
+            assert cap_timeout(10) == 10 and cap_timeout(60) == 30
+    assert current() is not deadline and cap_timeout(60) == 60
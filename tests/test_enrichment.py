@@ -0,0 +1,35 @@
+from enrichment import ArticleEnricher, extract_main_text
+
+PARAGRAPH = "This paragraph is long enough to count as real article body text for extraction."
+
+
+def test_article_container_wins_over_boilerplate():
+    page = f"""<html><body>
+        <nav><p>{PARAGRAPH} navigation</p></nav>
+        <article><h2>Heading</h2><p>{PARAGRAPH} one</p><p>short</p><p>{PARAGRAPH} two</p></article>
+        <footer><p>{PARAGRAPH} footer</p></footer>
+        <script>var x = 1;</script>
+    </body></html>""".encode('utf-8')
+    assert extract_main_text(page) == f"Heading\n\n{PARAGRAPH} one\n\n{PARAGRAPH} two"
+
+
+def test_densest_paragraph_parent_without_containers():
+    page = f"""<html><body>
+        <div><p>{PARAGRAPH} a</p></div>
+        <div class="body"><p>{PARAGRAPH} b</p><p>{PARAGRAPH} c</p></div>
+    </body></html>""".encode('utf-8')
+    assert extract_main_text(page) == f"{PARAGRAPH} b\n\n{PARAGRAPH} c"
+
+
+def test_empty_or_unparseable_pages():
+    assert extract_main_text(b'') == ''
+    assert extract_main_text(None) == ''
+    assert extract_main_text(b'<html><body><p>tiny</p></body></html>') == ''
+
+
+def test_full_text_is_served_from_the_cache(tmp_path):
+    enricher = ArticleEnricher(cache_dir=str(tmp_path))
+    url = 'https://example.com/story'
+    with open(enricher._cache_path(url), 'w', encoding='utf-8') as f:
+        f.write('cached body')
+    assert enricher.full_text(url) == 'cached body'
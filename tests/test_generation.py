@@ -0,0 +1,66 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from generation import complete_post_length, stream_post, trim_partial
+
+POST = "HOOK: Big news.\nQUESTION: Would you use it?\nHASHTAGS: #AI #ML\n"
+
+
+class FakeClient:
+    """Cohere stand-in whose generate() streams the given chunks, optionally pausing before each"""
+
+    def __init__(self, chunks, delay=0.0, error=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.error = error
+
+    def generate(self, prompt, max_tokens, stream, **kwargs):
+        def chunks():
+            for text in self.chunks:
+                time.sleep(self.delay)
+                yield SimpleNamespace(text=text)
+            if self.error:
+                raise self.error
+        return chunks()
+
+
+def test_complete_post_needs_a_question_then_a_closed_hashtag_line():
+    assert complete_post_length(POST) == len(POST)
+    assert complete_post_length(POST + 'trailing text') == len(POST)
+    assert complete_post_length("HOOK: Big news.\nHASHTAGS: #AI #ML\n") == 0
+    assert complete_post_length(POST.rstrip('\n')) == 0
+
+
+def test_trim_partial_cuts_to_the_last_sentence():
+    assert trim_partial('One. Two? Three is cut') == 'One. Two?'
+    assert trim_partial('no sentence end') == 'no sentence end'
+
+
+def test_stream_stops_once_the_post_is_complete():
+    client = FakeClient([POST[:20], POST[20:], 'Extra text the model kept writing.', 'More.'])
+    text, info = stream_post(client, 'prompt', 100, 300)
+    assert text == POST.strip()
+    assert info['reason'] == 'complete' and info['chunks'] == 2
+
+
+def test_word_cap_trims_to_the_target():
+    client = FakeClient(['One two three. ' * 10])
+    text, info = stream_post(client, 'prompt', 100, 6)
+    assert info['reason'] == 'word_cap'
+    assert text == 'One two three. One two three.'
+
+
+def test_deadline_returns_whole_sentences_so_far():
+    client = FakeClient(['First sentence. Second ', 'half'], delay=0.3)
+    text, info = stream_post(client, 'prompt', 100, 300, time_budget=0.45)
+    assert info['reason'] == 'deadline'
+    assert text == 'First sentence.'
+
+
+def test_stream_errors():
+    with pytest.raises(RuntimeError):
+        stream_post(FakeClient([], error=RuntimeError('boom')), 'prompt', 100, 300)
+    text, info = stream_post(FakeClient(['Partial post. More'], error=RuntimeError('boom')), 'prompt', 100, 300)
+    assert (text, info['reason']) == ('Partial post.', 'error')
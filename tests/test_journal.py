@@ -0,0 +1,76 @@
+import json
+import time
+
+import pytest
+
+from journal import JOURNAL_VERSION, RunJournal
+
+
+def journal_at(tmp_path, stages, started_at=None):
+    """Journal file whose run began at started_at (now by default) and completed stages"""
+    journal = RunJournal(str(tmp_path / 'run_journal.jsonl'))
+    journal.begin('run-1')
+    for stage in stages:
+        journal.record(stage, {'stage': stage})
+    if started_at is not None:
+        lines = (tmp_path / 'run_journal.jsonl').read_text().splitlines()
+        begin = json.loads(lines[0])
+        begin['at'] = started_at
+        lines[0] = json.dumps(begin)
+        (tmp_path / 'run_journal.jsonl').write_text('\n'.join(lines) + '\n')
+    return RunJournal(journal.path)
+
+
+def test_records_survive_reopening(tmp_path):
+    journal = journal_at(tmp_path, ['fetched', 'selected'])
+    assert journal.run_id == 'run-1'
+    assert journal.get('selected') == {'stage': 'selected'}
+    assert journal.get('generated') is None
+    assert journal.last_stage == 'selected'
+
+
+def test_unknown_stage_is_rejected(tmp_path):
+    journal = RunJournal(str(tmp_path / 'run_journal.jsonl'))
+    journal.begin('run-1')
+    with pytest.raises(ValueError):
+        journal.record('published')
+
+
+def test_begin_discards_the_previous_run(tmp_path):
+    journal = journal_at(tmp_path, ['fetched'])
+    journal.begin('run-2')
+    reopened = RunJournal(journal.path)
+    assert reopened.run_id == 'run-2' and reopened.entries == {}
+
+
+@pytest.mark.parametrize('stages, age_hours, expected', [
+    ([], 0, False),
+    (['fetched', 'selected'], 1, True),
+    (['fetched', 'selected'], 30, False),
+    (['fetched', 'selected', 'generated', 'queued'], 30, True),
+    (['fetched', 'selected', 'generated', 'queued', 'post_started', 'posted', 'done'], 1, False),
+])
+def test_resumable(tmp_path, stages, age_hours, expected):
+    journal = journal_at(tmp_path, stages, started_at=time.time() - age_hours * 3600)
+    assert journal.resumable(max_age_hours=24) is expected
+
+
+def test_missing_journal_is_not_resumable(tmp_path):
+    journal = RunJournal(str(tmp_path / 'missing.jsonl'))
+    assert journal.run_id is None and not journal.resumable()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = journal_at(tmp_path, ['fetched', 'selected'])
+    with open(journal.path, 'a') as f:
+        f.write('{"stage": "generated", "da')
+    reopened = RunJournal(journal.path)
+    assert reopened.last_stage == 'selected' and reopened.resumable()
+
+
+def test_other_versions_are_ignored(tmp_path):
+    path = tmp_path / 'run_journal.jsonl'
+    path.write_text(json.dumps({'stage': 'begin', 'version': JOURNAL_VERSION + 1, 'run_id': 'old', 'at': time.time()})
+                    + '\n' + json.dumps({'stage': 'fetched', 'data': {}}) + '\n')
+    journal = RunJournal(str(path))
+    assert journal.run_id is None and not journal.resumable()
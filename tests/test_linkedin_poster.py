@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+import linkedin_poster
+from linkedin_poster import LinkedInPoster
+
+POST = 'Big news in AI.\n\nWhat do you think?\n\n#AI #ML'
+
+
+class FakeEditor:
+    """The post editor element: remembers its text and everything typed into it"""
+
+    def __init__(self):
+        self.text = ''
+        self.typed = []
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        pass
+
+    def clear(self):
+        self.text = ''
+
+    def send_keys(self, text):
+        self.typed.append(text)
+        self.text += text
+
+
+class FakeDriver:
+    """Runs the insert script against FakeEditor; methods not in accepts drop the blank lines"""
+
+    def __init__(self, accepts=('insertText', 'paste'), failing=()):
+        self.editor = FakeEditor()
+        self.accepts = accepts
+        self.failing = failing
+        self.methods = []
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, selector):
+        return self.editor
+
+    def execute_script(self, script, element, *args):
+        if script.startswith('return arguments[0].innerText'):
+            # contenteditable hands back non-breaking spaces and CRLF line ends
+            return element.text.replace(' ', '\u00a0').replace('\n', '\r\n')
+        text, method = args
+        self.methods.append(method)
+        if method in self.failing:
+            raise RuntimeError('script error')
+        element.text = text if method in self.accepts else text.replace('\n\n', '\n')
+
+
+def poster(driver, monkeypatch, mode='bulk'):
+    monkeypatch.setenv('SELENIUM_INPUT_MODE', mode)
+    monkeypatch.setattr(linkedin_poster.time, 'sleep', lambda seconds: None)
+    instance = LinkedInPoster('user@example.com', 'secret', cookie_file='unused.json')
+    instance.driver = driver
+    return instance
+
+
+def test_insert_text_lands_in_one_operation(monkeypatch):
+    driver = FakeDriver()
+    assert poster(driver, monkeypatch).insert_text(driver.editor, POST)
+    assert driver.methods == ['insertText']
+    assert driver.editor.text == POST
+
+
+def test_mismatched_insert_text_falls_back_to_paste(monkeypatch):
+    driver = FakeDriver(accepts=('paste',))
+    assert poster(driver, monkeypatch).insert_text(driver.editor, POST)
+    assert driver.methods == ['insertText', 'paste']
+
+
+def test_failing_insert_text_falls_back_to_paste(monkeypatch):
+    driver = FakeDriver(failing=('insertText',))
+    assert poster(driver, monkeypatch).insert_text(driver.editor, POST)
+    assert driver.methods == ['insertText', 'paste']
+
+
+def test_create_post_types_when_no_bulk_insert_matches(monkeypatch):
+    driver = FakeDriver(accepts=())
+    assert poster(driver, monkeypatch).create_post(POST)
+    assert driver.methods == ['insertText', 'paste']
+    # The mangled bulk text is cleared before the post is typed
+    assert driver.editor.typed == [POST] and driver.editor.text == POST
+
+
+def test_create_post_uses_the_bulk_insert(monkeypatch):
+    driver = FakeDriver()
+    assert poster(driver, monkeypatch).create_post(POST)
+    assert driver.methods == ['insertText'] and driver.editor.typed == []
+
+
+def test_type_mode_skips_the_bulk_insert(monkeypatch):
+    driver = FakeDriver()
+    assert poster(driver, monkeypatch, mode='type').create_post(POST)
+    assert driver.methods == [] and driver.editor.typed == [POST]
@@ -0,0 +1,44 @@
+import json
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from logging_config import (ContextFilter, DroppingQueueHandler, JsonFormatter, get_run_id, inherit_log_context,
+                            log_stage, set_run_id)
+
+
+def record(message='hello'):
+    return logging.LogRecord('test', logging.INFO, __file__, 1, message, None, None)
+
+
+def test_records_carry_run_id_and_nested_stage():
+    set_run_id('run123')
+    with log_stage('fetch'), log_stage('rss'):
+        entry = record()
+        ContextFilter().filter(entry)
+    assert (entry.run_id, entry.stage) == ('run123', 'fetch/rss')
+
+
+def test_worker_threads_inherit_the_context():
+    set_run_id('run456')
+    with log_stage('select'):
+        with ThreadPoolExecutor(max_workers=1, initializer=inherit_log_context()) as executor:
+            tagged = record()
+            executor.submit(ContextFilter().filter, tagged).result()
+    assert get_run_id() == 'run456'
+    assert (tagged.run_id, tagged.stage) == ('run456', 'select')
+
+
+def test_json_lines():
+    entry = record('naïve message')
+    entry.run_id, entry.stage = 'abc', 'post'
+    line = json.loads(JsonFormatter().format(entry))
+    assert line['message'] == 'naïve message'
+    assert (line['level'], line['run_id'], line['stage']) == ('INFO', 'abc', 'post')
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.enqueue(record())
+    handler.enqueue(record())
+    assert handler.dropped == 1
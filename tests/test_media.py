@@ -0,0 +1,81 @@
+import time
+
+import pytest
+import requests
+
+import media
+from article import Article
+from media import MediaCache, extract_og_image
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\0' * 100
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(media, 'Image', None)
+    pages = {}
+    downloads = []
+
+    def download_html(url, *args, **kwargs):
+        downloads.append(url)
+        page = pages[url]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    monkeypatch.setattr(media, 'download_html', download_html)
+    monkeypatch.setattr(MediaCache, '_download', lambda self, image_url: PNG)
+    media_cache = MediaCache(str(tmp_path))
+    media_cache.pages, media_cache.downloads = pages, downloads
+    return media_cache
+
+
+def article(n=1):
+    return Article('AI story', '', f"https://example.com/story/{n}", 'Feed')
+
+
+def test_extract_og_image_prefers_secure_url_and_resolves_relative():
+    page = b'''<html><head><meta property="og:image" content="/img/a.png">
+        <meta property="og:image:secure_url" content="https://cdn.example.com/a.png"></head></html>'''
+    assert extract_og_image(page, 'https://example.com/x') == 'https://cdn.example.com/a.png'
+    page = b'<html><head><meta name="twitter:image" content="img/b.jpg"></head></html>'
+    assert extract_og_image(page, 'https://example.com/x/') == 'https://example.com/x/img/b.jpg'
+    assert extract_og_image(b'<html></html>', 'https://example.com') is None
+    assert extract_og_image(None, 'https://example.com') is None
+
+
+def test_image_is_cached_by_content(cache):
+    cache.pages['https://example.com/story/1'] = b'<meta property="og:image" content="https://cdn/a.png">'
+    cache.pages['https://example.com/story/2'] = b'<meta property="og:image" content="https://cdn/a.png">'
+    first = cache.image_for(article(1))
+    assert first.endswith('.png')
+    assert cache.image_for(article(1)) == first
+    assert cache.image_for(article(2)) == first
+    assert cache.downloads == ['https://example.com/story/1', 'https://example.com/story/2']
+    assert MediaCache(cache.cache_dir).image_for(article(1)) == first
+
+
+def test_failed_page_download_is_retried(cache):
+    cache.pages['https://example.com/story/1'] = requests.Timeout('slow')
+    assert cache.image_for(article()) is None
+    cache.pages['https://example.com/story/1'] = b'<meta property="og:image" content="https://cdn/a.png">'
+    assert cache.image_for(article()) is not None
+
+
+def test_missing_og_image_is_checked_again_after_the_ttl(cache, monkeypatch):
+    cache.pages['https://example.com/story/1'] = b'<html><title>Are you a robot?</title></html>'
+    assert cache.image_for(article()) is None
+    assert cache.image_for(article()) is None
+    assert len(cache.downloads) == 1
+
+    cache.pages['https://example.com/story/1'] = b'<meta property="og:image" content="https://cdn/a.png">'
+    later = time.time() + media.MISSING_IMAGE_TTL + 1
+    monkeypatch.setattr(media.time, 'time', lambda: later)
+    reloaded = MediaCache(cache.cache_dir)
+    assert reloaded.index['missing'] == {}
+    assert reloaded.image_for(article()) is not None
+
+
+def test_without_pillow_only_small_jpeg_and_png_pass(cache):
+    assert cache._process(PNG) == (PNG, '.png')
+    assert cache._process(b'GIF89a' + b'\0' * 10) is None
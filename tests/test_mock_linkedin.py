@@ -0,0 +1,72 @@
+import pytest
+import requests
+
+from mock_linkedin import MOCK_ACCESS_TOKEN, MockLinkedInConfig, MockLinkedInServer
+
+AUTH = {'Authorization': f"Bearer {MOCK_ACCESS_TOKEN}"}
+
+
+@pytest.fixture
+def server():
+    instance = MockLinkedInServer(port=0).start()
+    yield instance
+    instance.stop()
+
+
+def ugc_post(server, text, headers=AUTH):
+    return requests.post(server.url('/v2/ugcPosts'), headers=headers, timeout=5, json={
+        'author': 'urn:li:person:mock-person',
+        'specificContent': {'com.linkedin.ugc.ShareContent': {'shareCommentary': {'text': text}}},
+    })
+
+
+def test_posts_are_created_once(server):
+    response = ugc_post(server, 'First post')
+    assert response.status_code == 201
+    assert response.headers['X-RestLi-Id'] == response.json()['id'] == 'urn:li:share:1'
+    assert ugc_post(server, 'First post').status_code == 422
+    assert ugc_post(server, 'Second post', headers={}).status_code == 401
+    stats = server.stats()
+    assert stats['posts'] == 1 and stats['duplicates'] == 1 and stats['requests'] == {'ugcPosts': 3}
+
+
+def test_injected_errors_carry_retry_after(server):
+    server.config = MockLinkedInConfig(error_rate=1.0, error_statuses=(429,), retry_after=7)
+    response = ugc_post(server, 'Throttled post')
+    assert response.status_code == 429 and response.headers['Retry-After'] == '7'
+    # Only writes fail; reads answer normally
+    assert requests.get(server.url('/v2/userinfo'), headers=AUTH, timeout=5).json()['sub'] == 'mock-person'
+    server.config = MockLinkedInConfig(error_rate=1.0, error_statuses=(500,))
+    response = ugc_post(server, 'Failed post')
+    assert response.status_code == 500 and 'Retry-After' not in response.headers
+    stats = server.stats()
+    assert stats['posts'] == 0 and stats['injected_errors'] == {'429': 1, '500': 1}
+
+
+def test_lost_response_still_creates_the_post(server):
+    server.config = MockLinkedInConfig(lost_response_rate=1.0)
+    assert ugc_post(server, 'Lost post').status_code == 500
+    assert [post['text'] for post in server.posts] == ['Lost post']
+    assert server.stats()['lost_responses'] == 1
+
+
+def test_logins_can_be_challenged(server):
+    server.config = MockLinkedInConfig(challenge_rate=1.0)
+    result = requests.post(server.url('/uas/authenticate'), data={'session_key': 'a'}, timeout=5).json()
+    assert result == {'login_result': 'CHALLENGE', 'challenge_url': server.url('/checkpoint/challenge/')}
+    response = requests.post(server.url('/login'), data={'session_key': 'a', 'session_password': 'b'},
+                             allow_redirects=False, timeout=5)
+    assert response.status_code == 302 and response.headers['Location'] == '/checkpoint/challenge/'
+    assert server.stats()['challenges'] == 2
+
+
+def test_web_posts_need_a_session(server):
+    session = requests.Session()
+    assert session.post(server.url('/mock/web-post'), json={'text': 'Web post'}, timeout=5).status_code == 401
+    response = session.post(server.url('/login'), data={'session_key': 'a', 'session_password': 'b'}, timeout=5)
+    assert response.url == server.url('/feed/') and 'Start a post' in response.text
+    assert session.post(server.url('/mock/web-post'), json={'text': 'Web post', 'image': True},
+                        timeout=5).status_code == 201
+    assert server.stats()['images'] == 1
+    assert requests.post(server.url('/mock/reset'), timeout=5).status_code == 204
+    assert server.stats()['posts'] == 0
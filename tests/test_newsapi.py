@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+
+def stamp(n):
+    return f"2026-01-01T{n // 60:02d}:{n % 60:02d}:00Z"
+
+
+class FakeNewsAPI:
+    """Pages of results for one query, newest first, recording the params of every request"""
+
+    def __init__(self, minutes, page_size=2, fail_on_page=None, failing_queries=()):
+        self.minutes = sorted(minutes, reverse=True)
+        self.page_size = page_size
+        self.fail_on_page = fail_on_page
+        self.failing_queries = failing_queries
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append(params)
+        if params['page'] == self.fail_on_page or params['q'] in self.failing_queries:
+            raise ConnectionError('connection reset')
+        matching = [n for n in self.minutes if not params.get('from') or stamp(n) >= params['from']]
+        start = (params['page'] - 1) * self.page_size
+        items = [{'title': f"AI story {n}", 'description': '', 'url': f"https://example.com/{params['q']}/{n}",
+                  'source': {'name': 'Wire'}, 'publishedAt': stamp(n)} for n in matching[start:start + self.page_size]]
+        data = {'articles': items, 'totalResults': len(matching)}
+        return SimpleNamespace(json=lambda: data, raise_for_status=lambda: None)
+
+
+def with_newsapi(bot, api, queries=('ai',)):
+    bot.scheduler = api
+    bot.news_api_url = 'https://newsapi.example.com/v2/everything'
+    bot.news_api_key = 'key'
+    bot.newsapi_queries = list(queries)
+    bot.newsapi_page_size = api.page_size
+    bot.newsapi_max_pages = 5
+    return bot
+
+
+def test_first_run_reads_only_the_newest_page(bot):
+    api = FakeNewsAPI(range(10))
+    with_newsapi(bot, api)
+    articles = bot._fetch_from_newsapi()
+    assert [a.title for a in articles] == ['AI story 9', 'AI story 8']
+    assert len(api.requests) == 1 and 'from' not in api.requests[0]
+    assert bot.fetch_state['newsapi'] == {'ai': stamp(9)}
+
+
+def test_later_runs_page_back_to_the_watermark(bot):
+    api = FakeNewsAPI(range(10))
+    with_newsapi(bot, api)
+    bot._fetch_from_newsapi()
+    api.minutes = sorted(range(15), reverse=True)
+    articles = bot._fetch_from_newsapi()
+    assert [a.title for a in articles] == [f"AI story {n}" for n in range(14, 9, -1)]
+    assert api.requests[-1]['from'] == stamp(9) and api.requests[-1]['page'] == 3
+    assert bot.fetch_state['newsapi'] == {'ai': stamp(14)}
+
+
+def test_failed_page_keeps_the_old_watermark(bot):
+    api = FakeNewsAPI(range(10), fail_on_page=2)
+    with_newsapi(bot, api)
+    bot.fetch_state['newsapi'] = {'ai': stamp(3)}
+    articles = bot._fetch_from_newsapi()
+    assert [a.title for a in articles] == ['AI story 9', 'AI story 8']
+    assert bot.fetch_state['newsapi'] == {'ai': stamp(3)}
+
+
+def test_queries_keep_separate_watermarks(bot):
+    api = FakeNewsAPI(range(4))
+    with_newsapi(bot, api, queries=('ai', 'llm'))
+    articles = bot._fetch_from_newsapi()
+    assert len(articles) == 4
+    assert bot.fetch_state['newsapi'] == {'ai': stamp(3), 'llm': stamp(3)}
+    assert {params['q'] for params in api.requests} == {'ai', 'llm'}
+
+
+def test_page_budget_keeps_the_old_watermark(bot):
+    api = FakeNewsAPI(range(20))
+    with_newsapi(bot, api)
+    bot.newsapi_max_pages = 2
+    bot.fetch_state['newsapi'] = {'ai': stamp(3)}
+    articles = bot._fetch_from_newsapi()
+    assert [a.title for a in articles] == [f"AI story {n}" for n in range(19, 15, -1)]
+    assert bot.fetch_state['newsapi'] == {'ai': stamp(3)}
+
+
+def test_all_queries_failing_backs_off(bot):
+    api = FakeNewsAPI(range(4), failing_queries=('ai', 'llm'))
+    with_newsapi(bot, api, queries=('ai', 'llm'))
+    assert bot._fetch_from_newsapi() == []
+    polling = bot.fetch_state['polling']['NewsAPI']
+    assert polling['failures'] == 1 and 'last_poll' not in polling
+
+
+def test_one_failing_query_still_counts_as_a_poll(bot):
+    api = FakeNewsAPI(range(4), failing_queries=('llm',))
+    with_newsapi(bot, api, queries=('ai', 'llm'))
+    assert len(bot._fetch_from_newsapi()) == 2
+    assert bot.fetch_state['newsapi'] == {'ai': stamp(3)}
+    assert bot.fetch_state['polling']['NewsAPI']['failures'] == 0
@@ -0,0 +1,102 @@
+import json
+import threading
+from types import SimpleNamespace
+
+from article import Article
+from pipeline import StreamingPipeline, score_article
+
+KEYWORDS = ['ai', 'machine learning']
+NOW = 2000000000.0
+
+
+def article(title, description='', published_ts=None, url=None):
+    return Article(title, description, url or f"https://example.com/{title.replace(' ', '-')}", 'Test',
+                   published_ts=published_ts)
+
+
+def test_keywords_match_whole_words():
+    assert score_article(article('What she said'), KEYWORDS, NOW) == score_article(article('Gardening'), KEYWORDS, NOW)
+    assert score_article(article('AI chips'), KEYWORDS, NOW) > score_article(article('Chips'), KEYWORDS, NOW)
+
+
+def test_fresh_articles_score_higher():
+    fresh = article('AI news', published_ts=NOW - 3600)
+    stale = article('AI news', published_ts=NOW - 72 * 3600)
+    undated = article('AI news')
+    assert score_article(fresh, KEYWORDS, NOW) > score_article(undated, KEYWORDS, NOW) > score_article(stale, KEYWORDS, NOW)
+
+
+def test_batches_run_through_every_stage():
+    sources = [('one', lambda: [article('a')]), ('two', lambda: [article('b'), article('c')]), ('empty', lambda: [])]
+    stages = [('upper', lambda batch: [article(a.title.upper()) for a in batch]),
+              ('drop-b', lambda batch: [a for a in batch if a.title != 'B'])]
+    pipeline = StreamingPipeline(sources, stages)
+    titles = sorted(a.title for _, batch in pipeline.batches(timeout=5) for a in batch)
+    assert titles == ['A', 'C']
+    assert not pipeline.timed_out and pipeline.pending == []
+    assert set(pipeline.arrivals) == {'one', 'two', 'empty'}
+
+
+def test_cancel_abandons_slow_sources():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return [article('late')]
+
+    pipeline = StreamingPipeline([('fast', lambda: [article('early')]), ('slow', slow)], [('pass', lambda batch: batch)])
+    for source, batch in pipeline.batches(timeout=5):
+        assert source == 'fast'
+        pipeline.cancel()
+    assert pipeline.pending == ['slow'] and pipeline.cancelled.is_set()
+    release.set()
+
+
+def test_timeout_stops_waiting():
+    release = threading.Event()
+    pipeline = StreamingPipeline([('slow', lambda: release.wait(5) and [])], [('pass', lambda batch: batch)])
+    assert list(pipeline.batches(timeout=0.1)) == []
+    assert pipeline.timed_out and pipeline.pending == ['slow']
+    release.set()
+
+
+def test_rss_feed_arriving_after_selection_leaves_its_state_alone(bot):
+    body = (b"<rss><channel><item><guid>a</guid><title>AI news</title>"
+            b"<link>https://example.com/a</link><description>AI</description></item></channel></rss>")
+
+    def get(url, **kwargs):
+        # Selection finishes while this feed is still downloading
+        bot.fetch_cancelled.set()
+        return SimpleNamespace(status_code=200, headers={'ETag': '"v2"'}, content=body, raise_for_status=lambda: None)
+
+    bot.scheduler = SimpleNamespace(get=get)
+    assert bot._fetch_rss_feed('Feed', 'https://example.com/feed') == []
+    assert bot.fetch_state['rss'] == {'Feed': {}}
+    assert bot.fetch_state['polling'] == {}
+
+
+def test_newsapi_arriving_after_selection_keeps_its_watermarks(bot):
+    bot.fetch_state['newsapi'] = {'ai': '2026-01-01T00:00:00Z'}
+    bot.newsapi_queries = ['ai']
+
+    def fetch_query(query, watermark):
+        bot.fetch_cancelled.set()
+        return [article('AI news')], '2026-02-01T00:00:00Z', False
+
+    bot._fetch_newsapi_query = fetch_query
+    assert bot._fetch_from_newsapi() == []
+    assert bot.fetch_state['newsapi'] == {'ai': '2026-01-01T00:00:00Z'}
+    assert bot.fetch_state['polling'] == {}
+
+
+def test_save_waits_for_a_source_mid_update(bot):
+    bot.fetch_state_lock.acquire()
+    saver = threading.Thread(target=bot.save_fetch_state)
+    saver.start()
+    saver.join(0.2)
+    assert saver.is_alive()
+    bot.fetch_state['rss'] = {'Feed': {'seen': ['a']}}
+    bot.fetch_state_lock.release()
+    saver.join(5)
+    with open(bot.fetch_state_file) as f:
+        assert json.load(f)['rss'] == {'Feed': {'seen': ['a']}}
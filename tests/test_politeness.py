@@ -0,0 +1,82 @@
+import time
+
+from politeness import HostScheduler, parse_host_intervals, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, time.monotonic()))
+        return self.responses.pop(0)
+
+
+def scheduler(**kwargs):
+    return HostScheduler(respect_robots=False, **kwargs)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_parse_host_intervals():
+    assert parse_host_intervals('Example.com=2, feeds.example.org=0.5,bad') == {
+        'example.com': 2.0, 'feeds.example.org': 0.5}
+    assert parse_host_intervals(None) == {}
+
+
+def test_same_host_requests_are_spaced():
+    hosts = scheduler(min_interval=0.1)
+    starts = []
+    for _ in range(3):
+        with hosts.slot('https://example.com/a'):
+            starts.append(time.monotonic())
+    assert starts[2] - starts[0] >= 0.19
+
+
+def test_other_hosts_do_not_wait():
+    hosts = scheduler(min_interval=5, host_intervals={'fast.example.com': 0})
+    started = time.monotonic()
+    with hosts.slot('https://one.example.com/'):
+        pass
+    with hosts.slot('https://two.example.com/'):
+        pass
+    for _ in range(3):
+        with hosts.slot('https://fast.example.com/'):
+            pass
+    assert time.monotonic() - started < 1
+
+
+def test_retry_after_is_waited_out_once():
+    hosts = scheduler(min_interval=0)
+    session = FakeSession([FakeResponse(429, {'Retry-After': '0'}), FakeResponse(200)])
+    assert hosts.get('https://example.com/', session=session).status_code == 200
+    assert len(session.calls) == 2
+
+
+def test_long_retry_after_gives_up_and_defers_the_host():
+    hosts = scheduler(min_interval=0, max_retry_wait=10)
+    session = FakeSession([FakeResponse(503, {'Retry-After': '3600'})])
+    assert hosts.get('https://example.com/', session=session).status_code == 503
+    assert len(session.calls) == 1
+    assert hosts._host('https://example.com/').next_start > time.monotonic() + 3000
+
+
+def test_crawl_delay_comes_from_the_cache():
+    hosts = HostScheduler(min_interval=1, robots_cache={'example.com': {'crawl_delay': 7.0, 'checked_at': time.time()}})
+    assert hosts._host('https://example.com/feed').interval == 7.0
@@ -0,0 +1,88 @@
+from polling import HISTORY_DAYS, AdaptivePoller
+
+NOW = 2000000000.0
+HOUR = 3600
+
+
+def poller(state=None, **kwargs):
+    kwargs.setdefault('jitter', 0)
+    return AdaptivePoller({} if state is None else state, min_interval=600, max_interval=86400, **kwargs)
+
+
+def test_new_sources_are_due():
+    assert poller().due('Feed', NOW)
+
+
+def test_interval_follows_the_publish_rate():
+    polls = poller()
+    # One item an hour over the last ten hours
+    interval = polls.observe('Feed', [NOW - i * HOUR for i in range(1, 11)], now=NOW)
+    assert interval == 3600
+    assert polls.state['Feed']['rate_per_day'] == 24
+    assert not polls.due('Feed', NOW + 3599) and polls.due('Feed', NOW + 3600)
+
+
+def test_interval_is_clamped():
+    busy = poller(target_items=1)
+    assert busy.observe('Feed', [NOW - i for i in range(1, 50)], now=NOW) == 600
+    quiet = poller(target_items=1)
+    assert quiet.observe('Feed', [NOW - 10 * 86400, NOW - 13 * 86400], now=NOW) == 86400
+
+
+def test_quiet_polls_back_off_and_new_items_speed_up():
+    polls = poller()
+    assert polls.observe('Feed', [], now=NOW) == 1200
+    assert polls.observe('Feed', [], now=NOW + 1200) == 2400
+    assert polls.observe('Feed', [None], now=NOW + 3600) == 1200
+
+
+def test_old_and_future_timestamps_are_ignored():
+    polls = poller()
+    polls.observe('Feed', [NOW - (HISTORY_DAYS + 1) * 86400, NOW + 3600, NOW - HOUR], now=NOW)
+    assert polls.state['Feed']['published'] == [NOW - HOUR]
+
+
+def test_seed_fills_history_without_scheduling():
+    polls = poller()
+    polls.seed('Feed', [NOW - 2 * HOUR, NOW - HOUR], now=NOW)
+    assert polls.state['Feed']['published'] == [NOW - 2 * HOUR, NOW - HOUR]
+    assert polls.state['Feed']['rate_per_day'] == 24
+    assert polls.due('Feed', NOW) and not polls.polled_since('Feed', NOW - 1)
+
+
+def test_failures_back_off_exponentially_and_reset_on_success():
+    polls = poller()
+    assert [polls.failed('Feed', now=NOW) for _ in range(4)] == [600, 1200, 2400, 4800]
+    polls.observe('Feed', [], now=NOW)
+    assert polls.state['Feed']['failures'] == 0
+    assert polls.polled_since('Feed', NOW)
+
+
+def test_failures_count_as_polls():
+    polls = poller()
+    polls.failed('Feed', now=NOW)
+    assert polls.polled_since('Feed', NOW) and not polls.polled_since('Feed', NOW + 1)
+
+
+def test_source_floor_holds_above_the_shared_range():
+    polls = poller(source_min_intervals={'NewsAPI': 3456, 'Quota': 2 * 86400})
+    busy = [NOW - i for i in range(1, 50)]
+    assert polls.observe('NewsAPI', busy, now=NOW) == 3456
+    assert polls.observe('Feed', busy, now=NOW) == 600
+    assert polls.observe('Quota', busy, now=NOW) == 2 * 86400
+    assert [polls.failed('NewsAPI', now=NOW) for _ in range(2)] == [3456, 6912]
+
+def test_defer_only_pushes_the_next_poll_later():
+    polls = poller()
+    polls.observe('Feed', [], now=NOW)
+    polls.defer('Feed', 60, now=NOW)
+    assert polls.seconds_until('Feed', NOW) == 1200
+    polls.defer('Feed', 86400, now=NOW)
+    assert polls.seconds_until('Feed', NOW) == 86400
+
+
+def test_state_round_trips_through_the_dict():
+    state = {}
+    poller(state).observe('Feed', [NOW - HOUR, NOW - 2 * HOUR], now=NOW)
+    assert not poller(state).due('Feed', NOW)
+    assert poller(state).summary()['Feed']['failures'] == 0
@@ -0,0 +1,24 @@
+import pytest
+
+from post_editor import normalize_editor_text
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('Hook\n\nBody', 'Hook\n\nBody'),
+    ('Hook\u00a0line\r\n\r\nBody', 'Hook line\n\nBody'),
+    ('Hook   \nBody\t \n', 'Hook\nBody'),
+    ('\n\nHook\n\n\n\n\nBody\n\n', 'Hook\n\nBody'),
+    ('Hook\n \n\u00a0\nBody', 'Hook\n\nBody'),
+    ('Big\u00a0news\u00a0', 'Big news'),
+    ('', ''),
+    (None, ''),
+])
+def test_normalize_editor_text(raw, expected):
+    assert normalize_editor_text(raw) == expected
+
+
+def test_editor_round_trip_matches_the_draft():
+    draft = 'Big news in AI.\n\nWhat do you think?\n\n#AI #ML'
+    # What contenteditable hands back after a paste
+    echoed = draft.replace(' ', '\u00a0', 2).replace('\n', ' \r\n') + '\r\n'
+    assert normalize_editor_text(echoed) == normalize_editor_text(draft)
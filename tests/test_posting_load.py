@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+import requests
+
+import posting_load
+from mock_linkedin import MockLinkedInConfig, MockLinkedInServer
+from posting_load import percentile, run_backend
+
+
+def create(text):
+    return requests.post(f"{os.environ['LINKEDIN_API_BASE']}/v2/ugcPosts", timeout=5, json={
+        'author': 'urn:li:person:mock-person',
+        'specificContent': {'com.linkedin.ugc.ShareContent': {'shareCommentary': {'text': text}}},
+    }, headers={'Authorization': f"Bearer {os.environ['LINKEDIN_ACCESS_TOKEN']}"})
+
+
+def post_with_retries(email, password, text):
+    """Retries throttled requests after Retry-After, like the REST backend"""
+    while True:
+        response = create(text)
+        if response.status_code not in (429, 503):
+            return response.status_code == 201
+        time.sleep(float(response.headers['Retry-After']))
+
+
+def post_once(email, password, text):
+    return create(text).status_code == 201
+
+
+def claim_success(email, password, text):
+    return True
+
+
+@pytest.fixture
+def server(monkeypatch):
+    for name in ('post_with_retries', 'post_once', 'claim_success'):
+        monkeypatch.setitem(posting_load.BACKENDS, name, (__name__, name, False))
+    instance = MockLinkedInServer(port=0).start()
+    yield instance
+    instance.stop()
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(n) for n in range(10, 0, -1)]
+    assert percentile(values, 50) == 5 and percentile(values, 90) == 9
+    assert percentile(values, 99) == 10 and percentile(values, 0) == 1
+    assert percentile([], 50) is None
+
+
+def test_retries_are_counted_from_the_server(server):
+    server.config = MockLinkedInConfig(error_rate=0.5, error_statuses=(429, 503), retry_after=0, seed=3)
+    result = run_backend(server, 'post_with_retries', posts=6, concurrency=2)
+    injected = sum(result['server']['injected_errors'].values())
+    assert injected > 0
+    assert result['confirmed'] == result['reported_success'] == 6
+    assert result['create_attempts'] == 6 + injected and result['retries'] == injected
+    assert result['false_success'] == result['unreported_posts'] == 0
+    assert result['latency_p50_s'] <= result['latency_p90_s'] <= result['latency_max_s']
+
+
+def test_lost_responses_are_unreported_posts(server):
+    server.config = MockLinkedInConfig(lost_response_rate=1.0)
+    result = run_backend(server, 'post_once', posts=3, concurrency=1)
+    assert result['reported_success'] == 0 and result['confirmed'] == 3
+    assert result['unreported_posts'] == 3 and result['false_success'] == 0
+
+
+def test_success_without_a_post_is_false_success(server):
+    result = run_backend(server, 'claim_success', posts=3, concurrency=1)
+    assert result['reported_success'] == 3 and result['confirmed'] == 0
+    assert result['false_success'] == 3 and result['retries'] == 0
+
+
+def test_missing_backend_module_is_skipped(server, monkeypatch):
+    monkeypatch.setitem(posting_load.BACKENDS, 'missing', ('no_such_poster', 'post', False))
+    assert 'no_such_poster unavailable' in run_backend(server, 'missing', posts=1, concurrency=1)['skipped']
@@ -0,0 +1,48 @@
+import json
+import threading
+import time
+
+from profiling import PROFILE_ENV_VAR, profiling_requested, run_profiled, stage
+
+
+def test_profiling_requested(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    assert not profiling_requested() and profiling_requested(True)
+    monkeypatch.setenv(PROFILE_ENV_VAR, 'on')
+    assert profiling_requested()
+
+
+def test_stages_are_timed_and_measured(tmp_path):
+    def in_worker():
+        with stage('worker'):
+            pass
+
+    def run():
+        with stage('fetch'):
+            time.sleep(0.05)
+            with stage('parse'):
+                buffer = bytearray(4 * 1024 * 1024)
+                del buffer
+        # Stages on worker threads are only tagged in the logs
+        worker = threading.Thread(target=in_worker)
+        worker.start()
+        worker.join()
+        return 'done'
+
+    assert run_profiled(run, str(tmp_path)) == 'done'
+    memory_file, = tmp_path.glob('*-memory.json')
+    with open(memory_file) as f:
+        report = json.load(f)
+    stages = {entry['stage']: entry for entry in report['stages']}
+    assert list(stages) == ['fetch/parse', 'fetch']
+    assert stages['fetch']['seconds'] >= 0.05
+    assert stages['fetch']['seconds'] >= stages['fetch/parse']['seconds']
+    assert stages['fetch/parse']['peak_bytes'] >= 4 * 1024 * 1024
+    assert stages['fetch']['peak_bytes'] >= stages['fetch/parse']['peak_bytes']
+    assert report['total_seconds'] >= stages['fetch']['seconds']
+    assert len(list(tmp_path.glob('*.pstats'))) == 1 and len(list(tmp_path.glob('*-cpu.txt'))) == 1
+
+
+def test_stage_outside_a_profiled_run_is_a_no_op():
+    with stage('fetch'):
+        pass
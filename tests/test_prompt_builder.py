@@ -0,0 +1,51 @@
+from article import Article
+from prompt_builder import (DESCRIPTION_MAX_TOKENS, _trim_to_budget, build_post_prompt, completion_tokens,
+                            estimate_tokens)
+
+SENTENCE = "Researchers released a compact language model that runs on phones. "
+
+
+def article(full_text='', description='A new model is out.'):
+    item = Article('New model released', description, 'https://example.com/model', 'TechCrunch')
+    item.full_text = full_text
+    return item
+
+
+def test_estimate_tokens():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('AI is here.') == 4
+    # Long words count as several subword tokens
+    assert estimate_tokens('internationalization') == 3
+
+
+def test_completion_tokens_cover_the_target_length():
+    assert completion_tokens(100) == 170
+
+
+def test_trim_keeps_whole_paragraphs_then_sentences():
+    text = f"{SENTENCE.strip()}\n\n{SENTENCE * 3}".strip()
+    first = estimate_tokens(SENTENCE.strip()) + 1
+    trimmed = _trim_to_budget(text, first + 2 * first)
+    assert trimmed == f"{SENTENCE.strip()}\n\n{(SENTENCE * 2).strip()}"
+    assert _trim_to_budget(text, 0) == ''
+    assert _trim_to_budget('short', 10) == 'short'
+
+
+def test_overlong_first_sentence_falls_back_to_words():
+    trimmed = _trim_to_budget('word ' * 50, 5)
+    assert trimmed == 'word word word word word...'
+
+
+def test_prompt_stays_within_budget_and_cuts_the_excerpt_first():
+    prompt, stats = build_post_prompt(article(full_text=(SENTENCE * 20 + '\n\n') * 10), input_budget=400)
+    assert stats['input_tokens'] <= 400
+    assert stats['excerpt_trimmed'] and not stats['description_trimmed']
+    assert 'Title: New model released' in prompt and 'Summary: A new model is out.' in prompt
+
+
+def test_description_is_capped_and_excerpt_is_optional():
+    prompt, stats = build_post_prompt(article(description=SENTENCE * 30), input_budget=2000)
+    assert stats['description_trimmed'] and stats['excerpt_chars'] == 0
+    assert 'Article excerpt' not in prompt
+    summary = prompt.split('Summary: ', 1)[1]
+    assert estimate_tokens(summary) <= DESCRIPTION_MAX_TOKENS
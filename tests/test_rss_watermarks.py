@@ -0,0 +1,39 @@
+from email.utils import formatdate
+
+
+def feed(items):
+    """RSS document with items (guid, title, publish timestamp), newest first"""
+    body = ''.join(
+        f"<item><guid>{guid}</guid><title>{title}</title><link>https://example.com/{guid}</link>"
+        f"<description>{title}</description><pubDate>{formatdate(ts)}</pubDate></item>"
+        for guid, title, ts in items
+    )
+    return f"<rss><channel><title>Feed</title>{body}</channel></rss>".encode('utf-8')
+
+
+def test_new_items_only_on_second_run(bot):
+    first = feed([('b', 'AI news two', 2000000), ('a', 'AI news one', 1000000)])
+    articles, published = bot._parse_rss_items('Feed', first)
+    assert [a.title for a in articles] == ['AI news two', 'AI news one']
+    assert published == [2000000, 1000000]
+
+    second = feed([('c', 'AI news three', 3000000), ('b', 'AI news two', 2000000), ('a', 'AI news one', 1000000)])
+    articles, _ = bot._parse_rss_items('Feed', second)
+    assert [a.title for a in articles] == ['AI news three']
+
+
+def test_items_below_the_cap_are_read_next_run(bot):
+    items = [(f"g{i}", f"AI story {i}", 1000000 + 1000 * (20 - i)) for i in range(15)]
+    articles, _ = bot._parse_rss_items('Feed', feed(items), limit=10)
+    assert len(articles) == 10
+
+    articles, _ = bot._parse_rss_items('Feed', feed(items), limit=10)
+    assert [a.title for a in articles] == [f"AI story {i}" for i in range(10, 15)]
+    assert bot.fetch_state['rss']['Feed']['last_published_ts'] is not None
+    assert bot._parse_rss_items('Feed', feed(items), limit=10)[0] == []
+
+
+def test_non_ai_items_are_marked_seen(bot):
+    bot._parse_rss_items('Feed', feed([('x', 'Gardening tips', 1000000)]))
+    articles, published = bot._parse_rss_items('Feed', feed([('x', 'Gardening tips', 1000000)]))
+    assert articles == [] and published == []
@@ -0,0 +1,124 @@
+import os
+import time
+
+import pytest
+
+import seen_filter as seen_filter_module
+from article import Article
+from article_store import ArticleStore
+from seen_filter import SeenFilter, bloom_parameters
+
+WEEK = 7 * 86400
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000 * WEEK + 10.0]
+    monkeypatch.setattr(seen_filter_module.time, 'time', lambda: now[0])
+    return now
+
+
+def test_bloom_parameters_match_the_error_rate():
+    bits, hashes = bloom_parameters(100000, 0.001)
+    assert bits % 8 == 0 and 1400000 < bits < 1500000
+    assert hashes == 10
+
+
+def test_added_keys_are_found_after_reopening(tmp_path, clock):
+    seen = SeenFilter(str(tmp_path), capacity=1000)
+    assert seen.add_many(['a', 'b', '']) == 2
+    seen.close()
+    reopened = SeenFilter(str(tmp_path), capacity=1000)
+    assert 'a' in reopened and 'b' in reopened
+    assert 'c' not in reopened and '' not in reopened
+
+
+def test_keys_go_to_the_partition_for_their_time(tmp_path, clock):
+    seen = SeenFilter(str(tmp_path), capacity=1000, retention_days=28)
+    seen.add_many(['now'])
+    seen.add_many(['two-weeks', 'too-old', 'future'],
+                  [clock[0] - 2 * WEEK, clock[0] - 10 * WEEK, clock[0] + 5 * WEEK])
+    assert sorted(os.listdir(tmp_path)) == ['1000.bloom', '998.bloom']
+    assert all(key in seen for key in ('now', 'two-weeks', 'future'))
+    assert 'too-old' not in seen
+
+
+def test_partitions_age_out(tmp_path, clock):
+    seen = SeenFilter(str(tmp_path), capacity=1000, retention_days=14)
+    seen.add_many(['old'])
+    clock[0] += 2 * WEEK
+    seen.add_many(['new'])
+    assert seen.prune() == 1
+    assert os.listdir(tmp_path) == ['1002.bloom']
+    assert 'old' not in seen and 'new' in seen
+
+
+def test_corrupt_partition_is_dropped(tmp_path, clock):
+    seen = SeenFilter(str(tmp_path), capacity=1000)
+    seen.add_many(['a'])
+    seen.close()
+    with open(tmp_path / '1000.bloom', 'r+b') as f:
+        f.write(b'garbage!')
+    reopened = SeenFilter(str(tmp_path), capacity=1000)
+    assert 'a' not in reopened
+    assert os.listdir(tmp_path) == []
+
+
+def with_filter(bot, tmp_path, posted=()):
+    bot.posted_articles_file = str(tmp_path / 'posted_articles.json')
+    bot.save_posted_articles([{'url': url, 'title': 'Posted', 'posted_at': '2026-01-01T00:00:00'} for url in posted])
+    bot.article_store = ArticleStore(str(tmp_path / 'articles.db'))
+    bot.seen_filter = SeenFilter(str(tmp_path / 'filter'), capacity=1000, retention_days=3650)
+    return bot
+
+
+def stories(count):
+    return [Article(f"AI story {n}", '', f"https://example.com/{n}", 'Feed') for n in range(count)]
+
+
+def test_only_posted_articles_are_dropped(bot, tmp_path):
+    with_filter(bot, tmp_path)
+    articles = stories(3)
+    bot.article_store.add_articles(articles)
+    assert bot._drop_seen(articles) == articles
+    # Fetching an article does not put it in the filter; posting it does
+    assert not any(article.fingerprint in bot.seen_filter for article in articles)
+    bot.record_posted(articles[0])
+    assert bot._drop_seen(articles) == articles[1:]
+    assert bot.article_store.posted([a.fingerprint for a in articles]) == {articles[0].fingerprint}
+    assert [posted['url'] for posted in bot.load_posted_articles()] == [articles[0].url]
+
+
+def test_filter_misses_skip_the_warehouse(bot, tmp_path, monkeypatch):
+    with_filter(bot, tmp_path)
+    articles = stories(3)
+    bot.article_store.add_articles(articles)
+    bot.record_posted(articles[1])
+    lookups = []
+    unposted = bot.article_store.unposted
+    monkeypatch.setattr(bot.article_store, 'unposted', lambda keys: lookups.append(set(keys)) or unposted(keys))
+
+    assert bot._drop_seen([articles[0], articles[2]]) == [articles[0], articles[2]]
+    assert lookups == []
+    assert bot._drop_seen(articles) == [articles[0], articles[2]]
+    assert lookups == [{articles[1].fingerprint}]
+
+
+def test_false_positive_hits_stay_candidates(bot, tmp_path):
+    with_filter(bot, tmp_path)
+    articles = stories(2)
+    bot.article_store.add_articles(articles)
+    # Stands in for a filter false positive: a hit the warehouse holds as never posted
+    bot.seen_filter.add(articles[0].fingerprint)
+    assert bot._drop_seen(articles) == articles
+
+
+def test_empty_filter_is_seeded_from_the_posted_history(bot, tmp_path, monkeypatch):
+    articles = stories(2)
+    with_filter(bot, tmp_path, posted=[articles[0].url])
+    monkeypatch.setenv('SEEN_FILTER_DIR', str(tmp_path / 'seeded'))
+    monkeypatch.setenv('ARTICLE_RETENTION_DAYS', '3650')
+    bot.open_seen_filter()
+    assert articles[0].fingerprint in bot.seen_filter
+    # Posted before the warehouse knew it: the hit still counts as posted
+    assert bot._drop_seen(articles) == [articles[1]]
@@ -0,0 +1,70 @@
+import io
+import os
+import sqlite3
+import tarfile
+
+import pytest
+
+from snapshot import create_snapshot, inspect_snapshot, restore_snapshot, state_paths
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('SNAPSHOT_INCLUDE_SESSIONS', raising=False)
+    with open('posted_articles.json', 'w') as f:
+        f.write('[]')
+    os.makedirs('cache/posts')
+    with open('cache/posts/a.json', 'w') as f:
+        f.write('{}')
+    os.makedirs('sessions')
+    with open('sessions/linkedin_cookies.json', 'w') as f:
+        f.write('[{"name": "li_at", "value": "secret"}]')
+    conn = sqlite3.connect('articles.db')
+    conn.execute('CREATE TABLE t (x)')
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+def test_sessions_are_left_out_by_default(state_dir):
+    manifest = create_snapshot('state/snap.tar.gz')
+    assert sorted(manifest['files']) == ['articles.db', 'cache/posts/a.json', 'posted_articles.json']
+    with tarfile.open('state/snap.tar.gz') as tar:
+        assert not any(name.startswith('sessions') for name in tar.getnames())
+
+
+def test_sessions_are_opt_in(state_dir, monkeypatch):
+    assert 'sessions' in state_paths(True)
+    monkeypatch.setenv('SNAPSHOT_INCLUDE_SESSIONS', '1')
+    create_snapshot('state/snap.tar.gz')
+    assert 'sessions/linkedin_cookies.json' in inspect_snapshot('state/snap.tar.gz')['files']
+
+
+def test_round_trip_restores_files_and_databases(state_dir):
+    create_snapshot('state/snap.tar.gz')
+    os.remove('posted_articles.json')
+    os.remove('articles.db')
+    assert restore_snapshot('state/snap.tar.gz')
+    assert open('posted_articles.json').read() == '[]'
+    assert sqlite3.connect('articles.db').execute('SELECT x FROM t').fetchone() == (1,)
+
+
+def test_corrupt_snapshot_restores_nothing(state_dir):
+    create_snapshot('state/snap.tar.gz')
+    with open('posted_articles.json', 'w') as f:
+        f.write('["current"]')
+    with tarfile.open('state/snap.tar.gz') as tar:
+        members = [(member, tar.extractfile(member).read()) for member in tar.getmembers()]
+    with tarfile.open('state/snap.tar.gz', 'w:gz') as tar:
+        for member, data in members:
+            if member.name == 'posted_articles.json':
+                data = b'[1]'
+            tar.addfile(member, io.BytesIO(data))
+    assert not restore_snapshot('state/snap.tar.gz')
+    assert open('posted_articles.json').read() == '["current"]'
+
+
+def test_missing_snapshot_starts_cold(state_dir):
+    assert not restore_snapshot('state/none.tar.gz')
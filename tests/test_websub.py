@@ -0,0 +1,135 @@
+import hashlib
+import hmac
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from websub import WebSubSubscriber, discover_hub
+
+TOPIC = 'https://example.com/feed'
+HUB = 'https://hub.example.com/'
+BODY = b'<rss><channel><item><title>AI news</title></item></channel></rss>'
+
+
+class FakeSession:
+    def __init__(self, status=202):
+        self.status = status
+        self.forms = []
+
+    def post(self, url, data=None, timeout=None):
+        self.forms.append(data)
+        return SimpleNamespace(status_code=self.status, text='')
+
+
+def make_subscriber(tmp_path, subscriptions=None):
+    return WebSubSubscriber('https://bot.example.com/', host='127.0.0.1', port=0, session=FakeSession(),
+                            subscriptions=subscriptions, secrets_file=str(tmp_path / 'sessions' / 'websub.json'))
+
+
+@pytest.fixture
+def subscriber(tmp_path):
+    server = make_subscriber(tmp_path)
+    yield server
+    server.server_close()
+
+
+def sign(secret, body, algorithm='sha256'):
+    return f"{algorithm}={hmac.new(secret.encode('utf-8'), body, getattr(hashlib, algorithm)).hexdigest()}"
+
+
+def test_signature_check():
+    assert WebSubSubscriber._signature_valid('s3cret', BODY, sign('s3cret', BODY))
+    assert WebSubSubscriber._signature_valid('s3cret', BODY, sign('s3cret', BODY, 'sha1').replace('sha1', 'SHA1', 1))
+    assert not WebSubSubscriber._signature_valid('s3cret', BODY + b' ', sign('s3cret', BODY))
+    assert not WebSubSubscriber._signature_valid('other', BODY, sign('s3cret', BODY))
+    assert not WebSubSubscriber._signature_valid('s3cret', BODY, None)
+    assert not WebSubSubscriber._signature_valid('s3cret', BODY, 'md5=' + hashlib.md5(BODY).hexdigest())
+    assert not WebSubSubscriber._signature_valid('s3cret', BODY, 'sha256=')
+
+
+def test_only_signed_pushes_are_queued(subscriber):
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    secret = subscriber.subscriptions['Feed']['secret']
+    assert subscriber.session.forms[0]['hub.secret'] == secret
+    assert subscriber.session.forms[0]['hub.callback'] == 'https://bot.example.com/websub/Feed'
+
+    assert subscriber.receive('Feed', BODY, sign('wrong', BODY)) == 202
+    assert subscriber.receive('Feed', BODY, None) == 202
+    assert subscriber.rejected == 2 and subscriber.drain() == []
+
+    assert subscriber.receive('Feed', BODY, sign(secret, BODY)) == 202
+    assert subscriber.drain() == [('Feed', BODY)]
+
+
+def test_pushes_for_unknown_feeds_are_refused(subscriber):
+    assert subscriber.receive('Unknown', BODY, None) == 410
+    assert subscriber.receive(None, BODY, None) == 410
+
+
+def test_only_requested_subscriptions_are_verified(subscriber):
+    query = {'hub.mode': 'subscribe', 'hub.topic': TOPIC, 'hub.challenge': 'abc', 'hub.lease_seconds': '604800'}
+    assert subscriber.verify('Feed', query) == (404, '')
+
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    assert subscriber.verify('Feed', dict(query, **{'hub.topic': 'https://evil.example.com/'})) == (404, '')
+    assert subscriber.verify('Feed', dict(query, **{'hub.mode': 'unsubscribe'})) == (404, '')
+    assert subscriber.verify('Feed', query) == (200, 'abc')
+    assert subscriber.active('Feed') and subscriber.renewals_due() == []
+    # Hubs may re-verify an active subscription
+    assert subscriber.verify('Feed', query) == (200, 'abc')
+
+
+def test_denied_subscription_is_inactive(subscriber):
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    assert subscriber.verify('Feed', {'hub.mode': 'denied', 'hub.topic': TOPIC}) == (200, '')
+    assert not subscriber.active('Feed') and subscriber.renewals_due() == ['Feed']
+
+
+def test_resubscribing_keeps_the_secret(subscriber):
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    secret = subscriber.subscriptions['Feed']['secret']
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    assert subscriber.subscriptions['Feed']['secret'] == secret
+    subscriber.subscribe('Feed', TOPIC, 'https://other-hub.example.com/')
+    assert subscriber.subscriptions['Feed']['secret'] != secret
+
+
+def test_secrets_stay_out_of_the_exported_state(subscriber, tmp_path):
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    secret = subscriber.subscriptions['Feed']['secret']
+    exported = subscriber.export()
+    assert exported == {'Feed': {'topic': TOPIC, 'hub': HUB, 'pending': 'subscribe',
+                                 'requested_at': exported['Feed']['requested_at']}}
+    secrets_file = tmp_path / 'sessions' / 'websub.json'
+    assert json.loads(secrets_file.read_text()) == {'Feed': secret}
+    assert os.stat(secrets_file).st_mode & 0o777 == 0o600
+
+    restarted = make_subscriber(tmp_path, subscriptions=exported)
+    assert restarted.subscriptions['Feed']['secret'] == secret
+    assert restarted.receive('Feed', BODY, sign(secret, BODY)) == 202 and restarted.drain() == [('Feed', BODY)]
+    restarted.server_close()
+
+
+def test_subscriptions_without_a_saved_secret_are_dropped(subscriber, tmp_path):
+    subscriber.subscribe('Feed', TOPIC, HUB)
+    exported = subscriber.export()
+    os.remove(tmp_path / 'sessions' / 'websub.json')
+
+    restarted = make_subscriber(tmp_path, subscriptions=exported)
+    assert restarted.receive('Feed', BODY, None) == 410
+    assert restarted.renewals_due() == []
+    restarted.subscribe('Feed', TOPIC, HUB)
+    assert restarted.subscriptions['Feed']['secret'] != subscriber.subscriptions['Feed']['secret']
+    restarted.server_close()
+
+
+def test_discover_hub_from_links_and_feed():
+    feed = (b'<rss xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            b'<atom:link rel="hub" href="https://hub.example.com/"/>'
+            b'<atom:link rel="self" href="https://example.com/feed"/>'
+            b'<item><link>https://example.com/a</link></item></channel></rss>')
+    assert discover_hub(feed) == (HUB, TOPIC)
+    assert discover_hub(b'<rss/>', {'hub': {'url': 'https://h/'}, 'self': {'url': 'https://t/'}}) == ('https://h/', 'https://t/')
+    assert discover_hub(b'not xml') == (None, None)
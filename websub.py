@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+WebSub (PubSubHubbub) subscriber for AI News Automation
+Embedded callback server that verifies subscriptions and queues feed updates pushed by a hub
+"""
+
+import io
+import os
+import hmac
+import json
+import time
+import queue
+import hashlib
+import logging
+import secrets
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8088
+DEFAULT_LEASE_SECONDS = 7 * 86400
+# Kept with the login sessions: out of git and, by default, out of state snapshots
+DEFAULT_SECRETS_FILE = os.path.join('sessions', 'websub_secrets.json')
+# Subscriptions are renewed when their lease has less than this left
+RENEW_BEFORE_SECONDS = 12 * 3600
+MAX_PUSH_BYTES = 5 * 1024 * 1024
+CALLBACK_PREFIX = '/websub/'
+SIGNATURE_ALGORITHMS = {'sha1': hashlib.sha1, 'sha256': hashlib.sha256,
+                        'sha384': hashlib.sha384, 'sha512': hashlib.sha512}
+
+
+def discover_hub(content: bytes, links: Optional[Dict] = None) -> Tuple[Optional[str], Optional[str]]:
+    """(hub URL, self URL) advertised by a feed's Link headers or its <link rel="hub"> elements"""
+    links = links or {}
+    hub = (links.get('hub') or {}).get('url')
+    topic = (links.get('self') or {}).get('url')
+    try:
+        for _, element in ET.iterparse(io.BytesIO(content)):
+            # Atom links appear in RSS feeds as atom:link, so match on the local name
+            if element.tag.rsplit('}', 1)[-1] == 'link' and element.get('href'):
+                rel = element.get('rel')
+                if rel == 'hub' and not hub:
+                    hub = element.get('href')
+                elif rel == 'self' and not topic:
+                    topic = element.get('href')
+            if element.tag in ('item', 'entry') or element.tag.endswith('}entry'):
+                # Hub links live in the channel header, before the first item
+                break
+    except ET.ParseError as e:
+        logger.warning(f"Could not parse feed while looking for a WebSub hub: {e}")
+    return hub, topic
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    """Route hub verification requests (GET) and content distribution (POST) to WebSubSubscriber"""
+
+    def _send(self, status: int, body: bytes = b'', content_type: str = 'text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _name(self) -> Optional[str]:
+        path = urlsplit(self.path).path
+        return unquote(path[len(CALLBACK_PREFIX):]) if path.startswith(CALLBACK_PREFIX) else None
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        status, body = self.server.verify(self._name(), query)
+        self._send(status, body.encode('utf-8'))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_PUSH_BYTES:
+            self._send(413)
+            return
+        body = self.rfile.read(length) if length else b''
+        self._send(self.server.receive(self._name(), body, self.headers.get('X-Hub-Signature')))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WebSubSubscriber(ThreadingHTTPServer):
+    """Callback server and client for WebSub subscriptions, one per named feed
+
+    subscribe() asks the hub for a lease; the hub confirms by calling back with a
+    challenge, which is only echoed for subscriptions this process requested. Pushed
+    feed bodies are checked against the subscription's secret (X-Hub-Signature) and
+    queued; the owner drains them with drain() on its own thread, so the feed state is
+    never touched from the server threads. Subscriptions are plain dicts so they can be
+    saved with the fetch state and reused by the next process until the lease expires;
+    their secrets are saved apart in secrets_file, and a subscription whose secret is
+    gone is dropped so the next renewal subscribes again with a new one.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, callback_base: str, host: str = '0.0.0.0', port: int = DEFAULT_PORT,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS, subscriptions: Optional[Dict] = None,
+                 session: Optional[requests.Session] = None, secrets_file: Optional[str] = None):
+        super().__init__((host, port), _CallbackHandler)
+        self.callback_base = callback_base.rstrip('/')
+        self.lease_seconds = lease_seconds
+        self.session = session or requests.Session()
+        self.secrets_file = secrets_file or DEFAULT_SECRETS_FILE
+        saved_secrets = self._load_secrets()
+        self.subscriptions: Dict[str, Dict] = {}
+        for name, sub in (subscriptions or {}).items():
+            if saved_secrets.get(name):
+                self.subscriptions[name] = dict(sub, secret=saved_secrets[name])
+            else:
+                # Pushes signed with a lost secret cannot be checked; the hub gets a 410 until we subscribe again
+                logger.info(f"No saved WebSub secret for {name}; it will be subscribed again")
+        self.pushes: queue.Queue = queue.Queue()
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load_secrets(self) -> Dict[str, str]:
+        try:
+            with open(self.secrets_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read WebSub secrets from {self.secrets_file}: {e}")
+            return {}
+
+    def _save_secrets(self):
+        """Write every subscription's secret to secrets_file, readable by this user only"""
+        with self._lock:
+            saved = {name: sub['secret'] for name, sub in self.subscriptions.items() if sub.get('secret')}
+        try:
+            os.makedirs(os.path.dirname(self.secrets_file) or '.', exist_ok=True)
+            tmp_path = f"{self.secrets_file}.tmp"
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, self.secrets_file)
+        except OSError as e:
+            logger.error(f"Could not save WebSub secrets to {self.secrets_file}: {e}")
+
+    def callback_url(self, name: str) -> str:
+        return f"{self.callback_base}{CALLBACK_PREFIX}{quote(name, safe='')}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='websub-callback', daemon=True)
+        self._thread.start()
+        logger.info(f"WebSub callback server listening on port {self.server_address[1]}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    # Subscription management
+
+    def _request(self, name: str, mode: str) -> bool:
+        with self._lock:
+            sub = self.subscriptions.get(name)
+            if not sub:
+                return False
+            sub['pending'] = mode
+            sub['requested_at'] = time.time()
+            form = {
+                'hub.mode': mode,
+                'hub.topic': sub['topic'],
+                'hub.callback': self.callback_url(name),
+                'hub.lease_seconds': str(self.lease_seconds),
+                'hub.secret': sub['secret'],
+            }
+            hub = sub['hub']
+        try:
+            response = self.session.post(hub, data=form, timeout=10)
+        except requests.RequestException as e:
+            logger.error(f"WebSub {mode} request for {name} failed: {e}")
+            return False
+        if response.status_code not in (202, 204):
+            logger.error(f"WebSub hub refused {mode} for {name}: {response.status_code} {response.text[:200]}")
+            return False
+        logger.info(f"WebSub {mode} requested for {name} at {hub}")
+        return True
+
+    def subscribe(self, name: str, topic: str, hub: str) -> bool:
+        """Ask the hub to push updates of topic; True once the hub accepted the request"""
+        with self._lock:
+            sub = self.subscriptions.get(name)
+            created = not sub or sub.get('topic') != topic or sub.get('hub') != hub
+            if created:
+                # A new secret for every new subscription, kept across renewals
+                self.subscriptions[name] = {'topic': topic, 'hub': hub, 'secret': secrets.token_hex(20)}
+        if created:
+            self._save_secrets()
+        return self._request(name, 'subscribe')
+
+    def unsubscribe(self, name: str) -> bool:
+        return self._request(name, 'unsubscribe')
+
+    def active(self, name: str, now: Optional[float] = None) -> bool:
+        """True if the hub verified the subscription and its lease has not run out"""
+        with self._lock:
+            sub = self.subscriptions.get(name) or {}
+            return sub.get('expires_at', 0) > (now or time.time())
+
+    def renewals_due(self, now: Optional[float] = None) -> List[str]:
+        """Subscriptions whose lease ends soon or that were never verified"""
+        now = now or time.time()
+        with self._lock:
+            return sorted(
+                name for name, sub in self.subscriptions.items()
+                if sub.get('expires_at', 0) - now < RENEW_BEFORE_SECONDS
+            )
+
+    def export(self) -> Dict[str, Dict]:
+        """Copy of the subscriptions for the fetch state, without their secrets"""
+        with self._lock:
+            return {
+                name: {key: value for key, value in sub.items() if key != 'secret'}
+                for name, sub in self.subscriptions.items()
+            }
+
+    # Callbacks from the hub (server threads)
+
+    def verify(self, name: Optional[str], query: Dict[str, str]) -> Tuple[int, str]:
+        """Answer a hub's verification of intent; only requests this subscriber made are confirmed"""
+        mode = query.get('hub.mode')
+        with self._lock:
+            sub = self.subscriptions.get(name) if name else None
+            if not sub or sub.get('topic') != query.get('hub.topic'):
+                return 404, ''
+            if mode == 'denied':
+                logger.warning(f"WebSub hub denied the subscription for {name}: {query.get('hub.reason', '')}")
+                sub.pop('pending', None)
+                sub.pop('expires_at', None)
+                return 200, ''
+            # Hubs may re-verify an active subscription on their own before renewing it
+            if mode != sub.get('pending') and not (mode == 'subscribe' and 'expires_at' in sub):
+                return 404, ''
+            if mode == 'subscribe':
+                try:
+                    lease = int(query.get('hub.lease_seconds') or self.lease_seconds)
+                except ValueError:
+                    lease = self.lease_seconds
+                sub['expires_at'] = time.time() + lease
+                sub.pop('pending', None)
+                logger.info(f"WebSub subscription for {name} verified for {lease / 3600:.0f}h")
+            else:
+                del self.subscriptions[name]
+                logger.info(f"WebSub subscription for {name} removed")
+        return 200, query.get('hub.challenge', '')
+
+    def receive(self, name: Optional[str], body: bytes, signature: Optional[str]) -> int:
+        """Queue a pushed feed body; returns the HTTP status for the hub"""
+        with self._lock:
+            sub = self.subscriptions.get(name) if name else None
+            secret = sub.get('secret') if sub else None
+        if not sub:
+            # 410 tells the hub to drop a subscription we no longer know about
+            return 410
+        if secret and not self._signature_valid(secret, body, signature):
+            # The spec asks subscribers to acknowledge forged or corrupt pushes but ignore them
+            logger.warning(f"Ignoring WebSub push for {name} with a missing or invalid signature")
+            self.rejected += 1
+            return 202
+        self.pushes.put((name, body))
+        return 202
+
+    @staticmethod
+    def _signature_valid(secret: str, body: bytes, signature: Optional[str]) -> bool:
+        algorithm, _, digest = (signature or '').partition('=')
+        hash_func = SIGNATURE_ALGORITHMS.get(algorithm.lower())
+        if not hash_func or not digest:
+            return False
+        expected = hmac.new(secret.encode('utf-8'), body, hash_func).hexdigest()
+        return hmac.compare_digest(expected, digest.strip().lower())
+
+    def drain(self) -> List[Tuple[str, bytes]]:
+        """Every push received since the last call, oldest first"""
+        pushed = []
+        while True:
+            try:
+                pushed.append(self.pushes.get_nowait())
+            except queue.Empty:
+                return pushed